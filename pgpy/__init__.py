@@ -4,7 +4,9 @@ from ._author import *
 
 from .pgp import PGPKey
 from .pgp import PGPKeyring
+from .pgp import PGPKeySession
 from .pgp import PGPMessage
+from .pgp import PGPMessageReader
 from .pgp import PGPSignature
 from .pgp import PGPUID
 
@@ -16,6 +18,8 @@ __all__ = ['__author__',
            'errors',
            'PGPKey',
            'PGPKeyring',
+           'PGPKeySession',
            'PGPMessage',
+           'PGPMessageReader',
            'PGPSignature',
            'PGPUID', ]
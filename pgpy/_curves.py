@@ -6,8 +6,6 @@ from cryptography import utils
 
 from cryptography.hazmat.primitives.asymmetric import ec
 
-from cryptography.hazmat.bindings.openssl.binding import Binding
-
 __all__ = tuple()
 
 # TODO: investigate defining additional curves using EC_GROUP_new_curve
@@ -19,6 +17,8 @@ def _openssl_get_supported_curves():
         return _openssl_get_supported_curves._curves
 
     # use cryptography's cffi bindings to get an array of curve names
+    # these are imported here, rather than at the top of the module, because loading them is slow
+    from cryptography.hazmat.bindings.openssl.binding import Binding
     b = Binding()
     cn = b.lib.EC_get_builtin_curves(b.ffi.NULL, 0)
     cs = b.ffi.new('EC_builtin_curve[]', cn)
@@ -48,7 +48,14 @@ class BrainpoolP512R1(object):
     key_size = 512
 
 
-# add these curves to the _CURVE_TYPES list
-for curve in [BrainpoolP256R1, BrainpoolP384R1, BrainpoolP512R1]:
-    if curve.name not in ec._CURVE_TYPES and curve.name in _openssl_get_supported_curves():
-        ec._CURVE_TYPES[curve.name] = curve
+def _register_curves():
+    # add these curves to the _CURVE_TYPES list
+    # this is not done on import, because finding out which curves OpenSSL supports requires loading its bindings
+    if getattr(_register_curves, '_done', False):
+        return
+
+    for curve in [BrainpoolP256R1, BrainpoolP384R1, BrainpoolP512R1]:
+        if curve.name not in ec._CURVE_TYPES and curve.name in _openssl_get_supported_curves():
+            ec._CURVE_TYPES[curve.name] = curve
+
+    _register_curves._done = True
@@ -0,0 +1,57 @@
+""" _threads.py
+a minimal pool of worker threads, since concurrent.futures is not available on every supported version of Python
+"""
+import threading
+
+__all__ = tuple()
+
+
+def thread_count(threads):
+    # threads=0 means one thread per CPU; multiprocessing is only imported when it is needed
+    if threads == 0:
+        import multiprocessing
+        return multiprocessing.cpu_count()
+
+    return threads
+
+
+class WorkQueue(object):
+    """
+    Calls ``work(i)`` for each ``i`` in ``range(count)``, handing out each ``i`` in order, on ``threads`` background
+    threads as well as on whichever thread calls :py:meth:`join`.
+
+    Once any call raises an exception, no more work is started, and :py:meth:`join` re-raises the first one.
+    """
+    def __init__(self, work, count, threads=0):
+        self.errors = []
+        self._work = work
+        self._pending = iter(range(count))
+        self._lock = threading.Lock()
+        self._workers = [ threading.Thread(target=self._run) for _ in range(min(threads or 0, count)) ]
+
+        for worker in self._workers:
+            worker.daemon = True
+            worker.start()
+
+    def _run(self):
+        while not self.errors:
+            with self._lock:
+                i = next(self._pending, None)
+
+            if i is None:
+                return
+
+            try:
+                self._work(i)
+
+            except Exception as ex:
+                self.errors.append(ex)
+
+    def join(self):
+        """help finish any remaining work, wait for the background threads, and re-raise the first error, if any"""
+        self._run()
+        for worker in self._workers:
+            worker.join()
+
+        if self.errors:
+            raise self.errors[0]
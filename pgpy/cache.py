@@ -0,0 +1,552 @@
+""" cache.py
+"""
+from __future__ import division
+
+import collections
+import datetime
+import hashlib
+import hmac
+import importlib
+import os
+import struct
+import threading
+import time
+
+from enum import Enum
+
+import six
+
+from ._author import __version__
+
+from .errors import PGPError
+
+from .packet.fields import String2Key
+from .packet.types import MPI
+
+from .types import Armorable
+from .types import Fingerprint
+from .types import PGPObject
+
+__all__ = ['DerivedKeyCache',
+           'PacketCache']
+
+
+class PacketCache(object):
+    """
+    Serializes already-parsed packets into a compact, versioned binary format, so that keys that are loaded frequently
+    can skip de-armoring and packet parsing on subsequent loads.
+
+    The format does not use :py:mod:`pickle`; it only stores plain values (integers, strings, byte strings, containers,
+    timestamps), enum members, and the attributes of PGPy's own packet classes. Loading a cache will never
+    instantiate anything other than a class defined within PGPy itself.
+
+    Every cache is bound to the exact bytes it was generated from, as well as to the format version and the version of
+    PGPy that wrote it. :py:meth:`loads` returns ``None`` if any of these do not match, or if the cache is corrupt, in
+    which case the caller should fall back to parsing the original data.
+
+    The checksums stored in a cache only detect accidental damage; anyone who can write to a cache can also recompute
+    them. So, before :py:meth:`loads` returns anything, it also serializes the loaded packets again and checks that the
+    result is identical to the data in the original source (see :py:meth:`matches`). This is much cheaper than parsing
+    the source, but means that a cache of data that does not encode its packets exactly the way PGPy does will never
+    be used.
+    """
+    __magic__ = b'PGPyPKC'
+    __version__ = 2
+
+    # value tags
+    _none = b'N'
+    _true = b'T'
+    _false = b'F'
+    _int = b'i'
+    _negint = b'j'
+    _mpi = b'm'
+    _bytes = b'b'
+    _bytearray = b'a'
+    _text = b's'
+    _fingerprint = b'f'
+    _list = b'l'
+    _tuple = b't'
+    _set = b'S'
+    _dict = b'd'
+    _odict = b'o'
+    _datetime = b'D'
+    _timedelta = b'z'
+    _enum = b'e'
+    _object = b'O'
+
+    @staticmethod
+    def normalize(source):
+        """Coerce ``source`` to ``bytes`` the same way :py:meth:`~pgpy.types.Armorable.from_blob` does."""
+        if isinstance(source, six.binary_type):
+            return source
+
+        if isinstance(source, bytearray):
+            return bytes(source)
+
+        return source.encode('latin-1')
+
+    @classmethod
+    def digest(cls, source):
+        """Compute the digest that ties a cache to the data it was generated from."""
+        return hashlib.sha256(cls.normalize(source)).digest()
+
+    @classmethod
+    def _preamble(cls):
+        ver = __version__.encode('ascii')
+        return cls.__magic__ + bytearray([cls.__version__, len(ver)]) + ver
+
+    @classmethod
+    def dumps(cls, packets, source, headers=None):
+        """
+        Serialize parsed packets.
+
+        :param packets: the packets parsed from ``source``, in order.
+        :type packets: ``list``
+        :param source: the data ``packets`` were parsed from.
+        :type source: ``str``, ``unicode``, ``bytes``, ``bytearray``
+        :param headers: ASCII armor headers to store alongside the packets, if any.
+        :type headers: ``OrderedDict``, ``None``
+        :raises: :py:exc:`~pgpy.errors.PGPError` if something that can't be stored is encountered.
+        :returns: ``bytes``
+        """
+        enc = cls._Encoder()
+        enc.encode((headers, list(packets)))
+        payload = bytes(enc.buf)
+
+        return cls._preamble() + cls.digest(source) + hashlib.sha256(payload).digest() + payload
+
+    @classmethod
+    def check(cls, cache, source):
+        """
+        Check that ``cache`` was written by this version of PGPy, from ``source``, and has not been damaged since.
+        This does not decode anything, so it can't tell whether the cache was deliberately rewritten.
+
+        :returns: ``bool``
+        """
+        cache = bytes(cache)
+        preamble = cls._preamble()
+        hstart = len(preamble)
+        pstart = hstart + 64
+
+        return all([cache[:hstart] == preamble,
+                    cache[hstart:hstart + 32] == cls.digest(source),
+                    cache[hstart + 32:pstart] == hashlib.sha256(cache[pstart:]).digest()])
+
+    @classmethod
+    def loads(cls, cache, source):
+        """
+        Load packets serialized with :py:meth:`dumps`.
+
+        :param cache: the serialized cache.
+        :type cache: ``bytes``, ``bytearray``
+        :param source: the original data the cache was generated from.
+        :type source: ``str``, ``unicode``, ``bytes``, ``bytearray``
+        :returns: a ``tuple`` of ``(headers, packets)``, or ``None`` if ``cache`` is stale, from a different version,
+                  corrupt, or its packets do not :py:meth:`match <matches>` ``source``.
+        """
+        if not cls.check(cache, source):
+            return None
+
+        payload = bytes(cache)[len(cls._preamble()) + 64:]
+        try:
+            dec = cls._Decoder(payload)
+            headers, packets = dec.decode()
+
+            if dec.pos != len(payload) or not cls.matches(packets, source, headers):
+                return None
+
+        except (PGPError, IndexError, KeyError, TypeError, ValueError, AttributeError, ImportError, struct.error):
+            return None
+
+        return headers, packets
+
+    @classmethod
+    def matches(cls, packets, source, headers=None):
+        """
+        Check that serializing ``packets`` reproduces the data in ``source`` exactly, and that ``headers`` are the
+        ASCII armor headers of ``source``.
+
+        :param packets: the packets to check.
+        :type packets: ``list``
+        :param source: the data ``packets`` should have been parsed from.
+        :type source: ``str``, ``unicode``, ``bytes``, ``bytearray``
+        :param headers: the ASCII armor headers that should have been parsed from ``source``, if any.
+        :type headers: ``OrderedDict``, ``None``
+        :returns: ``bool``
+        """
+        # the CRC24 is by far the slowest part of de-armoring, and source can't have changed since it was parsed the
+        # first time, so there is no need to check it again
+        unarmored = Armorable.ascii_unarmor(bytearray(cls.normalize(source)), crc=False)
+
+        return unarmored['headers'] == headers and unarmored['body'] == bytearray().join(p.__bytes__() for p in packets)
+
+    class _Encoder(object):
+        # the storage slots of each class that has been encoded, in MRO order
+        _slots = {}
+
+        def __init__(self):
+            self.buf = bytearray()
+            self.classes = {}
+            self.names = {}
+
+        def varint(self, n):
+            while n > 0x7f:
+                self.buf.append((n & 0x7f) | 0x80)
+                n >>= 7
+            self.buf.append(n)
+
+        def blob(self, data):
+            self.varint(len(data))
+            self.buf += data
+
+        def interned(self, table, key, value):
+            # the first occurrence of a value is written inline; all subsequent ones are written by reference
+            if key in table:
+                self.varint(table[key])
+                return
+
+            table[key] = len(table)
+            self.varint(table[key])
+            self.blob(value.encode('ascii'))
+
+        def integer(self, n):
+            self.blob(PGPObject.int_to_bytes(n))
+
+        @classmethod
+        def slots(cls, t):
+            if t not in cls._slots:
+                slots = []
+                for k in t.__mro__:
+                    kslots = k.__dict__.get('__slots__', ())
+                    for name in ((kslots,) if isinstance(kslots, six.string_types) else kslots):
+                        if name in ('__dict__', '__weakref__'):
+                            continue
+
+                        if name.startswith('__') and not name.endswith('__'):
+                            # private names are mangled with the name of the class that declared them
+                            name = '_{:s}{:s}'.format(k.__name__.lstrip('_'), name)
+
+                        slots.append((name, k.__dict__[name]))
+                cls._slots[t] = slots
+
+            return cls._slots[t]
+
+        def state(self, obj):
+            state = list(getattr(obj, '__dict__', {}).items())
+            for name, slot in self.slots(type(obj)):
+                try:
+                    state.append((name, slot.__get__(obj)))
+
+                except AttributeError:
+                    # unset slot
+                    pass
+
+            return state
+
+        def encode(self, obj):
+            buf = self.buf
+            t = type(obj)
+
+            if obj is None:
+                buf += PacketCache._none
+
+            elif t is bool:
+                buf += PacketCache._true if obj else PacketCache._false
+
+            elif isinstance(obj, Enum):
+                buf += PacketCache._enum
+                self.interned(self.classes, t, '{:s}:{:s}'.format(t.__module__, t.__name__))
+                self.interned(self.names, obj.name, obj.name)
+
+            elif t is MPI:
+                buf += PacketCache._mpi
+                self.integer(obj)
+
+            elif t in six.integer_types:
+                buf += PacketCache._int if obj >= 0 else PacketCache._negint
+                self.integer(abs(obj))
+
+            elif t is Fingerprint:
+                buf += PacketCache._fingerprint
+                self.blob(str(obj).encode('ascii'))
+
+            elif t is six.binary_type:
+                buf += PacketCache._bytes
+                self.blob(obj)
+
+            elif t is bytearray:
+                buf += PacketCache._bytearray
+                self.blob(obj)
+
+            elif t is six.text_type:
+                buf += PacketCache._text
+                self.blob(obj.encode('utf-8'))
+
+            elif t in (list, tuple, set):
+                buf += {list: PacketCache._list, tuple: PacketCache._tuple, set: PacketCache._set}[t]
+                self.varint(len(obj))
+                for item in obj:
+                    self.encode(item)
+
+            elif t in (dict, collections.OrderedDict):
+                buf += PacketCache._dict if t is dict else PacketCache._odict
+                self.varint(len(obj))
+                for k, v in obj.items():
+                    self.encode(k)
+                    self.encode(v)
+
+            elif t is datetime.datetime:
+                if obj.tzinfo is not None:  # pragma: no cover
+                    raise PGPError("Expected: naive datetime")
+                buf += PacketCache._datetime
+                buf += struct.pack('>HBBBBBI', obj.year, obj.month, obj.day, obj.hour, obj.minute, obj.second, obj.microsecond)
+
+            elif t is datetime.timedelta:
+                buf += PacketCache._timedelta
+                buf += struct.pack('>iII', obj.days, obj.seconds, obj.microseconds)
+
+            elif isinstance(obj, PGPObject) and t.__module__.startswith('pgpy.'):
+                buf += PacketCache._object
+                self.interned(self.classes, t, '{:s}:{:s}'.format(t.__module__, t.__name__))
+                state = self.state(obj)
+                self.varint(len(state))
+                for name, value in state:
+                    self.interned(self.names, name, name)
+                    self.encode(value)
+
+            else:
+                raise PGPError("Cannot cache object of type {:s}".format(t.__name__))
+
+    class _Decoder(object):
+        def __init__(self, payload):
+            self.data = bytearray(payload)
+            self.pos = 0
+            self.classes = []
+            self.names = []
+
+        def varint(self):
+            n = shift = 0
+            while True:
+                b = self.data[self.pos]
+                self.pos += 1
+                n |= (b & 0x7f) << shift
+                if not b & 0x80:
+                    return n
+                shift += 7
+
+        def blob(self):
+            ln = self.varint()
+            if self.pos + ln > len(self.data):
+                raise PGPError("Truncated cache")
+            start, self.pos = self.pos, self.pos + ln
+            return self.data[start:self.pos]
+
+        def unpack(self, fmt):
+            vals = struct.unpack_from(fmt, self.data, self.pos)
+            self.pos += struct.calcsize(fmt)
+            return vals
+
+        def interned_name(self):
+            idx = self.varint()
+            if idx == len(self.names):
+                self.names.append(self.blob().decode('ascii'))
+            return self.names[idx]
+
+        def interned_class(self):
+            idx = self.varint()
+            if idx == len(self.classes):
+                modname, _, clsname = self.blob().decode('ascii').partition(':')
+                if not modname.startswith('pgpy.'):
+                    raise PGPError("Refusing to load class from module {:s}".format(modname))
+
+                cls = getattr(importlib.import_module(modname), clsname)
+                if not (isinstance(cls, type) and issubclass(cls, (PGPObject, Enum)) and cls.__module__ == modname):
+                    raise PGPError("Refusing to load {:s}:{:s}".format(modname, clsname))
+                self.classes.append(cls)
+
+            return self.classes[idx]
+
+        def decode(self):
+            tag = self.data[self.pos:self.pos + 1]
+            self.pos += 1
+
+            if tag == PacketCache._none:
+                return None
+
+            if tag == PacketCache._true:
+                return True
+
+            if tag == PacketCache._false:
+                return False
+
+            if tag == PacketCache._int:
+                return PGPObject.bytes_to_int(self.blob())
+
+            if tag == PacketCache._negint:
+                return -PGPObject.bytes_to_int(self.blob())
+
+            if tag == PacketCache._mpi:
+                return MPI(PGPObject.bytes_to_int(self.blob()))
+
+            if tag == PacketCache._fingerprint:
+                return Fingerprint(self.blob().decode('ascii'))
+
+            if tag == PacketCache._bytes:
+                return bytes(self.blob())
+
+            if tag == PacketCache._bytearray:
+                return self.blob()
+
+            if tag == PacketCache._text:
+                return self.blob().decode('utf-8')
+
+            if tag == PacketCache._list:
+                return [self.decode() for _ in range(self.varint())]
+
+            if tag == PacketCache._tuple:
+                return tuple(self.decode() for _ in range(self.varint()))
+
+            if tag == PacketCache._set:
+                return set(self.decode() for _ in range(self.varint()))
+
+            if tag in (PacketCache._dict, PacketCache._odict):
+                d = dict() if tag == PacketCache._dict else collections.OrderedDict()
+                for _ in range(self.varint()):
+                    k = self.decode()
+                    d[k] = self.decode()
+                return d
+
+            if tag == PacketCache._datetime:
+                return datetime.datetime(*self.unpack('>HBBBBBI'))
+
+            if tag == PacketCache._timedelta:
+                return datetime.timedelta(*self.unpack('>iII'))
+
+            if tag == PacketCache._enum:
+                cls = self.interned_class()
+                return cls[self.interned_name()]
+
+            if tag == PacketCache._object:
+                cls = self.interned_class()
+                if not issubclass(cls, PGPObject):
+                    raise PGPError("Expected: PGPObject subclass")
+
+                obj = cls.__new__(cls)
+                for _ in range(self.varint()):
+                    name = self.interned_name()
+                    # bypass any __setattr__ override; this only ever assigns storage attributes and slots
+                    object.__setattr__(obj, name, self.decode())
+                return obj
+
+            raise PGPError("Unrecognized tag: {!r}".format(bytes(tag)))
+
+
+class DerivedKeyCache(object):
+    """
+    An in-process, time-limited cache of keys derived from passphrases by String-to-Key specifiers, so that
+    unlocking the same protected key (or decrypting with the same passphrase) repeatedly only pays the cost of the
+    iterated S2K once per ``ttl`` seconds.
+
+    Entries are keyed on every parameter of the S2K specifier, along with an HMAC of the passphrase under a random key
+    that is generated for each cache and never leaves it. Derived keys are held in mutable buffers that are overwritten
+    with zeroes when they expire, are evicted to make room for newer entries, or when the cache is cleared.
+
+    The cache is not used unless it is enabled::
+
+        DerivedKeyCache.enable(ttl=300, maxsize=16)
+
+    :param ttl: The number of seconds an entry remains valid after it was added.
+    :type ttl: ``int``, ``float``
+    :param maxsize: The maximum number of entries to hold. When full, the oldest entry is evicted.
+    :type maxsize: ``int``
+    """
+    _clock = staticmethod(getattr(time, 'monotonic', time.time))
+
+    def __init__(self, ttl=300, maxsize=32):
+        if ttl <= 0 or maxsize < 1:
+            raise ValueError("ttl and maxsize must both be positive")
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._hmackey = os.urandom(32)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            self._expire()
+            return len(self._entries)
+
+    @classmethod
+    def enable(cls, ttl=300, maxsize=32):
+        """
+        Create a new cache and start using it for all String-to-Key derivations. Any cache that was previously enabled
+        is cleared.
+
+        :returns: The newly enabled :py:obj:`DerivedKeyCache`
+        """
+        cls.disable()
+        String2Key.keycache = cls(ttl, maxsize)
+        return String2Key.keycache
+
+    @staticmethod
+    def disable():
+        """Stop caching derived keys, and wipe anything currently cached."""
+        keycache, String2Key.keycache = String2Key.keycache, None
+        if keycache is not None:
+            keycache.clear()
+
+    def cachekey(self, s2k, passphrase):
+        """Compute the cache key for deriving a key from ``passphrase`` with ``s2k``"""
+        if isinstance(passphrase, six.text_type):
+            passphrase = passphrase.encode('latin-1')
+
+        return (s2k.encalg, s2k.specifier, s2k.halg, bytes(s2k.salt), s2k.count,
+                hmac.new(self._hmackey, bytes(passphrase), hashlib.sha256).digest())
+
+    def get(self, ckey):
+        """
+        Return a copy of the derived key cached under ``ckey``, or ``None`` if there isn't one.
+        The copy is a ``bytearray``, so the caller can overwrite it once it is no longer needed.
+        """
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(ckey, None)
+            if entry is None:
+                return None
+
+            return bytearray(entry[1])
+
+    def put(self, ckey, sessionkey):
+        """Cache ``sessionkey`` under ``ckey``"""
+        with self._lock:
+            self._expire()
+            if ckey in self._entries:
+                self._wipe(self._entries.pop(ckey))
+
+            while len(self._entries) >= self.maxsize:
+                self._wipe(self._entries.popitem(last=False)[1])
+
+            self._entries[ckey] = (self._clock() + self.ttl, bytearray(sessionkey))
+
+    def clear(self):
+        """Wipe and remove every entry."""
+        with self._lock:
+            while self._entries:
+                self._wipe(self._entries.popitem()[1])
+
+    def _expire(self):
+        # entries are kept in insertion order, so they also expire in order
+        now = self._clock()
+        while self._entries:
+            ckey, entry = next(iter(self._entries.items()))
+            if entry[0] > now:
+                break
+
+            self._wipe(self._entries.pop(ckey))
+
+    @staticmethod
+    def _wipe(entry):
+        buf = entry[1]
+        buf[:] = bytearray(len(buf))
+
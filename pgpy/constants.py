@@ -3,6 +3,7 @@
 import bz2
 import hashlib
 import imghdr
+import json
 import os
 import time
 import zlib
@@ -14,13 +15,13 @@ from pyasn1.type.univ import ObjectIdentifier
 
 import six
 
-from cryptography.hazmat.backends import openssl
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.ciphers import algorithms
 
 from .decorators import classproperty
 from .types import FlagEnum
 from ._curves import BrainpoolP256R1, BrainpoolP384R1, BrainpoolP512R1
+from ._curves import _register_curves
 
 __all__ = ['Backend',
            'EllipticCurveOID',
@@ -45,9 +46,26 @@ __all__ = ['Backend',
 # this is 50 KiB
 _hashtunedata = bytearray([10, 11, 12, 13, 14, 15, 16, 17] * 128 * 50)
 
+# S2K count calibration:
+#  - PGPY_S2K_COUNT (or PGPY_S2K_COUNT_<HASH>, e.g. PGPY_S2K_COUNT_SHA256) sets a coded count explicitly
+#  - PGPY_TUNE_CACHE is the path to a file to persist calibration results in; they are only persisted if it is set
+# counts loaded from that file are raised to at least _tunecache_min_count (65536 octets, the least GnuPG will use),
+# so that a stale or tampered file cannot weaken newly protected keys
+_s2kcount_env = 'PGPY_S2K_COUNT'
+_tunecache_env = 'PGPY_TUNE_CACHE'
+_tunecache_version = 1
+_tunecache_min_count = 96
+
 
 class Backend(Enum):
-    OpenSSL = openssl.backend
+    OpenSSL = 'openssl'
+
+    @property
+    def backend(self):
+        # loading cryptography's OpenSSL backend is one of the most expensive parts of importing PGPy,
+        # so it is not done until it is actually asked for
+        from cryptography.hazmat.backends import openssl
+        return openssl.backend
 
 
 class EllipticCurveOID(Enum):
@@ -91,16 +109,58 @@ class EllipticCurveOID(Enum):
     def __new__(cls, oid, curve=None):
         # preprocessing stage for enum members:
         #  - set enum_member.value to ObjectIdentifier(oid)
-        #  - if curve is not None and curve.name is in ec._CURVE_TYPES, set enum_member.curve to curve
-        #  - otherwise, set enum_member.curve to None
+        #  - set enum_member.oid_bytes to the encoded OID, as it appears in EC key material
+        #  - set enum_member._curve to curve; whether it is usable is checked by the curve property
         obj = object.__new__(cls)
         obj._value_ = ObjectIdentifier(oid)
-        obj.curve = None
+        obj.oid_bytes = cls._encode_oid(oid)
+        obj._curve = curve
+        return obj
 
-        if curve is not None and curve.name in ec._CURVE_TYPES:
-            obj.curve = curve
+    @staticmethod
+    def _encode_oid(oid):
+        # the contents octets of the DER encoding of oid: the first two arcs are combined into one,
+        # and then each arc is written in base 128, most significant group first, with the high bit set on all but the last
+        arcs = [ int(arc) for arc in oid.split('.') ] if oid else []
+        if arcs:
+            arcs[:2] = [arcs[0] * 40 + arcs[1]]
+
+        _bytes = bytearray()
+        for arc in arcs:
+            groups = [arc & 0x7f]
+            arc >>= 7
+            while arc:
+                groups.append(0x80 | (arc & 0x7f))
+                arc >>= 7
+            _bytes += bytearray(reversed(groups))
+
+        return bytes(_bytes)
 
-        return obj
+    @classmethod
+    def from_oid_bytes(cls, buf):
+        """
+        Look up a member by its encoded OID, as it appears in EC key material.
+
+        :raises: :py:exc:`ValueError` if ``buf`` is not the encoded OID of any member
+        """
+        try:
+            return _oid_bytes_map[bytes(buf)]
+
+        except KeyError:
+            raise ValueError("{!r} is not a valid {:s}".format(bytes(buf), cls.__name__))
+
+    @property
+    def curve(self):
+        """
+        The curve type for this OID, if it is supported by the OpenSSL backend. Otherwise, ``None``.
+        """
+        if self._curve is None:
+            return None
+
+        # the additional curves in _curves can only be registered once OpenSSL has been asked which curves it supports,
+        # which requires loading its bindings, so that is put off until a curve is actually needed
+        _register_curves()
+        return self._curve if self._curve.name in ec._CURVE_TYPES else None
 
     @property
     def can_gen(self):
@@ -132,6 +192,10 @@ class EllipticCurveOID(Enum):
         return algs.get(self.key_size, None)
 
 
+# reverse lookup table for EllipticCurveOID.from_oid_bytes, keyed by the encoded OID of each member
+_oid_bytes_map = dict((c.oid_bytes, c) for c in EllipticCurveOID if c.oid_bytes)
+
+
 class PacketTag(IntEnum):
     Invalid = 0
     PublicKeyEncryptedSessionKey = 1
@@ -346,35 +410,129 @@ class HashAlgorithm(IntEnum):
     @property
     def tuned_count(self):
         if self._tuned_count == 0:
-            self.tune_count()
+            count = self.configured_count()
+
+            if count is None:
+                count = self._load_tuned_count()
+
+            if count is None:
+                count = self.tune_count()
+                self._save_tuned_count(count)
+
+            self._tuned_count = count
 
         return self._tuned_count
 
-    def tune_count(self):
-        start = end = 0
+    @staticmethod
+    def tune_cache_path():
+        """
+        The path to the file that S2K count calibration results are persisted in, or ``None`` if they should not be.
+        This is ``$PGPY_TUNE_CACHE``; calibration results are not persisted unless it is set.
+        """
+        return os.environ.get(_tunecache_env, None) or None
+
+    def configured_count(self):
+        """
+        The coded S2K count specified in the environment for this hash algorithm, if there is one. Per-algorithm
+        settings (e.g. ``$PGPY_S2K_COUNT_SHA256``) take precedence over ``$PGPY_S2K_COUNT``.
+        """
+        for var in ('{:s}_{:s}'.format(_s2kcount_env, self.name), _s2kcount_env):
+            if os.environ.get(var, ''):
+                count = int(os.environ[var])
+                if not 0 <= count <= 255:
+                    raise ValueError("{:s} must be between 0 and 255".format(var))
+                return count
+
+        return None
+
+    def _load_tuned_count(self):
+        path = self.tune_cache_path()
+        if path is None:
+            return None
+
+        try:
+            with open(path, 'r') as tcf:
+                tc = json.load(tcf)
+
+            if tc['version'] == _tunecache_version and 0 < tc['counts'][self.name] <= 255:
+                return max(int(tc['counts'][self.name]), _tunecache_min_count)
+
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            pass
+
+        return None
+
+    def _save_tuned_count(self, count):
+        path = self.tune_cache_path()
+        if path is None:
+            return
+
+        counts = {}
+        try:
+            with open(path, 'r') as tcf:
+                tc = json.load(tcf)
+            if tc['version'] == _tunecache_version:
+                counts = dict(tc['counts'])
+
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            pass
+
+        counts[self.name] = count
+
+        # write to a temporary file first and then move it into place, so other processes never see a partial file
+        tmppath = '{:s}.{:d}.tmp'.format(path, os.getpid())
+        try:
+            # a bare filename is relative to the working directory, which already exists
+            tcdir = os.path.dirname(path)
+            if tcdir and not os.path.isdir(tcdir):
+                os.makedirs(tcdir)
+
+            with open(tmppath, 'w') as tcf:
+                json.dump({'version': _tunecache_version, 'counts': counts}, tcf)
+            getattr(os, 'replace', os.rename)(tmppath, path)
+
+        except (IOError, OSError):
+            # persisting calibration is strictly best-effort
+            pass
+
+    def tune_count(self, samples=5):
+        """
+        Calibrate the coded S2K count so that deriving a key with this hash algorithm takes about 100ms.
+        The hashing rate is the median of ``samples`` timed runs.
+
+        :returns: the coded count, which is also stored as :py:attr:`tuned_count`
+        """
+        clock = getattr(time, 'perf_counter', time.time)
         htd = _hashtunedata[:]
 
-        while start == end:
-            # potentially do this multiple times in case the resolution of time.time is low enough that
-            # hashing 100 KiB isn't enough time to produce a measurable difference
-            # (e.g. if the timer for time.time doesn't have enough precision)
-            htd = htd + htd
+        def timed():
             h = self.hasher
-
-            start = time.time()
+            start = clock()
             h.update(htd)
-            end = time.time()
+            return clock() - start
+
+        # grow the sample until hashing it takes long enough to be measured reliably
+        # (e.g. if the timer doesn't have enough precision to time hashing 100 KiB)
+        # this is judged by the median as well, so that a single slow run cannot stop it too early
+        while True:
+            runs = sorted(timed() for _ in range(samples))
+            elapsed = runs[len(runs) // 2]
+            if elapsed >= 0.005:
+                break
+
+            htd = htd + htd
 
         # now calculate how many bytes need to be hashed to reach our expected time period
         # GnuPG tunes for about 100ms, so we'll do that as well
         _TIME = 0.100
-        ct = int(len(htd) * (_TIME / (end - start)))
+        ct = int(len(htd) * (_TIME / elapsed))
         c1 = ((ct >> (ct.bit_length() - 5)) - 16)
         c2 = (ct.bit_length() - 11)
         c = ((c2 << 4) + c1)
 
         # constrain self._tuned_count to be between 0 and 255
         self._tuned_count = max(min(c, 255), 0)
+        return self._tuned_count
 
 
 class RevocationReason(IntEnum):
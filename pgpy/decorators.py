@@ -14,7 +14,8 @@ except ImportError:  # pragma: no cover
 
 from .errors import PGPError
 
-__all__ = ['classproperty',
+__all__ = ['cachedproperty',
+           'classproperty',
            'sdmethod',
            'sdproperty',
            'KeyAction']
@@ -38,6 +39,27 @@ def classproperty(fget):
     return ClassProperty(fget)
 
 
+def cachedproperty(fget):
+    """
+    A read-only property that is only computed once. The value is kept in the instance's ``_cache`` slot until the
+    instance's ``__cachekey__`` changes, which discards every value cached so far.
+    """
+    name = fget.__name__
+
+    @functools.wraps(fget)
+    def getter(obj):
+        key = obj.__cachekey__
+        if obj._cache is None or obj._cache[0] != key:
+            obj._cache = (key, {})
+
+        values = obj._cache[1]
+        if name not in values:
+            values[name] = fget(obj)
+        return values[name]
+
+    return property(getter)
+
+
 def sdmethod(meth):
     """
     This is a hack to monkey patch sdproperty to work as expected with instance methods.
@@ -60,7 +82,25 @@ def sdproperty(fget):
         raise TypeError(str(val.__class__))
 
     class SDProperty(property):
+        def __init__(self, fget=None, fset=None, fdel=None, doc=None):
+            super(SDProperty, self).__init__(fget, fset, fdel, doc)
+            # the setter for each value type, resolved through singledispatch only the first time that type is assigned
+            self._setters = {}
+
+        def __set__(self, obj, val):
+            try:
+                fset = self._setters[val.__class__]
+
+            except KeyError:
+                fset = self._setters[val.__class__] = self.fset.dispatch(val.__class__)
+
+            fset(obj, val)
+
         def register(self, cls=None, fset=None):
+            if fset is None:
+                return lambda f: self.register(cls, f)
+
+            self._setters.clear()
             return self.fset.register(cls, fset)
 
         def setter(self, fset):
@@ -11,11 +11,6 @@ import itertools
 import math
 import os
 
-from pyasn1.codec.der import decoder
-from pyasn1.codec.der import encoder
-from pyasn1.type.univ import Integer
-from pyasn1.type.univ import Sequence
-
 from cryptography.exceptions import InvalidSignature
 
 from cryptography.hazmat.backends import default_backend
@@ -26,6 +21,8 @@ from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives.asymmetric import dsa
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
 
 from cryptography.hazmat.primitives.kdf.concatkdf import ConcatKDFHash
 
@@ -87,18 +84,29 @@ __all__ = ['SubPackets',
 
 
 class SubPackets(collections.MutableMapping, Field):
+    __slots__ = ('_hashed_sp', '_unhashed_sp', '_rev')
     _spmodule = signature
 
+    @property
+    def revision(self):
+        """incremented every time a subpacket is added, so that values decoded from subpackets can be cached"""
+        return self._rev
+
     def __init__(self):
         super(SubPackets, self).__init__()
         self._hashed_sp = collections.OrderedDict()
         self._unhashed_sp = collections.OrderedDict()
+        self._rev = 0
 
     def __bytearray__(self):
-        _bytes = bytearray()
-        _bytes += self.__hashbytearray__()
-        _bytes += self.__unhashbytearray__()
-        return _bytes
+        return self._serialize()
+
+    def write_into(self, buf, offset=0):
+        for sps in (self._hashed_sp, self._unhashed_sp):
+            offset = self.bytes_into(buf, offset, self.int_to_bytes(sum(len(sp) for sp in sps.values()), 2))
+            for sp in sps.values():
+                offset = sp.write_into(buf, offset)
+        return offset
 
     def __hashbytearray__(self):
         _bytes = bytearray()
@@ -114,8 +122,8 @@ class SubPackets(collections.MutableMapping, Field):
             _bytes += uhsp.__bytearray__()
         return _bytes
 
-    def __len__(self):  # pragma: no cover
-        return sum(sp.header.length for sp in itertools.chain(self._hashed_sp.values(), self._unhashed_sp.values())) + 4
+    def __len__(self):
+        return sum(len(sp) for sp in itertools.chain(self._hashed_sp.values(), self._unhashed_sp.values())) + 4
 
     def __iter__(self):
         for sp in itertools.chain(self._hashed_sp.values(), self._unhashed_sp.values()):
@@ -141,28 +149,39 @@ class SubPackets(collections.MutableMapping, Field):
             i += 1
 
         d[(key, i)] = val
+        self._rev += 1
 
     def __getitem__(self, key):
         if isinstance(key, tuple):  # pragma: no cover
             return self._hashed_sp.get(key, self._unhashed_sp.get(key))
 
         if key.startswith('h_'):
-            return [v for k, v in self._hashed_sp.items() if key[2:] == k[0]]
+            return self._bytype(self._hashed_sp, key[2:])
 
         else:
-            return [v for k, v in itertools.chain(self._hashed_sp.items(), self._unhashed_sp.items()) if key == k[0]]
+            return self._bytype(self._hashed_sp, key) + self._bytype(self._unhashed_sp, key)
 
     def __delitem__(self, key):
         ##TODO: this
         raise NotImplementedError
 
     def __contains__(self, key):
-        return key in set(k for k, _ in itertools.chain(self._hashed_sp, self._unhashed_sp))
+        return (key, 0) in self._hashed_sp or (key, 0) in self._unhashed_sp
+
+    @staticmethod
+    def _bytype(d, key):
+        # __setitem__ stores subpackets of the same type under consecutive sequence ids starting at 0,
+        # so all of them can be found by probing for each id in turn instead of scanning every subpacket
+        sps = []
+        while (key, len(sps)) in d:
+            sps.append(d[(key, len(sps))])
+        return sps
 
     def __copy__(self):
         sp = SubPackets()
         sp._hashed_sp = self._hashed_sp.copy()
         sp._unhashed_sp = self._unhashed_sp.copy()
+        sp._rev = self._rev
 
         return sp
 
@@ -209,13 +228,17 @@ class UserAttributeSubPackets(SubPackets):
     except that there isn't a length specifier. So, parse will only parse one packet,
     appending that one packet to self.__unhashed_sp.
     """
+    __slots__ = ()
+
     _spmodule = userattribute
 
     def __bytearray__(self):
-        _bytes = bytearray()
+        return self._serialize()
+
+    def write_into(self, buf, offset=0):
         for uhsp in self._unhashed_sp.values():
-            _bytes += uhsp.__bytearray__()
-        return _bytes
+            offset = uhsp.write_into(buf, offset)
+        return offset
 
     def __len__(self):  # pragma: no cover
         return sum(len(sp) for sp in self._unhashed_sp.values())
@@ -229,6 +252,8 @@ class UserAttributeSubPackets(SubPackets):
 
 
 class Signature(MPIs):
+    __slots__ = ()
+
     def __init__(self):
         for i in self.__mpis__:
             setattr(self, i, MPI(0))
@@ -249,6 +274,7 @@ class Signature(MPIs):
 
 
 class RSASignature(Signature):
+    __slots__ = ('md_mod_n',)
     __mpis__ = ('md_mod_n', )
 
     def __sig__(self):
@@ -262,67 +288,26 @@ class RSASignature(Signature):
 
 
 class DSASignature(Signature):
+    __slots__ = ('r', 's')
     __mpis__ = ('r', 's')
 
     def __sig__(self):
-        # return the signature data into an ASN.1 sequence of integers in DER format
-        seq = Sequence()
-        for i in self:
-            seq.setComponentByPosition(len(seq), Integer(i))
-
-        return encoder.encode(seq)
+        # return the signature data as a DER-encoded sequence of two integers
+        return encode_dss_signature(self.r, self.s)
 
     def from_signer(self, sig):
-        ##TODO: just use pyasn1 for this
-        def _der_intf(_asn):
-            if _asn[0] != 0x02:  # pragma: no cover
-                raise ValueError("Expected: Integer (0x02). Got: 0x{:02X}".format(_asn[0]))
-            del _asn[0]
-
-            if _asn[0] & 0x80:  # pragma: no cover
-                llen = _asn[0] & 0x7F
-                del _asn[0]
-
-                flen = self.bytes_to_int(_asn[:llen])
-                del _asn[:llen]
-
-            else:
-                flen = _asn[0] & 0x7F
-                del _asn[0]
-
-            i = self.bytes_to_int(_asn[:flen])
-            del _asn[:flen]
-            return i
-
-        if isinstance(sig, bytes):
-            sig = bytearray(sig)
-
-        # this is a very limited asn1 decoder - it is only intended to decode a DER encoded sequence of integers
-        if not sig[0] == 0x30:
-            raise NotImplementedError("Expected: Sequence (0x30). Got: 0x{:02X}".format(sig[0]))
-        del sig[0]
-
-        # skip the sequence length field
-        if sig[0] & 0x80:  # pragma: no cover
-            llen = sig[0] & 0x7F
-            del sig[:llen + 1]
-
-        else:
-            del sig[0]
-
-        self.r = MPI(_der_intf(sig))
-        self.s = MPI(_der_intf(sig))
+        r, s = decode_dss_signature(bytes(sig))
+        self.r = MPI(r)
+        self.s = MPI(s)
 
     def parse(self, packet):
-        self.r = MPI(packet)
-        self.s = MPI(packet)
+        self.r, offset = MPI.decode(packet)
+        self.s, offset = MPI.decode(packet, offset)
+        del packet[:offset]
 
 
 class ECDSASignature(DSASignature):
-    def from_signer(self, sig):
-        seq, _ = decoder.decode(sig)
-        self.r = MPI(seq[0])
-        self.s = MPI(seq[1])
+    __slots__ = ()
 
 
 class PubKey(MPIs):
@@ -405,8 +390,9 @@ class RSAPub(PubKey):
         return True
 
     def parse(self, packet):
-        self.n = MPI(packet)
-        self.e = MPI(packet)
+        self.n, offset = MPI.decode(packet)
+        self.e, offset = MPI.decode(packet, offset)
+        del packet[:offset]
 
 
 class DSAPub(PubKey):
@@ -429,10 +415,11 @@ class DSAPub(PubKey):
         return True
 
     def parse(self, packet):
-        self.p = MPI(packet)
-        self.q = MPI(packet)
-        self.g = MPI(packet)
-        self.y = MPI(packet)
+        self.p, offset = MPI.decode(packet)
+        self.q, offset = MPI.decode(packet, offset)
+        self.g, offset = MPI.decode(packet, offset)
+        self.y, offset = MPI.decode(packet, offset)
+        del packet[:offset]
 
 
 class ElGPub(PubKey):
@@ -442,9 +429,10 @@ class ElGPub(PubKey):
         raise NotImplementedError()
 
     def parse(self, packet):
-        self.p = MPI(packet)
-        self.g = MPI(packet)
-        self.y = MPI(packet)
+        self.p, offset = MPI.decode(packet)
+        self.g, offset = MPI.decode(packet, offset)
+        self.y, offset = MPI.decode(packet, offset)
+        del packet[:offset]
 
 
 class ECDSAPub(PubKey):
@@ -456,14 +444,15 @@ class ECDSAPub(PubKey):
 
     def __len__(self):
         return sum([len(getattr(self, i)) - 2 for i in self.__pubfields__] +
-                   [3, len(encoder.encode(self.oid.value)) - 1])
+                   [3, len(self.oid.oid_bytes) + 1])
 
     def __pubkey__(self):
         return ec.EllipticCurvePublicNumbers(self.x, self.y, self.oid.curve()).public_key(default_backend())
 
     def __bytearray__(self):
         _b = bytearray()
-        _b += encoder.encode(self.oid.value)[1:]
+        _b.append(len(self.oid.oid_bytes))
+        _b += self.oid.oid_bytes
         # 0x04 || x || y
         # where x and y are the same length
         _xy = b'\x04' + self.x.to_mpibytes()[2:] + self.y.to_mpibytes()[2:]
@@ -490,17 +479,8 @@ class ECDSAPub(PubKey):
 
     def parse(self, packet):
         oidlen = packet[0]
-        del packet[0]
-        _oid = bytearray(b'\x06')
-        _oid.append(oidlen)
-        _oid += bytearray(packet[:oidlen])
-        # try:
-        oid, _  = decoder.decode(bytes(_oid))
-
-        # except:
-        #     raise PGPError("Bad OID octet stream: b'{:s}'".format(''.join(['\\x{:02X}'.format(c) for c in _oid])))
-        self.oid = EllipticCurveOID(oid)
-        del packet[:oidlen]
+        self.oid = EllipticCurveOID.from_oid_bytes(packet[1:oidlen + 1])
+        del packet[:oidlen + 1]
 
         # flen = (self.oid.bit_length // 8)
         xy = bytearray(MPI(packet).to_mpibytes()[2:])
@@ -526,14 +506,15 @@ class ECDHPub(PubKey):
         return sum([len(getattr(self, i)) - 2 for i in self.__pubfields__] +
                    [3,
                     len(self.kdf),
-                    len(encoder.encode(self.oid.value)) - 1])
+                    len(self.oid.oid_bytes) + 1])
 
     def __pubkey__(self):
         return ec.EllipticCurvePublicNumbers(self.x, self.y, self.oid.curve()).public_key(default_backend())
 
     def __bytearray__(self):
         _b = bytearray()
-        _b += encoder.encode(self.oid.value)[1:]
+        _b.append(len(self.oid.oid_bytes))
+        _b += self.oid.oid_bytes
         # 0x04 || x || y
         # where x and y are the same length
         _xy = b'\x04' + self.x.to_mpibytes()[2:] + self.y.to_mpibytes()[2:]
@@ -578,17 +559,8 @@ class ECDHPub(PubKey):
                 encryption; see Section 8 for details
         """
         oidlen = packet[0]
-        del packet[0]
-        _oid = bytearray(b'\x06')
-        _oid.append(oidlen)
-        _oid += bytearray(packet[:oidlen])
-        # try:
-        oid, _  = decoder.decode(bytes(_oid))
-
-        # except:
-        #     raise PGPError("Bad OID octet stream: b'{:s}'".format(''.join(['\\x{:02X}'.format(c) for c in _oid])))
-        self.oid = EllipticCurveOID(oid)
-        del packet[:oidlen]
+        self.oid = EllipticCurveOID.from_oid_bytes(packet[1:oidlen + 1])
+        del packet[:oidlen + 1]
 
         # flen = (self.oid.bit_length // 8)
         xy = bytearray(MPI(packet).to_mpibytes()[2:])
@@ -709,6 +681,14 @@ class String2Key(Field):
     After the hashing is done, the data is unloaded from the hash
     context(s) as with the other S2K algorithms.
     """
+    __slots__ = ('_count', '_encalg', '_halg', '_specifier', 'iv', 'salt', 'usage')
+
+    # the size of the repeated salt+passphrase block that is fed to the hash context(s) at a time
+    __s2k_block_size__ = 65536
+
+    # an optional pgpy.cache.DerivedKeyCache shared by all String2Key instances; see DerivedKeyCache.enable
+    keycache = None
+
     @sdproperty
     def encalg(self):
         return self._encalg
@@ -780,7 +760,18 @@ class String2Key(Field):
         return _bytes
 
     def __len__(self):
-        return len(self.__bytearray__())
+        l = 1
+        if bool(self):
+            l += 2
+            if self.specifier >= String2KeyType.Simple:
+                l += 1
+            if self.specifier >= String2KeyType.Salted:
+                l += len(self.salt)
+            if self.specifier == String2KeyType.Iterated:
+                l += 1
+            if self.iv is not None:
+                l += len(self.iv)
+        return l
 
     def __bool__(self):
         return self.usage in [254, 255]
@@ -817,6 +808,24 @@ class String2Key(Field):
                 del packet[:(self.encalg.block_size // 8)]
 
     def derive_key(self, passphrase):
+        keycache = String2Key.keycache
+        if keycache is None:
+            return self._derive_key(passphrase)
+
+        ckey = keycache.cachekey(self, passphrase)
+        cached = keycache.get(ckey)
+        if cached is None:
+            sessionkey = self._derive_key(passphrase)
+            keycache.put(ckey, sessionkey)
+            return sessionkey
+
+        # some versions of cryptography only accept keys as bytes, so return the same type _derive_key does,
+        # and wipe the mutable copy the cache handed out
+        sessionkey = bytes(cached)
+        cached[:] = bytearray(len(cached))
+        return sessionkey
+
+    def _derive_key(self, passphrase):
         ##TODO: raise an exception if self.usage is not 254 or 255
         keylen = self.encalg.key_size
         hashlen = self.halg.digest_size * 8
@@ -831,26 +840,30 @@ class String2Key(Field):
         if self.specifier >= String2KeyType.Salted:
             hsalt = bytes(self.salt)
 
-        count = len(hsalt + hpass)
-        if self.specifier == String2KeyType.Iterated and self.count > len(hsalt + hpass):
+        hunit = hsalt + hpass
+        count = len(hunit)
+        if self.specifier == String2KeyType.Iterated and self.count > len(hunit):
             count = self.count
 
-        hcount = (count // len(hsalt + hpass))
-        hleft = count - (hcount * len(hsalt + hpass))
-
-        hashdata = ((hsalt + hpass) * hcount) + (hsalt + hpass)[:hleft]
+        # rather than building the entire count-octet input at once (up to ~64MiB), feed each hash context
+        # a fixed-size block made of whole repetitions of salt+passphrase, followed by whatever is left over
+        hblock = hunit * max(1, self.__s2k_block_size__ // max(1, len(hunit)))
+        hblocks, hleft = divmod(count, max(1, len(hblock)))
 
         h = []
         for i in range(0, ctx):
             _h = self.halg.hasher
             _h.update(b'\x00' * i)
-            _h.update(hashdata)
+            for _ in range(hblocks):
+                _h.update(hblock)
+            _h.update(hblock[:hleft])
             h.append(_h)
 
         # GC some stuff
         del hsalt
         del hpass
-        del hashdata
+        del hunit
+        del hblock
 
         # and return the key!
         return b''.join(hc.digest() for hc in h)[:(keylen // 8)]
@@ -872,6 +885,8 @@ class ECKDF(Field):
           used to wrap the symmetric key used for the message
           encryption; see Section 8 for details
     """
+    __slots__ = ('_encalg', '_halg')
+
     @sdproperty
     def halg(self):
         return self._halg
@@ -925,7 +940,8 @@ class ECKDF(Field):
         # assemble the additional data as defined in RFC 6637:
         #  Param = curve_OID_len || curve_OID || public_key_alg_ID || 03 || 01 || KDF_hash_ID || KEK_alg_ID for AESKeyWrap || "Anonymous
         data = bytearray()
-        data += encoder.encode(curve.value)[1:]
+        data.append(len(curve.oid_bytes))
+        data += curve.oid_bytes
         data.append(pkalg)
         data += b'\x03\x01'
         data.append(self.halg)
@@ -976,13 +992,16 @@ class PrivKey(PubKey):
         return _bytes
 
     def __len__(self):
-        l = super(PrivKey, self).__len__() + len(self.s2k) + len(self.chksum)
+        l = super(PrivKey, self).__len__() + len(self.s2k)
         if self.s2k:
             l += len(self.encbytes)
 
         else:
             l += sum(len(getattr(self, i)) for i in self.__privfields__)
 
+        if self.s2k.usage == 0:
+            l += len(self.chksum)
+
         return l
 
     @abc.abstractmethod
@@ -1023,7 +1042,7 @@ class PrivKey(PubKey):
         pt += hashlib.new('sha1', pt).digest()
 
         # encrypt
-        self.encbytes = bytearray(_encrypt(bytes(pt), bytes(sessionkey), enc_alg, bytes(self.s2k.iv)))
+        self.encbytes = _encrypt(pt, bytes(sessionkey), enc_alg, bytes(self.s2k.iv))
 
         # delete pt and clear self
         del pt
@@ -1048,7 +1067,7 @@ class PrivKey(PubKey):
         del passphrase
 
         # attempt to decrypt this key
-        pt = _decrypt(bytes(self.encbytes), bytes(sessionkey), self.s2k.encalg, bytes(self.s2k.iv))
+        pt = _decrypt(self.encbytes, bytes(sessionkey), self.s2k.encalg, bytes(self.s2k.iv))
 
         # check the hash to see if we decrypted successfully or not
         if self.s2k.usage == 254 and not pt[-20:] == hashlib.new('sha1', pt[:-20]).digest():
@@ -1066,8 +1085,24 @@ class PrivKey(PubKey):
     def sign(self, sigdata, hash_alg):
         return NotImplemented  # pragma: no cover
 
+    def pin(self):
+        """construct the backend private key object now, and keep using it until :py:meth:`clear` is called"""
+        self._pinned = self.__privkey__()
+
+    def unpin(self):
+        """stop using the pinned backend private key object, if there is one"""
+        # this works whether _pinned is an instance attribute or an unset slot
+        if hasattr(self, '_pinned'):
+            delattr(self, '_pinned')
+
+    def privkey(self):
+        """return the pinned backend private key object if there is one, otherwise construct a new one"""
+        pinned = getattr(self, '_pinned', None)
+        return pinned if pinned is not None else self.__privkey__()
+
     def clear(self):
         """delete and re-initialize all private components to zero"""
+        self.unpin()
         for field in self.__privfields__:
             delattr(self, field)
             setattr(self, field, MPI(0))
@@ -1125,10 +1160,11 @@ class RSAPriv(PrivKey, RSAPub):
         self.s2k.parse(packet)
 
         if not self.s2k:
-            self.d = MPI(packet)
-            self.p = MPI(packet)
-            self.q = MPI(packet)
-            self.u = MPI(packet)
+            self.d, offset = MPI.decode(packet)
+            self.p, offset = MPI.decode(packet, offset)
+            self.q, offset = MPI.decode(packet, offset)
+            self.u, offset = MPI.decode(packet, offset)
+            del packet[:offset]
 
             if self.s2k.usage == 0:
                 self.chksum = packet[:2]
@@ -1142,17 +1178,18 @@ class RSAPriv(PrivKey, RSAPub):
         kb = super(RSAPriv, self).decrypt_keyblob(passphrase)
         del passphrase
 
-        self.d = MPI(kb)
-        self.p = MPI(kb)
-        self.q = MPI(kb)
-        self.u = MPI(kb)
+        self.d, offset = MPI.decode(kb)
+        self.p, offset = MPI.decode(kb, offset)
+        self.q, offset = MPI.decode(kb, offset)
+        self.u, offset = MPI.decode(kb, offset)
+        del kb[:offset]
 
         if self.s2k.usage in [254, 255]:
             self.chksum = kb
             del kb
 
     def sign(self, sigdata, hash_alg):
-        signer = self.__privkey__().signer(padding.PKCS1v15(), hash_alg)
+        signer = self.privkey().signer(padding.PKCS1v15(), hash_alg)
         signer.update(sigdata)
         return signer.finalize()
 
@@ -1209,7 +1246,7 @@ class DSAPriv(PrivKey, DSAPub):
             del kb
 
     def sign(self, sigdata, hash_alg):
-        signer = self.__privkey__().signer(hash_alg)
+        signer = self.privkey().signer(hash_alg)
         signer.update(sigdata)
         return signer.finalize()
 
@@ -1292,7 +1329,7 @@ class ECDSAPriv(PrivKey, ECDSAPub):
         self.s = MPI(kb)
 
     def sign(self, sigdata, hash_alg):
-        signer = self.__privkey__().signer(ec.ECDSA(hash_alg))
+        signer = self.privkey().signer(ec.ECDSA(hash_alg))
         signer.update(sigdata)
         return signer.finalize()
 
@@ -1342,6 +1379,8 @@ class ECDHPriv(ECDSAPriv, ECDHPub):
 
 
 class CipherText(MPIs):
+    __slots__ = ()
+
     def __init__(self):
         super(CipherText, self).__init__()
         for i in self.__mpis__:
@@ -1364,6 +1403,7 @@ class CipherText(MPIs):
 
 
 class RSACipherText(CipherText):
+    __slots__ = ('me_mod_n',)
     __mpis__ = ('me_mod_n', )
 
     @classmethod
@@ -1380,6 +1420,7 @@ class RSACipherText(CipherText):
 
 
 class ElGCipherText(CipherText):
+    __slots__ = ('gk_mod_p', 'myk_mod_p')
     __mpis__ = ('gk_mod_p', 'myk_mod_p')
 
     @classmethod
@@ -1390,11 +1431,13 @@ class ElGCipherText(CipherText):
         raise NotImplementedError()
 
     def parse(self, packet):
-        self.gk_mod_p = MPI(packet)
-        self.myk_mod_p = MPI(packet)
+        self.gk_mod_p, offset = MPI.decode(packet)
+        self.myk_mod_p, offset = MPI.decode(packet, offset)
+        del packet[:offset]
 
 
 class ECDHCipherText(CipherText):
+    __slots__ = ('c', 'vX', 'vY')
     __mpis__ = ('vX', 'vY')
 
     @classmethod
@@ -1456,7 +1499,7 @@ class ECDHCipherText(CipherText):
         v = ec.EllipticCurvePublicNumbers(self.vX, self.vY, km.oid.curve()).public_key(default_backend())
 
         # compute s using the inverse of how it was derived during encryption
-        s = km.__privkey__().exchange(ec.ECDH(), v)
+        s = km.privkey().exchange(ec.ECDH(), v)
 
         # derive the wrapping key
         z = km.kdf.derive_key(s, km.oid, PubKeyAlgorithm.ECDH, pk.fingerprint)
@@ -1480,6 +1523,10 @@ class ECDHCipherText(CipherText):
 
         return _bytes
 
+    def __len__(self):
+        # MPI(0x04 || x || y), then the length-prefixed wrapped key
+        return sum(len(i) - 2 for i in self) + 4 + len(self.c)
+
     def parse(self, packet):
         # self.v = MPI(packet)
         xy = bytearray(MPI(packet).to_mpibytes()[2:])
@@ -30,6 +30,7 @@ from .types import Packet
 from .types import Primary
 from .types import Private
 from .types import Public
+from .types import SKEncrypted
 from .types import Sub
 from .types import VersionedPacket
 
@@ -45,7 +46,10 @@ from ..decorators import sdproperty
 
 from ..errors import PGPDecryptionError
 
+from ..symenc import _CFBContext
 from ..symenc import _decrypt
+from ..symenc import _decrypt_parallel
+from ..symenc import _decrypt_range
 from ..symenc import _encrypt
 
 from ..types import Fingerprint
@@ -79,6 +83,7 @@ __all__ = ['PKESessionKey',
 
 
 class PKESessionKey(VersionedPacket):
+    __slots__ = ()
     __typeid__ = 0x01
     __ver__ = 0
 
@@ -154,6 +159,7 @@ class PKESessionKeyV3(PKESessionKey):
     would try all available private keys, checking for a valid decrypted
     session key.  This format helps reduce traffic analysis of messages.
     """
+    __slots__ = ('_encrypter', '_pkalg', 'ct')
     __ver__ = 3
 
     @sdproperty
@@ -196,6 +202,10 @@ class PKESessionKeyV3(PKESessionKey):
         _bytes += self.ct.__bytearray__() if self.ct is not None else b'\x00' * (self.header.length - 10)
         return _bytes
 
+    def __bodylen__(self):
+        # version, key id, public-key algorithm, and then the encrypted session key
+        return 10 + (len(self.ct) if self.ct is not None else self.header.length - 10)
+
     def __copy__(self):
         sk = self.__class__()
         sk.header = copy.copy(self.header)
@@ -210,9 +220,9 @@ class PKESessionKeyV3(PKESessionKey):
         if self.pkalg == PubKeyAlgorithm.RSAEncryptOrSign:
             # pad up ct with null bytes if necessary
             ct = self.ct.me_mod_n.to_mpibytes()[2:]
-            ct = b'\x00' * ((pk.keymaterial.__privkey__().key_size // 8) - len(ct)) + ct
+            ct = b'\x00' * ((pk.keymaterial.privkey().key_size // 8) - len(ct)) + ct
 
-            decrypter = pk.keymaterial.__privkey__().decrypt
+            decrypter = pk.keymaterial.privkey().decrypt
             decargs = (ct, padding.PKCS1v15(),)
 
         elif self.pkalg == PubKeyAlgorithm.ECDH:
@@ -285,6 +295,7 @@ class PKESessionKeyV3(PKESessionKey):
 
 
 class Signature(VersionedPacket):
+    __slots__ = ()
     __typeid__ = 0x02
     __ver__ = 0
 
@@ -338,6 +349,7 @@ class SignatureV4(Signature):
     The algorithms for converting the hash function result to a signature
     are described in a section below.
     """
+    __slots__ = ('_halg', '_pubalg', '_signature', '_sigtype', 'hash2', 'subpackets')
     __ver__ = 4
 
     @sdproperty
@@ -402,16 +414,17 @@ class SignatureV4(Signature):
         self.signature = None
 
     def __bytearray__(self):
-        _bytes = bytearray()
-        _bytes += super(Signature, self).__bytearray__()
-        _bytes += self.int_to_bytes(self.sigtype)
-        _bytes += self.int_to_bytes(self.pubalg)
-        _bytes += self.int_to_bytes(self.halg)
-        _bytes += self.subpackets.__bytearray__()
-        _bytes += self.hash2
-        _bytes += self.signature.__bytearray__()
+        return self._serialize()
 
-        return _bytes
+    def write_into(self, buf, offset=0):
+        offset = self.header.write_into(buf, offset)
+        offset = self.bytes_into(buf, offset, bytearray([self.sigtype, self.pubalg, self.halg]))
+        offset = self.subpackets.write_into(buf, offset)
+        offset = self.bytes_into(buf, offset, self.hash2)
+        return self.signature.write_into(buf, offset)
+
+    def __bodylen__(self):
+        return 4 + len(self.subpackets) + len(self.hash2) + len(self.signature)
 
     def __copy__(self):
         spkt = SignatureV4()
@@ -450,6 +463,7 @@ class SignatureV4(Signature):
 
 
 class SKESessionKey(VersionedPacket):
+    __slots__ = ()
     __typeid__ = 0x03
     __ver__ = 0
 
@@ -513,6 +527,7 @@ class SKESessionKeyV4(SKESessionKey):
     Iterated-Salted S2K.  The salt value will ensure that the decryption
     key is not repeated even if the passphrase is reused.
     """
+    __slots__ = ('ct', 's2k')
     __ver__ = 4
 
     @property
@@ -531,6 +546,10 @@ class SKESessionKeyV4(SKESessionKey):
         _bytes += self.ct
         return _bytes
 
+    def __bodylen__(self):
+        # version, then the S2K specifier without its usage octet, then the encrypted session key
+        return 1 + (len(self.s2k) - 1) + len(self.ct)
+
     def __copy__(self):
         sk = self.__class__()
         sk.header = copy.copy(self.header)
@@ -559,7 +578,7 @@ class SKESessionKeyV4(SKESessionKey):
             return sk
 
         # otherwise, we now need to decrypt the encrypted session key
-        m = bytearray(_decrypt(bytes(self.ct), sk, self.symalg))
+        m = _decrypt(self.ct, sk, self.symalg)
         del sk
 
         symalg = SymmetricKeyAlgorithm(m[0])
@@ -580,6 +599,7 @@ class SKESessionKeyV4(SKESessionKey):
 
 
 class OnePassSignature(VersionedPacket):
+    __slots__ = ()
     __typeid__ = 0x04
     __ver__ = 0
 
@@ -621,6 +641,7 @@ class OnePassSignatureV3(OnePassSignature):
     packet and the final Signature packet corresponds to the first
     one-pass packet.
     """
+    __slots__ = ('_halg', '_pubalg', '_signer', '_sigtype', 'nested', 'signature')
     __ver__ = 3
 
     @sdproperty
@@ -690,6 +711,9 @@ class OnePassSignatureV3(OnePassSignature):
         _bytes += bytearray([int(self.nested)])
         return _bytes
 
+    def __bodylen__(self):
+        return 13
+
     def parse(self, packet):
         super(OnePassSignatureV3, self).parse(packet)
         self.sigtype = packet[0]
@@ -709,11 +733,13 @@ class OnePassSignatureV3(OnePassSignature):
 
 
 class PrivKey(VersionedPacket, Primary, Private):
+    __slots__ = ()
     __typeid__ = 0x05
     __ver__ = 0
 
 
 class PubKey(VersionedPacket, Primary, Public):
+    __slots__ = ()
     __typeid__ = 0x06
     __ver__ = 0
 
@@ -723,6 +749,7 @@ class PubKey(VersionedPacket, Primary, Public):
 
 
 class PubKeyV4(PubKey):
+    __slots__ = ('_created', '_pkalg', 'keymaterial')
     __ver__ = 4
 
     @sdproperty
@@ -808,7 +835,7 @@ class PubKeyV4(PubKey):
         fp.update(self.keymaterial.__bytearray__()[:plen])
 
         # and return the digest
-        return Fingerprint(fp.hexdigest().upper())
+        return Fingerprint(bytearray(fp.digest()))
 
     def __init__(self):
         super(PubKeyV4, self).__init__()
@@ -824,6 +851,9 @@ class PubKeyV4(PubKey):
         _bytes += self.keymaterial.__bytearray__()
         return _bytes
 
+    def __bodylen__(self):
+        return 6 + len(self.keymaterial)
+
     def __copy__(self):
         pk = self.__class__()
         pk.header = copy.copy(self.header)
@@ -852,6 +882,7 @@ class PubKeyV4(PubKey):
 
 
 class PrivKeyV4(PrivKey, PubKeyV4):
+    __slots__ = ()
     __ver__ = 4
 
     @classmethod
@@ -909,11 +940,13 @@ class PrivKeyV4(PrivKey, PubKeyV4):
 
 
 class PrivSubKey(VersionedPacket, Sub, Private):
+    __slots__ = ()
     __typeid__ = 0x07
     __ver__ = 0
 
 
 class PrivSubKeyV4(PrivSubKey, PrivKeyV4):
+    __slots__ = ()
     __ver__ = 4
 
 
@@ -947,6 +980,7 @@ class CompressedData(Packet):
     BZip2-compressed packets are compressed using the BZip2 [BZ2]
     algorithm.
     """
+    __slots__ = ('_calg', 'packets')
     __typeid__ = 0x08
 
     @sdproperty
@@ -987,7 +1021,7 @@ class CompressedData(Packet):
             self.packets.append(Packet(cdata))
 
 
-class SKEData(Packet):
+class SKEData(Packet, SKEncrypted):
     """
     5.7.  Symmetrically Encrypted Data Packet (Tag 9)
 
@@ -1031,6 +1065,7 @@ class SKEData(Packet):
     incorrect.  See the "Security Considerations" section for hints on
     the proper use of this "quick check".
     """
+    __slots__ = ('ct',)
     __typeid__ = 0x09
 
     def __init__(self):
@@ -1043,6 +1078,9 @@ class SKEData(Packet):
         _bytes += self.ct
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.ct)
+
     def __copy__(self):
         skd = self.__class__()
         skd.ct = self.ct[:]
@@ -1053,8 +1091,11 @@ class SKEData(Packet):
         self.ct = packet[:self.header.length]
         del packet[:self.header.length]
 
-    def decrypt(self, key, alg):  # pragma: no cover
-        pt = _decrypt(bytes(self.ct), bytes(key), alg)
+    def decrypt(self, key, alg, threads=None):  # pragma: no cover
+        if not self.quick_check(key, alg):
+            raise PGPDecryptionError("Decryption failed")
+
+        pt = _decrypt_parallel(self.ct, bytes(key), alg, threads)
 
         iv = bytes(pt[:alg.block_size // 8])
         del pt[:alg.block_size // 8]
@@ -1069,6 +1110,7 @@ class SKEData(Packet):
 
 
 class Marker(Packet):
+    __slots__ = ('data',)
     __typeid__ = 0x0a
 
     def __init__(self):
@@ -1081,6 +1123,9 @@ class Marker(Packet):
         _bytes += self.data
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.data)
+
     def parse(self, packet):
         super(Marker, self).parse(packet)
         self.data = packet[:self.header.length]
@@ -1133,6 +1178,7 @@ class LiteralData(Packet):
        normal line endings).  These should be converted to native line
        endings by the receiving software.
     """
+    __slots__ = ('_contents', '_mtime', 'filename', 'format')
     __typeid__ = 0x0B
 
     @sdproperty
@@ -1179,6 +1225,9 @@ class LiteralData(Packet):
         _bytes += self._contents
         return _bytes
 
+    def __bodylen__(self):
+        return 6 + len(self.filename.encode('latin-1')) + len(self._contents)
+
     def __copy__(self):
         pkt = LiteralData()
         pkt.header = copy.copy(self.header)
@@ -1222,6 +1271,7 @@ class Trust(Packet):
     transferred to other users, and they SHOULD be ignored on any input
     other than local keyring files.
     """
+    __slots__ = ('_trustflags', '_trustlevel')
     __typeid__ = 0x0C
 
     @sdproperty
@@ -1256,6 +1306,9 @@ class Trust(Packet):
         _bytes += self.int_to_bytes(self.trustlevel + sum(self.trustflags), 2)
         return _bytes
 
+    def __bodylen__(self):
+        return 2
+
     def parse(self, packet):
         super(Trust, self).parse(packet)
         # self.trustlevel = packet[0] & 0x1f
@@ -1276,6 +1329,7 @@ class UserID(Packet):
     restrictions on its content.  The packet length in the header
     specifies the length of the User ID.
     """
+    __slots__ = ('comment', 'email', 'name')
     __typeid__ = 0x0D
 
     def __init__(self):
@@ -1296,6 +1350,16 @@ class UserID(Packet):
 
         return _bytes
 
+    def __bodylen__(self):
+        l = len(self.text_to_bytes(self.name))
+        if self.comment:
+            l += len(self.text_to_bytes(self.comment)) + 3
+
+        if self.email:
+            l += len(self.text_to_bytes(self.email)) + 3
+
+        return l
+
     def __copy__(self):
         uid = UserID()
         uid.header = copy.copy(self.header)
@@ -1332,11 +1396,13 @@ class UserID(Packet):
 
 
 class PubSubKey(VersionedPacket, Sub, Public):
+    __slots__ = ()
     __typeid__ = 0x0E
     __ver__ = 0
 
 
 class PubSubKeyV4(PubSubKey, PubKeyV4):
+    __slots__ = ()
     __ver__ = 4
 
 
@@ -1373,6 +1439,7 @@ class UserAttribute(Packet):
     not recognize.  Subpacket types 100 through 110 are reserved for
     private or experimental use.
     """
+    __slots__ = ('subpackets',)
     __typeid__ = 0x11
 
     @property
@@ -1391,6 +1458,9 @@ class UserAttribute(Packet):
         _bytes += self.subpackets.__bytearray__()
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.subpackets)
+
     def parse(self, packet):
         super(UserAttribute, self).parse(packet)
 
@@ -1404,11 +1474,12 @@ class UserAttribute(Packet):
 
 
 class IntegrityProtectedSKEData(VersionedPacket):
+    __slots__ = ()
     __typeid__ = 0x12
     __ver__ = 0
 
 
-class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
+class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData, SKEncrypted):
     """
     5.13.  Sym. Encrypted Integrity Protected Data Packet (Tag 18)
 
@@ -1508,6 +1579,7 @@ class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
     rollback attacks since it will be possible for an attacker to change
     the version back to 1.
     """
+    __slots__ = ('ct',)
     __ver__ = 1
 
     def __init__(self):
@@ -1520,6 +1592,9 @@ class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
         _bytes += self.ct
         return _bytes
 
+    def __bodylen__(self):
+        return 1 + len(self.ct)
+
     def __copy__(self):
         skd = self.__class__()
         skd.ct = self.ct[:]
@@ -1532,22 +1607,32 @@ class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
 
     def encrypt(self, key, alg, data):
         iv = alg.gen_iv()
-        data = iv + iv[-2:] + data
+        prefix = iv + iv[-2:]
+
+        # the MDC covers the prefix, the data, and the first two octets of the MDC packet itself
+        mdchash = hashlib.new('SHA1', prefix)
+        mdchash.update(data)
+        mdchash.update(b'\xd3\x14')
 
         mdc = MDC()
-        mdc.mdc = binascii.hexlify(hashlib.new('SHA1', data + b'\xd3\x14').digest())
+        mdc.mdc = binascii.hexlify(mdchash.digest())
         mdc.update_hlen()
 
-        data += mdc.__bytes__()
-        self.ct = _encrypt(data, key, alg)
+        # encrypt each piece directly into the output, rather than concatenating them first
+        self.ct = _CFBContext(key, alg).crypt(prefix, data, mdc.__bytes__())
         self.update_hlen()
 
-    def decrypt(self, key, alg):
+    def decrypt(self, key, alg, threads=None):
+        if not self.quick_check(key, alg):
+            raise PGPDecryptionError("Decryption failed")
+
         # iv, ivl2, pt = super(IntegrityProtectedSKEDataV1, self).decrypt(key, alg)
-        pt = _decrypt(bytes(self.ct), bytes(key), alg)
+        # the MDC covers everything but the SHA-1 hash at the very end, and is computed as the plaintext is decrypted
+        mdchash = hashlib.new('SHA1')
+        pt = _decrypt_parallel(self.ct, bytes(key), alg, threads, digest=mdchash, digest_len=len(self.ct) - 20)
 
         # do the MDC checks
-        _expected_mdcbytes = b'\xd3\x14' + hashlib.new('SHA1', pt[:-20]).digest()
+        _expected_mdcbytes = b'\xd3\x14' + mdchash.digest()
         if not constant_time.bytes_eq(bytes(pt[-22:]), _expected_mdcbytes):
             raise PGPDecryptionError("Decryption failed")  # pragma: no cover
 
@@ -1562,6 +1647,48 @@ class IntegrityProtectedSKEDataV1(IntegrityProtectedSKEData):
 
         return pt
 
+    def decrypt_range(self, key, alg, start, end):
+        """
+        Decrypt only octets ``start`` through ``end`` of the plaintext, which begins with the random prefix and ends with
+        the MDC packet. Neither the prefix nor the MDC are checked; use :py:meth:`verify` for that.
+        """
+        return _decrypt_range(self.ct, bytes(key), alg, start, end)
+
+    def verify(self, key, alg):
+        """
+        Check the prefix and the MDC of this packet, decrypting and hashing it in fixed-size chunks without keeping
+        the plaintext.
+
+        :raises: :py:exc:`~pgpy.errors.PGPDecryptionError` if either check fails
+        """
+        bs = alg.block_size // 8
+        if len(self.ct) < bs + 2 + 22:
+            raise PGPDecryptionError("Decryption failed")
+
+        ctx = _CFBContext(bytes(key), alg, encrypt=False)
+        chunk_size = ctx.__chunk_size__
+        buf = bytearray(chunk_size + bs)
+        bufview = memoryview(buf)
+        ctview = memoryview(self.ct)
+        mdchash = hashlib.new('SHA1')
+
+        # everything up to the MDC packet, and then the MDC packet itself
+        end = len(self.ct) - 22
+        for start in range(0, end, chunk_size):
+            n = min(chunk_size, end - start)
+            ctx.update_into(ctview[start:start + n], buf)
+
+            if start == 0 and not constant_time.bytes_eq(bytes(buf[bs - 2:bs]), bytes(buf[bs:bs + 2])):
+                raise PGPDecryptionError("Decryption failed")
+
+            mdchash.update(bufview[:n])
+
+        mdcbytes = ctx.crypt(ctview[end:])
+        mdchash.update(mdcbytes[:2])
+
+        if not constant_time.bytes_eq(bytes(mdcbytes), b'\xd3\x14' + mdchash.digest()):
+            raise PGPDecryptionError("Decryption failed")
+
 
 class MDC(Packet):
     """
@@ -1590,6 +1717,7 @@ class MDC(Packet):
     in the data hash.  While this is a bit restrictive, it reduces
     complexity.
     """
+    __slots__ = ('mdc',)
     __typeid__ = 0x13
 
     def __init__(self):
@@ -1599,6 +1727,9 @@ class MDC(Packet):
     def __bytearray__(self):
         return super(MDC, self).__bytearray__() + binascii.unhexlify(self.mdc)
 
+    def __bodylen__(self):
+        return len(self.mdc) // 2
+
     def parse(self, packet):
         super(MDC, self).parse(packet)
         self.mdc = binascii.hexlify(packet[:20])
@@ -58,6 +58,8 @@ __all__ = ['URI',
 
 
 class URI(Signature):
+    __slots__ = ('_uri',)
+
     @sdproperty
     def uri(self):
         return self._uri
@@ -80,6 +82,9 @@ class URI(Signature):
         _bytes += self.uri.encode()
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.uri.encode())
+
     def parse(self, packet):
         super(URI, self).parse(packet)
         self.uri = packet[:(self.header.length - 1)]
@@ -87,6 +92,7 @@ class URI(Signature):
 
 
 class FlagList(Signature):
+    __slots__ = ('_flags',)
     __flags__ = None
 
     @sdproperty
@@ -122,6 +128,9 @@ class FlagList(Signature):
         _bytes += b''.join(self.int_to_bytes(b) for b in self.flags)
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.flags)
+
     def parse(self, packet):
         super(FlagList, self).parse(packet)
         for i in range(0, self.header.length - 1):
@@ -130,6 +139,7 @@ class FlagList(Signature):
 
 
 class ByteFlag(Signature):
+    __slots__ = ('_flags',)
     __flags__ = None
 
     @sdproperty
@@ -174,6 +184,8 @@ class ByteFlag(Signature):
 
 
 class Boolean(Signature):
+    __slots__ = ('_bool',)
+
     @sdproperty
     def bflag(self):
         return self._bool
@@ -184,7 +196,7 @@ class Boolean(Signature):
 
     @bflag.register(bytearray)
     def bflag_bytearray(self, val):
-        self.bool = bool(self.bytes_to_int(val))
+        self.bflag = bool(self.bytes_to_int(val))
 
     def __init__(self):
         super(Boolean, self).__init__()
@@ -195,6 +207,9 @@ class Boolean(Signature):
         _bytes += self.int_to_bytes(int(self.bflag))
         return _bytes
 
+    def __bodylen__(self):
+        return 1
+
     def __bool__(self):
         return self.bflag
 
@@ -217,6 +232,7 @@ class CreationTime(Signature):
 
     MUST be present in the hashed area.
    """
+    __slots__ = ('_created',)
     __typeid__ = 0x02
 
     @sdproperty
@@ -244,6 +260,9 @@ class CreationTime(Signature):
         _bytes += self.int_to_bytes(calendar.timegm(self.created.timetuple()), 4)
         return _bytes
 
+    def __bodylen__(self):
+        return 4
+
     def parse(self, packet):
         super(CreationTime, self).parse(packet)
         self.created = packet[:4]
@@ -260,6 +279,7 @@ class SignatureExpirationTime(Signature):
     after the signature creation time that the signature expires.  If
     this is not present or has a value of zero, it never expires.
     """
+    __slots__ = ('_expires',)
     __typeid__ = 0x03
 
     @sdproperty
@@ -287,6 +307,9 @@ class SignatureExpirationTime(Signature):
         _bytes += self.int_to_bytes(int(self.expires.total_seconds()), 4)
         return _bytes
 
+    def __bodylen__(self):
+        return 4
+
     def parse(self, packet):
         super(SignatureExpirationTime, self).parse(packet)
         self.expires = packet[:4]
@@ -323,6 +346,7 @@ class ExportableCertification(Boolean):
     (for example, a key server).  Such implementations always trim local
     certifications from any key they handle.
     """
+    __slots__ = ()
     __typeid__ = 0x04
 
 
@@ -345,6 +369,7 @@ class TrustSignature(Signature):
     greater indicate complete trust.  Implementations SHOULD emit values
     of 60 for partial trust and 120 for complete trust.
     """
+    __slots__ = ('_amount', '_level')
     __typeid__ = 0x05
 
     @sdproperty
@@ -383,6 +408,9 @@ class TrustSignature(Signature):
         _bytes += self.int_to_bytes(self.amount)
         return _bytes
 
+    def __bodylen__(self):
+        return 2
+
     def parse(self, packet):
         super(TrustSignature, self).parse(packet)
         self.level = packet[:1]
@@ -405,6 +433,7 @@ class RegularExpression(Signature):
     "almost public domain" regular expression [REGEX] package.  A
     description of the syntax is found in Section 8 below.
     """
+    __slots__ = ('_regex',)
     __typeid__ = 0x06
 
     @sdproperty
@@ -429,6 +458,9 @@ class RegularExpression(Signature):
         _bytes += self.regex.encode()
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.regex.encode())
+
     def parse(self, packet):
         super(RegularExpression, self).parse(packet)
         self.regex = packet[:(self.header.length - 1)]
@@ -448,6 +480,7 @@ class Revocable(Boolean):
     signature for the life of his key.  If this packet is not present,
     the signature is revocable.
     """
+    __slots__ = ()
     __typeid__ = 0x07
 
 
@@ -462,6 +495,7 @@ class KeyExpirationTime(SignatureExpirationTime):
     or has a value of zero, the key never expires.  This is found only on
     a self-signature.
     """
+    __slots__ = ()
     __typeid__ = 0x09
 
 
@@ -478,6 +512,7 @@ class PreferredSymmetricAlgorithms(FlagList):
     Algorithm numbers are in Section 9.  This is only found on a self-
     signature.
     """
+    __slots__ = ()
     __typeid__ = 0x0B
     __flags__ = SymmetricKeyAlgorithm
 
@@ -505,6 +540,7 @@ class RevocationKey(Signature):
     isolate this subpacket within a separate signature so that it is not
     combined with other subpackets that need to be exported.
     """
+    __slots__ = ('_algorithm', '_fingerprint', '_keyclass')
     __typeid__ = 0x0C
 
     @sdproperty
@@ -549,7 +585,7 @@ class RevocationKey(Signature):
 
     @fingerprint.register(bytearray)
     def fingerprint_bytearray(self, val):
-        self.fingerprint = ''.join('{:02x}'.format(c) for c in val).upper()
+        self._fingerprint = Fingerprint(val)
 
     def __init__(self):
         super(RevocationKey, self).__init__()
@@ -564,6 +600,9 @@ class RevocationKey(Signature):
         _bytes += self.fingerprint.__bytes__()
         return _bytes
 
+    def __bodylen__(self):
+        return 2 + len(self.fingerprint.__bytes__())
+
     def parse(self, packet):
         super(RevocationKey, self).parse(packet)
         self.keyclass = packet[:1]
@@ -575,6 +614,7 @@ class RevocationKey(Signature):
 
 
 class Issuer(Signature):
+    __slots__ = ('_issuer',)
     __typeid__ = 0x10
 
     @sdproperty
@@ -594,6 +634,9 @@ class Issuer(Signature):
         _bytes += binascii.unhexlify(self._issuer.encode())
         return _bytes
 
+    def __bodylen__(self):
+        return len(self._issuer) // 2
+
     def parse(self, packet):
         super(Issuer, self).parse(packet)
         self.issuer = packet[:8]
@@ -601,6 +644,7 @@ class Issuer(Signature):
 
 
 class NotationData(Signature):
+    __slots__ = ('_flags', '_name', '_value')
     __typeid__ = 0x14
 
     @sdproperty
@@ -665,6 +709,9 @@ class NotationData(Signature):
         _bytes += self.value if isinstance(self.value, bytearray) else self.value.encode()
         return bytes(_bytes)
 
+    def __bodylen__(self):
+        return 8 + len(self.name.encode()) + len(self.value if isinstance(self.value, bytearray) else self.value.encode())
+
     def parse(self, packet):
         super(NotationData, self).parse(packet)
         self.flags = packet[:1]
@@ -680,25 +727,30 @@ class NotationData(Signature):
 
 
 class PreferredHashAlgorithms(FlagList):
+    __slots__ = ()
     __typeid__ = 0x15
     __flags__ = HashAlgorithm
 
 
 class PreferredCompressionAlgorithms(FlagList):
+    __slots__ = ()
     __typeid__ = 0x16
     __flags__ = CompressionAlgorithm
 
 
 class KeyServerPreferences(FlagList):
+    __slots__ = ()
     __typeid__ = 0x17
     __flags__ = _KeyServerPreferences
 
 
 class PreferredKeyServer(URI):
+    __slots__ = ()
     __typeid__ = 0x18
 
 
 class PrimaryUserID(Signature):
+    __slots__ = ('_primary',)
     __typeid__ = 0x19
 
     @sdproperty
@@ -722,6 +774,9 @@ class PrimaryUserID(Signature):
         _bytes += self.int_to_bytes(int(self.primary))
         return _bytes
 
+    def __bodylen__(self):
+        return 1
+
     def __bool__(self):
         return self.primary
 
@@ -735,15 +790,18 @@ class PrimaryUserID(Signature):
 
 
 class Policy(URI):
+    __slots__ = ()
     __typeid__ = 0x1a
 
 
 class KeyFlags(ByteFlag):
+    __slots__ = ()
     __typeid__ = 0x1B
     __flags__ = _KeyFlags
 
 
 class SignersUserID(Signature):
+    __slots__ = ('_userid',)
     __typeid__ = 0x1C
 
     @sdproperty
@@ -768,6 +826,9 @@ class SignersUserID(Signature):
         _bytes += self.userid.encode()
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.userid.encode())
+
     def parse(self, packet):
         super(SignersUserID, self).parse(packet)
         self.userid = packet[:(self.header.length - 1)]
@@ -775,6 +836,7 @@ class SignersUserID(Signature):
 
 
 class ReasonForRevocation(Signature):
+    __slots__ = ('_code', '_string')
     __typeid__ = 0x1D
 
     @sdproperty
@@ -814,6 +876,9 @@ class ReasonForRevocation(Signature):
         _bytes += self.string.encode()
         return _bytes
 
+    def __bodylen__(self):
+        return 1 + len(self.string.encode())
+
     def parse(self, packet):
         super(ReasonForRevocation, self).parse(packet)
         self.code = packet[:1]
@@ -823,6 +888,7 @@ class ReasonForRevocation(Signature):
 
 
 class Features(ByteFlag):
+    __slots__ = ()
     __typeid__ = 0x1E
     __flags__ = _Features
 
@@ -831,6 +897,7 @@ class Features(ByteFlag):
 
 
 class EmbeddedSignature(Signature):
+    __slots__ = ('_sigpkt',)
     __typeid__ = 0x20
 
     @sdproperty
@@ -882,6 +949,10 @@ class EmbeddedSignature(Signature):
     def __bytearray__(self):
         return super(EmbeddedSignature, self).__bytearray__() + self._sigpkt.__bytearray__()
 
+    def __bodylen__(self):
+        # the embedded signature packet has no header, except for its version octet
+        return self._sigpkt.__bodylen__()
+
     def parse(self, packet):
         super(EmbeddedSignature, self).parse(packet)
         self._sig.parse(packet)
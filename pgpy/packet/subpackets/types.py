@@ -18,6 +18,8 @@ __all__ = ['Header',
 
 
 class Header(_Header):
+    __slots__ = ('_critical', '_typeid')
+
     @sdproperty
     def critical(self):
         return self._critical
@@ -38,19 +40,31 @@ class Header(_Header):
     @typeid.register(bytearray)
     def typeid_bin(self, val):
         v = self.bytes_to_int(val)
-        self.typeid = v
-        self.critical = bool(v & 0x80)
+        self._typeid = v & 0x7f
+        self._critical = bool(v & 0x80)
 
     def __init__(self):
         super(Header, self).__init__()
         self.typeid = b'\x00'
         self.critical = False
 
-    def parse(self, packet):
-        self.length = packet
+    @staticmethod
+    def decode(buf, offset=0):
+        """
+        Decode the subpacket header that starts at ``buf[offset]``, without consuming it.
 
-        self.typeid = packet[:1]
-        del packet[:1]
+        :param buf: the raw bytes to decode from
+        :param offset: the offset of the first octet of the length field
+        :returns: a tuple of ``(type octet, length format, length, header size, partial)``
+        """
+        length, size, partial = _Header.decode_length(buf, offset)
+        return buf[offset + size], 1, length, size + 1, partial
+
+    def parse(self, packet):
+        to, _, self._len, size, self._partial = self.decode(packet)
+        self._typeid = to & 0x7f
+        self._critical = bool(to & 0x80)
+        del packet[:size]
 
     def __len__(self):
         return self.llen + 1
@@ -62,6 +76,8 @@ class Header(_Header):
 
 
 class EmbeddedSignatureHeader(VersionedHeader):
+    __slots__ = ()
+
     def __bytearray__(self):
         return bytearray([self.version])
 
@@ -71,6 +87,7 @@ class EmbeddedSignatureHeader(VersionedHeader):
 
 
 class SubPacket(Dispatchable):
+    __slots__ = ('header',)
     __headercls__ = Header
 
     def __init__(self):
@@ -89,11 +106,18 @@ class SubPacket(Dispatchable):
     def __len__(self):
         return (self.header.llen + self.header.length)
 
+    def __bytelen__(self):
+        return len(self)
+
     def __repr__(self):
         return "<{} [0x{:02x}] at 0x{:x}>".format(self.__class__.__name__, self.header.typeid, id(self))
 
+    def __bodylen__(self):
+        # the number of octets that will follow the subpacket type octet when this subpacket is serialized
+        return len(self.__bytearray__()) - len(self.header)
+
     def update_hlen(self):
-        self.header.length = (len(self.__bytearray__()) - len(self.header)) + 1
+        self.header.length = self.__bodylen__() + 1
 
     @abc.abstractmethod
     def parse(self, packet):  # pragma: no cover
@@ -102,14 +126,17 @@ class SubPacket(Dispatchable):
 
 
 class Signature(SubPacket):
+    __slots__ = ()
     __typeid__ = -1
 
 
 class UserAttribute(SubPacket):
+    __slots__ = ()
     __typeid__ = -1
 
 
 class Opaque(Signature, UserAttribute):
+    __slots__ = ('_payload',)
     __typeid__ = None
 
     @sdproperty
@@ -130,6 +157,9 @@ class Opaque(Signature, UserAttribute):
         _bytes += self.payload
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.payload)
+
     def parse(self, packet):
         super(Opaque, self).parse(packet)
         self.payload = packet[:(self.header.length - 1)]
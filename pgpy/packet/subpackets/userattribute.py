@@ -48,6 +48,7 @@ class Image(UserAttribute):
     version of the image header or if a specified encoding format value
     is not recognized.
     """
+    __slots__ = ('_iencoding', '_image', '_version')
     __typeid__ = 0x01
 
     @sdproperty
@@ -97,6 +98,10 @@ class Image(UserAttribute):
         _bytes += self.image
         return _bytes
 
+    def __bodylen__(self):
+        # v1 image header length is always 16 bytes
+        return (16 if self.version == 1 else 0) + len(self.image)
+
     def parse(self, packet):
         super(Image, self).parse(packet)
 
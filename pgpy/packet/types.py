@@ -11,6 +11,8 @@ from ..constants import PacketTag
 
 from ..decorators import sdproperty
 
+from ..symenc import _decrypt_range
+
 from ..types import Dispatchable
 from ..types import Field
 from ..types import Header as _Header
@@ -25,11 +27,16 @@ __all__ = ['Header',
            'Private',
            'Primary',
            'Sub',
+           'SKEncrypted',
            'MPI',
            'MPIs', ]
 
 
 class Header(_Header):
+    # _version belongs to VersionedHeader, but is allocated here so that both classes share one layout,
+    # which lets MetaDispatchable promote an already-parsed Header to a VersionedHeader in place
+    __slots__ = ('_tag', '_version')
+
     @sdproperty
     def tag(self):
         return self._tag
@@ -54,7 +61,7 @@ class Header(_Header):
 
     def __bytearray__(self):
         tag = 0x80 | (self._lenfmt << 6)
-        tag |= (self.tag) if self._lenfmt else ((self.tag << 2) | {1: 0, 2: 1, 4: 2, 0: 3}[self.llen])
+        tag |= (self.tag) if self._lenfmt else ((self.tag << 2) | self._old_llens.index(self.llen))
 
         _bytes = bytearray(self.int_to_bytes(tag))
         _bytes += self.encode_length(self.length, self._lenfmt, self.llen)
@@ -63,6 +70,26 @@ class Header(_Header):
     def __len__(self):
         return 1 + self.llen
 
+    @staticmethod
+    def decode(buf, offset=0):
+        """
+        Decode the packet header that starts at ``buf[offset]``, without consuming it.
+
+        :param buf: the raw bytes to decode from
+        :param offset: the offset of the tag octet
+        :returns: a tuple of ``(tag octet, length format, length, header size, partial)``
+        """
+        to = buf[offset]
+        lenfmt = (to & 0x40) >> 6
+        llen = 1 if lenfmt else _Header._old_llens[to & 0x03]
+
+        if llen == 0:
+            # indeterminate packet length
+            return to, lenfmt, len(buf) - offset - 1, 1, False
+
+        length, size, partial = _Header.decode_length(buf, offset + 1, lenfmt, llen)
+        return to, lenfmt, length, 1 + size, partial
+
     def parse(self, packet):
         """
         There are two formats for headers
@@ -101,21 +128,16 @@ class Header(_Header):
 
         :param packet: raw packet bytes
         """
-        self._lenfmt = ((packet[0] & 0x40) >> 6)
-        self.tag = packet[0]
+        tag, self._lenfmt, self._len, size, self._partial = self.decode(packet)
+        self.tag = tag
         if self._lenfmt == 0:
-            self.llen = (packet[0] & 0x03)
-        del packet[0]
-
-        if (self._lenfmt == 0 and self.llen > 0) or self._lenfmt == 1:
-            self.length = packet
-
-        else:
-            # indeterminate packet length
-            self.length = len(packet)
+            self._llen = size - 1
+        del packet[:size]
 
 
 class VersionedHeader(Header):
+    __slots__ = ()
+
     @sdproperty
     def version(self):
         return self._version
@@ -143,6 +165,7 @@ class VersionedHeader(Header):
 
 
 class Packet(Dispatchable):
+    __slots__ = ('header',)
     __typeid__ = -1
     __headercls__ = Header
 
@@ -159,11 +182,19 @@ class Packet(Dispatchable):
     def __len__(self):
         return len(self.header) + self.header.length
 
+    def __bytelen__(self):
+        return len(self)
+
     def __repr__(self):
         return "<{cls:s} [tag 0x{tag:02d}] at 0x{id:x}>".format(cls=self.__class__.__name__, tag=self.header.tag, id=id(self))
 
+    def __bodylen__(self):
+        # the number of octets that will follow the header when this packet is serialized
+        # subclasses should compute this arithmetically; this fallback serializes the entire packet to measure it
+        return len(self.__bytearray__()) - len(self.header)
+
     def update_hlen(self):
-        self.header.length = len(self.__bytearray__()) - len(self.header)
+        self.header.length = self.__bodylen__()
 
     @abc.abstractmethod
     def parse(self, packet):
@@ -172,6 +203,7 @@ class Packet(Dispatchable):
 
 
 class VersionedPacket(Packet):
+    __slots__ = ()
     __headercls__ = VersionedHeader
 
     def __init__(self):
@@ -185,6 +217,7 @@ class VersionedPacket(Packet):
 
 
 class Opaque(Packet):
+    __slots__ = ('_payload',)
     __typeid__ = None
 
     @sdproperty
@@ -205,6 +238,9 @@ class Opaque(Packet):
         _bytes += self.payload
         return _bytes
 
+    def __bodylen__(self):
+        return len(self.payload) + (1 if hasattr(self.header, 'version') else 0)
+
     def parse(self, packet):  # pragma: no cover
         super(Opaque, self).parse(packet)
         pend = self.header.length
@@ -217,45 +253,83 @@ class Opaque(Packet):
 
 # key marker classes for convenience
 class Key(object):
+    __slots__ = ()
     pass
 
 
 class Public(Key):
+    __slots__ = ()
     pass
 
 
 class Private(Key):
+    __slots__ = ()
     pass
 
 
 class Primary(Key):
+    __slots__ = ()
     pass
 
 
 class Sub(Key):
+    __slots__ = ()
     pass
 
 
+class SKEncrypted(object):
+    """
+    Mixin for packets whose contents are encrypted with a session key, and held in ``self.ct``.
+    """
+    __slots__ = ()
+
+    def quick_check(self, key, alg):
+        """
+        Decrypt only the random prefix, and check that its last two octets are repeated, as described in RFC 4880
+        section 5.7. This rejects almost every incorrect session key without decrypting the rest of the packet.
+
+        :returns: ``False`` if ``key`` is definitely incorrect, otherwise ``True``
+        """
+        bs = alg.block_size // 8
+        prefix = _decrypt_range(self.ct, bytes(key), alg, 0, bs + 2)
+        return len(prefix) == bs + 2 and prefix[bs - 2:bs] == prefix[bs:bs + 2]
+
+
 # This is required for class MPI to work in both Python 2 and 3
 if not six.PY2:
     long = int
 
 
 class MPI(long):
-    def __new__(cls, num):
-        mpi = num
+    __slots__ = ()
 
+    def __new__(cls, num):
         if isinstance(num, (bytes, bytearray)):
             if isinstance(num, bytes):  # pragma: no cover
                 num = bytearray(num)
 
-            fl = ((MPIs.bytes_to_int(num[:2]) + 7) // 8)
-            del num[:2]
+            mpi, end = cls.decode(num)
+            del num[:end]
+            return mpi
+
+        return super(MPI, cls).__new__(cls, num)
+
+    @classmethod
+    def decode(cls, buf, offset=0):
+        """
+        Decode the MPI that starts at ``buf[offset]``, without consuming it or copying its value out of ``buf``.
+
+        :param buf: the raw bytes to decode from
+        :param offset: the offset of the first octet of the MPI's bit count
+        :returns: a tuple of ``(MPI, offset of the first octet after the MPI)``
+        """
+        end = offset + 2 + ((((buf[offset] << 8) | buf[offset + 1]) + 7) // 8)
 
-            mpi = MPIs.bytes_to_int(num[:fl])
-            del num[:fl]
+        if six.PY2:  # pragma: no cover
+            return cls(MPIs.bytes_to_int(buf[offset + 2:end])), end
 
-        return super(MPI, cls).__new__(cls, mpi)
+        with memoryview(buf)[offset + 2:end] as mv:
+            return cls(int.from_bytes(mv, 'big')), end
 
     def byte_length(self):
         return ((self.bit_length() + 7) // 8)
@@ -270,6 +344,7 @@ class MPI(long):
 class MPIs(Field):
     # this differs from MPI in that it's subclasses hold/parse several MPI fields
     # and, in the case of v4 private keys, also a String2Key specifier/information.
+    __slots__ = ()
     __mpis__ = ()
 
     def __len__(self):
@@ -7,10 +7,13 @@ import collections
 import contextlib
 import copy
 import functools
+import io
 import itertools
 import operator
 import os
 import re
+import threading
+import time
 import warnings
 import weakref
 
@@ -20,6 +23,8 @@ from datetime import datetime
 
 from cryptography.hazmat.primitives import hashes
 
+from .cache import PacketCache
+
 from .constants import CompressionAlgorithm
 from .constants import Features
 from .constants import HashAlgorithm
@@ -34,8 +39,10 @@ from .constants import SignatureType
 from .constants import SymmetricKeyAlgorithm
 
 from .decorators import KeyAction
+from .decorators import cachedproperty
 
 from .errors import PGPDecryptionError
+from .errors import PGPEncryptionError
 from .errors import PGPError
 
 from .packet import Key
@@ -67,6 +74,7 @@ from .packet.packets import Marker
 from .packet.packets import SKESessionKey
 from .packet.packets import SKESessionKeyV4
 
+from .packet.types import Header
 from .packet.types import Opaque
 
 from .types import Armorable
@@ -74,21 +82,33 @@ from .types import Fingerprint
 from .types import ParentRef
 from .types import PGPObject
 from .types import SignatureVerification
-from .types import SorteDeque
+from .types import SortedList
+
+from ._threads import WorkQueue
+from ._threads import thread_count
 
 __all__ = ['PGPSignature',
            'PGPUID',
            'PGPMessage',
+           'PGPMessageReader',
            'PGPKey',
+           'PGPKeySession',
            'PGPKeyring']
 
 
 class PGPSignature(Armorable, ParentRef, PGPObject):
+    __slots__ = ('_cache', '_signature', 'ascii_headers')
+
+    @property
+    def __cachekey__(self):
+        # values decoded from subpackets are kept until the signature packet is replaced, or a subpacket is added to it
+        return (self._signature, self._signature.subpackets, self._signature.subpackets.revision)
+
     @property
     def __sig__(self):
         return self._signature.signature.__sig__()
 
-    @property
+    @cachedproperty
     def cipherprefs(self):
         """
         A ``list`` of preferred symmetric algorithms specified in this signature, if any. Otherwise, an empty ``list``.
@@ -97,7 +117,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
             return next(iter(self._signature.subpackets['h_PreferredSymmetricAlgorithms'])).flags
         return []
 
-    @property
+    @cachedproperty
     def compprefs(self):
         """
         A ``list`` of preferred compression algorithms specified in this signature, if any. Otherwise, an empty ``list``.
@@ -106,7 +126,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
             return next(iter(self._signature.subpackets['h_PreferredCompressionAlgorithms'])).flags
         return []
 
-    @property
+    @cachedproperty
     def created(self):
         """
         A :py:obj:`~datetime.datetime` of when this signature was created.
@@ -117,7 +137,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
     def embedded(self):
         return self.parent is not None
 
-    @property
+    @cachedproperty
     def expires_at(self):
         """
         A :py:obj:`~datetime.datetime` of when this signature expires, if a signature expiration date is specified.
@@ -128,7 +148,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
             return self.created + expd
         return None
 
-    @property
+    @cachedproperty
     def exportable(self):
         """
         ``False`` if this signature is marked as being not exportable. Otherwise, ``True``.
@@ -138,7 +158,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
 
         return True
 
-    @property
+    @cachedproperty
     def features(self):
         """
         A ``set`` of implementation features specified in this signature, if any. Otherwise, an empty ``set``.
@@ -151,7 +171,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
     def hash2(self):
         return self._signature.hash2
 
-    @property
+    @cachedproperty
     def hashprefs(self):
         """
         A ``list`` of preferred hash algorithms specified in this signature, if any. Otherwise, an empty ``list``.
@@ -185,13 +205,13 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
         """
         return self._signature.pubalg
 
-    @property
+    @cachedproperty
     def key_expiration(self):
         if 'KeyExpirationTime' in self._signature.subpackets:
             return next(iter(self._signature.subpackets['KeyExpirationTime'])).expires
         return None
 
-    @property
+    @cachedproperty
     def key_flags(self):
         """
         A ``set`` of :py:obj:`~constants.KeyFlags` specified in this signature, if any. Otherwise, an empty ``set``.
@@ -238,7 +258,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
             return next(iter(self._signature.subpackets['Policy'])).uri
         return ''
 
-    @property
+    @cachedproperty
     def revocable(self):
         """
         ``False`` if this signature is marked as being not revocable. Otherwise, ``True``.
@@ -253,7 +273,7 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
             raise NotImplementedError()
         return None
 
-    @property
+    @cachedproperty
     def signer(self):
         """
         The 16-character Key ID of the key that generated this signature.
@@ -301,11 +321,18 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
         OpenPGP-compliant binary format.
         """
         super(PGPSignature, self).__init__()
+        self._cache = None
         self._signature = None
 
     def __bytearray__(self):
         return self._signature.__bytearray__()
 
+    def __bytelen__(self):
+        return self._signature.__bytelen__()
+
+    def write_into(self, buf, offset=0):
+        return self._signature.write_into(buf, offset)
+
     def __repr__(self):
         return "<PGPSignature [{:s}] object at 0x{:02x}>".format(self.type.name, id(self))
 
@@ -487,6 +514,8 @@ class PGPSignature(Armorable, ParentRef, PGPObject):
 
 
 class PGPUID(ParentRef):
+    __slots__ = ('_signatures', '_uid')
+
     @property
     def __sig__(self):
         return list(self._signatures)
@@ -547,7 +576,8 @@ class PGPUID(ParentRef):
         This will be the most recent, self-signature of this User ID or Attribute. If there isn't one, this will be ``None``.
         """
         if self.parent is not None:
-            return next((sig for sig in reversed(self._signatures) if sig.signer == self.parent.fingerprint.keyid), None)
+            keyid = self.parent.fingerprint.keyid
+            return next((sig for sig in reversed(self._signatures) if sig.signer == keyid), None)
 
     @property
     def signers(self):
@@ -603,7 +633,7 @@ class PGPUID(ParentRef):
         """
         super(PGPUID, self).__init__()
         self._uid = None
-        self._signatures = SorteDeque()
+        self._signatures = SortedList()
 
     def __repr__(self):
         if self.selfsig is not None:
@@ -664,6 +694,8 @@ class PGPUID(ParentRef):
 
 
 class PGPMessage(Armorable, PGPObject):
+    __slots__ = ('_compression', '_mdc', '_message', '_sessionkeys', '_signatures', 'ascii_headers', '__weakref__')
+
     @staticmethod
     def dash_unescape(text):
         return re.subn(r'^- -', '-', text, flags=re.MULTILINE)[0]
@@ -771,21 +803,41 @@ class PGPMessage(Armorable, PGPObject):
         self._compression = CompressionAlgorithm.Uncompressed
         self._message = None
         self._mdc = None
-        self._signatures = SorteDeque()
+        self._signatures = SortedList()
         self._sessionkeys = []
 
     def __bytearray__(self):
         if self.is_compressed:
-            comp = CompressedData()
-            comp.calg = self._compression
-            comp.packets = [pkt for pkt in self]
-            comp.update_hlen()
-            return comp.__bytearray__()
+            return self._compressed().__bytearray__()
+
+        return self._serialize()
+
+    def __bytelen__(self):
+        if self.is_compressed:
+            return super(PGPMessage, self).__bytelen__()
+
+        return sum(pkt.__bytelen__() for pkt in self)
+
+    def write_into(self, buf, offset=0):
+        if self.is_compressed:
+            return self._compressed().write_into(buf, offset)
 
-        _bytes = bytearray()
         for pkt in self:
-            _bytes += pkt.__bytearray__()
-        return _bytes
+            offset = pkt.write_into(buf, offset)
+        return offset
+
+    def serialize_to(self, fileobj):
+        if self.is_compressed:
+            return self._compressed().serialize_to(fileobj)
+
+        return sum(pkt.serialize_to(fileobj) for pkt in self)
+
+    def _compressed(self):
+        comp = CompressedData()
+        comp.calg = self._compression
+        comp.packets = [pkt for pkt in self]
+        comp.update_hlen()
+        return comp
 
     def __str__(self):
         if self.type == 'cleartext':
@@ -1027,14 +1079,126 @@ class PGPMessage(Armorable, PGPObject):
 
         return msg
 
-    def decrypt(self, passphrase):
+    def encrypt_to(self, recipients, sessionkey=None, threads=None, **prefs):
+        """
+        Encrypt the contents of this message once, to any number of public keys and passphrases.
+
+        Example::
+
+            emsg = msg.encrypt_to([alice_pub, bob_pub, "a shared passphrase"], threads=0)
+
+        :param recipients: The public keys and passphrases to encrypt this message to.
+        :type recipients: ``list`` of :py:obj:`PGPKey`, ``str``, ``unicode``, ``bytes``
+        :optional param sessionkey: Provide a session key to use when encrypting something. Default is ``None``.
+                                    If ``None``, a session key of the appropriate length will be generated randomly.
+
+                                    .. warning::
+
+                                        Care should be taken when making use of this option! Session keys *absolutely need*
+                                        to be unpredictable! Use the ``gen_key()`` method on the desired
+                                        :py:obj:`~constants.SymmetricKeyAlgorithm` to generate the session key!
+
+        :type sessionkey: ``bytes``, ``str``
+        :optional param threads: Encrypt the session key to this many recipients at a time, or to one per CPU if ``0``.
+                                 Default is ``None``, which encrypts it to each recipient in turn.
+        :type threads: ``int``
+        :raises: :py:exc:`~errors.PGPEncryptionError` if encryption failed for any reason.
+        :raises: :py:exc:`~errors.PGPError` if this message is already encrypted.
+        :raises: :py:exc:`ValueError` if ``recipients`` is empty.
+        :raises: :py:exc:`TypeError` if any of ``recipients`` is neither a :py:obj:`PGPKey` nor a passphrase.
+        :returns: A new :py:obj:`PGPMessage` containing the encrypted contents of this message, with a session key
+                  packet for each of ``recipients``, in order.
+
+        The following optional keyword arguments can be used with :py:meth:`PGPMessage.encrypt_to`:
+
+        :keyword cipher: Specifies the symmetric block cipher to use when encrypting the message. By default, this is
+                         the first cipher in the first key's preferences that every key in ``recipients`` supports, or
+                         AES256 if ``recipients`` are all passphrases.
+        :type cipher: :py:obj:`~constants.SymmetricKeyAlgorithm`
+        :keyword hash: Specifies the hash algorithm used to derive keys from passphrases.
+        :type hash: :py:obj:`~constants.HashAlgorithm`
+        """
+        if self.is_encrypted:
+            raise PGPError("This message is already encrypted! Use add_recipients to add more recipients to it")
+
+        recipients = list(recipients)
+        if not recipients:
+            raise ValueError("At least one recipient is required")
+
+        for recipient in recipients:
+            if not isinstance(recipient, (PGPKey, six.text_type, six.binary_type, bytearray)):
+                raise TypeError("Unexpected recipient value: {:s}".format(str(type(recipient))))
+
+        cipher_algo = prefs.pop('cipher', None)
+        hash_algo = prefs.pop('hash', HashAlgorithm.SHA256)
+
+        # every key's preferences are needed to encrypt to it, even if the cipher is not chosen from them
+        keyuids = [ r._preferences_uid() for r in recipients if isinstance(r, PGPKey) ]
+        if any(uid is None or uid.selfsig is None for uid in keyuids):
+            raise PGPEncryptionError("Every recipient key must have a self-signed user ID to take preferences from")
+
+        def usable(c):
+            try:
+                return not c.is_insecure and callable(c.cipher)
+
+            except NotImplementedError:
+                return False
+
+        if cipher_algo is None:
+            cipher_algo = SymmetricKeyAlgorithm.AES256
+
+            if keyuids:
+                # TripleDES is implicitly at the end of every key's preferences (RFC 4880 section 13.2)
+                keyprefs = [ [ c for c in uid.selfsig.cipherprefs if usable(c) ] + [SymmetricKeyAlgorithm.TripleDES]
+                             for uid in keyuids ]
+                cipher_algo = next(c for c in keyprefs[0] if all(c in kp for kp in keyprefs[1:]))
+
+        if sessionkey is None:
+            sessionkey = cipher_algo.gen_key()
+
+        # encrypt the message itself exactly once
+        skedata = IntegrityProtectedSKEDataV1()
+        skedata.encrypt(sessionkey, cipher_algo, self.__bytes__())
+
+        def wrap(recipient):
+            # encrypting an already encrypted message only adds a session key packet to it
+            stub = PGPMessage() | skedata
+            if isinstance(recipient, PGPKey):
+                return recipient.encrypt(stub, sessionkey=sessionkey, cipher=cipher_algo)._sessionkeys[-1]
+            return stub.encrypt(recipient, sessionkey=sessionkey, cipher=cipher_algo, hash=hash_algo)._sessionkeys[0]
+
+        # the public key and S2K operations release the GIL, so they can be run concurrently
+        wrapped = [None] * len(recipients)
+
+        def work(i):
+            wrapped[i] = wrap(recipients[i])
+
+        # this thread does its share of the work in join, so start one fewer background thread than requested
+        WorkQueue(work, len(recipients), (thread_count(threads) or 1) - 1).join()
+
+        msg = PGPMessage()
+        for sk in wrapped:
+            msg |= sk
+        msg |= skedata
+
+        return msg
+
+    def decrypt(self, passphrase, threads=None, return_session_key=False):
         """
         Attempt to decrypt this message using a passphrase.
 
         :param passphrase: The passphrase to use to attempt to decrypt this message.
         :type passphrase: ``str``, ``unicode``, ``bytes``
+        :optional param threads: Decrypt large messages using this many threads, or one per CPU if ``0``.
+                                 Default is ``None``, which decrypts serially.
+        :type threads: ``int``
+        :optional param return_session_key: If ``True``, also return the symmetric algorithm and session key that were
+                                            recovered, so that they can be used with
+                                            :py:meth:`PGPMessage.decrypt_with_session_key` later. Default is ``False``.
+        :type return_session_key: ``bool``
         :raises: :py:exc:`~errors.PGPDecryptionError` if decryption failed for any reason.
-        :returns: A new :py:obj:`PGPMessage` containing the decrypted contents of this message
+        :returns: A new :py:obj:`PGPMessage` containing the decrypted contents of this message. If
+                  ``return_session_key`` is ``True``, this is instead a tuple of ``(message, (symalg, sessionkey))``.
         """
         if not self.is_encrypted:
             raise PGPError("This message is not encrypted!")
@@ -1042,8 +1206,7 @@ class PGPMessage(Armorable, PGPObject):
         for skesk in iter(sk for sk in self._sessionkeys if isinstance(sk, SKESessionKey)):
             try:
                 symalg, key = skesk.decrypt_sk(passphrase)
-                decmsg = PGPMessage()
-                decmsg.parse(self.message.decrypt(key, symalg))
+                decmsg = self.decrypt_with_session_key(symalg, key, threads)
 
             except (TypeError, ValueError, NotImplementedError, PGPDecryptionError):
                 continue
@@ -1055,8 +1218,121 @@ class PGPMessage(Armorable, PGPObject):
         else:
             raise PGPDecryptionError("Decryption failed")
 
+        if return_session_key:
+            return decmsg, (symalg, bytes(key))
+
         return decmsg
 
+    def decrypt_with_session_key(self, symalg, sessionkey, threads=None):
+        """
+        Decrypt this message using a session key that is already known, such as one returned by
+        ``decrypt(..., return_session_key=True)``. This skips the passphrase or public key step entirely.
+
+        .. warning::
+
+            Anyone who has a message's session key can read that message. Store session keys at least as carefully
+            as the messages themselves!
+
+        :param symalg: The symmetric algorithm that this message was encrypted with.
+        :type symalg: :py:obj:`~constants.SymmetricKeyAlgorithm`
+        :param sessionkey: The session key that this message was encrypted with.
+        :type sessionkey: ``bytes``
+        :optional param threads: Decrypt large messages using this many threads, or one per CPU if ``0``.
+                                 Default is ``None``, which decrypts serially.
+        :type threads: ``int``
+        :raises: :py:exc:`~errors.PGPDecryptionError` if decryption failed for any reason.
+        :returns: A new :py:obj:`PGPMessage` containing the decrypted contents of this message
+        """
+        if not self.is_encrypted:
+            raise PGPError("This message is not encrypted!")
+
+        symalg = SymmetricKeyAlgorithm(symalg)
+
+        # the encrypted data packet rejects the wrong session key with the quick check before decrypting the payload
+        decmsg = PGPMessage()
+        decmsg.parse(self.message.decrypt(sessionkey, symalg, threads))
+
+        return decmsg
+
+    def add_recipients(self, recipients, sessionkey=None, key=None):
+        """
+        Encrypt this message's session key to additional recipients, without decrypting or re-encrypting the
+        message itself.
+
+        Example::
+
+            # recover the session key with a key the message is already encrypted to
+            emsg = emsg.add_recipients([alice_pub, bob_pub], key=privkey)
+
+            # or, with a session key that is already known
+            emsg = emsg.add_recipients([alice_pub, bob_pub], sessionkey=(symalg, sessionkey))
+
+        :param recipients: The public keys to add as recipients.
+        :type recipients: ``list`` of :py:obj:`PGPKey`
+        :optional param sessionkey: The symmetric algorithm and session key this message was encrypted with, as returned
+                                    by ``decrypt(..., return_session_key=True)``.
+        :type sessionkey: ``tuple``
+        :optional param key: If ``sessionkey`` is not given, a private key that this message is already encrypted to,
+                             which is used to recover the session key.
+        :type key: :py:obj:`PGPKey`, :py:obj:`PGPKeySession`
+        :raises: :py:exc:`~errors.PGPDecryptionError` if the session key is incorrect or could not be recovered.
+        :raises: :py:exc:`~errors.PGPError` if this message is not encrypted, or neither ``sessionkey`` nor ``key``
+                 was given.
+        :returns: A new :py:obj:`PGPMessage` with the session keys of this message, followed by one for each of
+                  ``recipients``. Its encrypted data packet is this message's, and is not copied.
+        """
+        if not self.is_encrypted:
+            raise PGPError("This message is not encrypted!")
+
+        if sessionkey is None:
+            if key is None:
+                raise PGPError("Either sessionkey or key must be specified")
+
+            sessionkey = key.decrypt_session_key(self)
+
+        symalg, sk = sessionkey
+        symalg = SymmetricKeyAlgorithm(symalg)
+
+        # make sure this is actually the right session key before encrypting it to anyone else
+        if not self.message.quick_check(sk, symalg):
+            raise PGPDecryptionError("Decryption failed")
+
+        msg = PGPMessage() | self
+        for recipient in recipients:
+            msg = recipient.encrypt(msg, sessionkey=sk, cipher=symalg)
+
+        return msg
+
+    def reader(self, passphrase, verify=True):
+        """
+        Open the literal data in this message for random access, using a passphrase.
+        See :py:obj:`PGPMessageReader` for details.
+
+        :param passphrase: The passphrase to use to attempt to decrypt this message.
+        :type passphrase: ``str``, ``unicode``, ``bytes``
+        :param bool verify: If ``False``, the integrity of the message is not checked until
+                            :py:meth:`PGPMessageReader.verify` is called.
+        :raises: :py:exc:`~errors.PGPDecryptionError` if decryption failed for any reason.
+        :raises: :py:exc:`~errors.PGPError` if the contents of this message cannot be read at random.
+        :returns: :py:obj:`PGPMessageReader`
+        """
+        if not self.is_encrypted:
+            raise PGPError("This message is not encrypted!")
+
+        for skesk in iter(sk for sk in self._sessionkeys if isinstance(sk, SKESessionKey)):
+            try:
+                symalg, key = skesk.decrypt_sk(passphrase)
+                reader = PGPMessageReader(self, symalg, key, verify)
+
+            except (TypeError, ValueError, NotImplementedError, PGPDecryptionError):
+                continue
+
+            else:
+                del passphrase
+                return reader
+
+        raise PGPDecryptionError("Decryption failed")
+
     def parse(self, packet):
         unarmored = self.ascii_unarmor(packet)
         data = unarmored['body']
@@ -1084,6 +1360,172 @@ class PGPMessage(Armorable, PGPObject):
                 self |= Packet(data)
 
 
+class PGPMessageReader(io.RawIOBase):
+    def __init__(self, message, symalg, sessionkey, verify=True):
+        """
+        PGPMessageReader objects are seekable, read-only binary file objects over the literal data of an encrypted
+        :py:obj:`PGPMessage`. Because each CFB block can be decrypted using only the ciphertext block before it, reading
+        a range of the literal data only decrypts that range, no matter where in the message it is.
+
+        Usually, these are obtained from :py:meth:`PGPMessage.reader` or :py:meth:`PGPKey.reader`.
+
+        Only messages whose encrypted contents are an uncompressed literal data packet (optionally preceded by
+        one-pass signatures) can be read this way. Text data is returned as-is, without decoding it.
+
+        .. warning::
+
+            If ``verify`` is ``False``, the integrity of the message has **not** been checked, and the data that
+            is read may have been tampered with. Call :py:meth:`verify` before trusting it.
+
+        :param message: The encrypted message to read.
+        :type message: :py:obj:`PGPMessage`
+        :param symalg: The symmetric algorithm used to encrypt ``message``.
+        :type symalg: :py:obj:`~constants.SymmetricKeyAlgorithm`
+        :param sessionkey: The session key used to encrypt ``message``.
+        :type sessionkey: ``bytes``
+        :param bool verify: If ``True``, the whole message is decrypted once and its MDC is checked before this returns.
+        :raises: :py:exc:`~pgpy.errors.PGPDecryptionError` if ``sessionkey`` is incorrect, or verification failed
+        :raises: :py:exc:`~pgpy.errors.PGPError` if the contents of ``message`` cannot be read at random
+        """
+        super(PGPMessageReader, self).__init__()
+
+        if not isinstance(message.message, IntegrityProtectedSKEDataV1):
+            raise PGPError("Only integrity protected messages can be read at random")
+
+        self._seipd = message.message
+        self._symalg = symalg
+        self._sessionkey = bytes(sessionkey)
+        self._verified = False
+        self._pos = 0
+
+        if not self._seipd.quick_check(self._sessionkey, symalg):
+            raise PGPDecryptionError("Decryption failed")
+
+        if verify:
+            self.verify()
+
+        self._locate()
+
+    def __repr__(self):
+        return "<PGPMessageReader [{:s}] {:d} octets at 0x{:02X}>" \
+               "".format('verified' if self.verified else 'unverified', self._size, id(self))
+
+    @property
+    def size(self):
+        """The length of the literal data, in octets"""
+        return self._size
+
+    @property
+    def verified(self):
+        """``True`` if the integrity of the message has been checked, otherwise ``False``"""
+        return self._verified
+
+    def _decrypt_range(self, start, end):
+        return self._seipd.decrypt_range(self._sessionkey, self._symalg, start, end)
+
+    def _locate(self):
+        # find the literal data packet, decrypting only the packet headers and the literal data's metadata
+        bs = self._symalg.block_size // 8
+
+        # the plaintext starts after the random prefix, and ends with the 22-octet MDC packet
+        end = len(self._seipd.ct) - 22
+        offset = bs + 2
+        while True:
+            hdr = self._decrypt_range(offset, min(offset + 6, end))
+            if len(hdr) < 2 or not hdr[0] & 0x80:
+                raise PGPDecryptionError("Decryption failed")
+
+            to, lenfmt, length, hsize, partial = Header.decode(hdr)
+            tag = to & 0x3F if lenfmt else (to & 0x3C) >> 2
+
+            if hsize == 1:
+                # old format packet with an indeterminate length, which extends to the MDC
+                length = end - offset - 1
+
+            if partial:
+                raise PGPError("Messages with partial body lengths cannot be read at random")
+
+            if offset + hsize + length > end:
+                raise PGPDecryptionError("Decryption failed")
+
+            if tag == PacketTag.LiteralData:
+                break
+
+            if tag not in (PacketTag.OnePassSignature, PacketTag.Marker):
+                # most often, this is a compressed data packet
+                raise PGPError("Messages containing packet tag {:d} cannot be read at random".format(tag))
+
+            offset += hsize + length
+
+        # format, file name, and date
+        body = offset + hsize
+        meta = self._decrypt_range(body, body + min(length, 2 + 255 + 4))
+        fnlen = meta[1]
+        self.format = chr(meta[0])
+        self.filename = meta[2:2 + fnlen].decode('latin-1')
+        self.mtime = datetime.utcfromtimestamp(PGPObject.bytes_to_int(meta[2 + fnlen:6 + fnlen]))
+
+        self._start = body + 6 + fnlen
+        self._size = length - 6 - fnlen
+
+    def verify(self):
+        """
+        Check the integrity of the message by decrypting all of it once, in fixed-size chunks.
+
+        :raises: :py:exc:`~pgpy.errors.PGPDecryptionError` if the message has been modified
+        """
+        self._seipd.verify(self._sessionkey, self._symalg)
+        self._verified = True
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+
+        elif whence == io.SEEK_END:
+            offset += self._size
+
+        elif whence != io.SEEK_SET:
+            raise ValueError("invalid whence ({!r})".format(whence))
+
+        if offset < 0:
+            raise ValueError("negative seek position {:d}".format(offset))
+
+        self._pos = offset
+        return self._pos
+
+    def read(self, size=-1):
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+
+        if size is None or size < 0:
+            size = self._size - self._pos
+
+        data = self._decrypt_range(self._start + self._pos, self._start + min(self._pos + size, self._size))
+        self._pos += len(data)
+        return bytes(data)
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._sessionkey = None
+        super(PGPMessageReader, self).close()
+
+
 class PGPKey(Armorable, ParentRef, PGPObject):
     """
     11.1.  Transferable Public Keys
@@ -1168,6 +1610,11 @@ class PGPKey(Armorable, ParentRef, PGPObject):
     especially if a transferable public key accompanies the transferable
     secret key.
     """
+    __slots__ = ('_children', '_key', '_sibling', '_signatures', '_uids', '_unlocks', 'ascii_headers')
+
+    # guards the unlock reference counts of all keys
+    _unlock_lock = threading.Lock()
+
     @property
     def __key__(self):
         return self._key.keymaterial
@@ -1316,7 +1763,7 @@ class PGPKey(Armorable, ParentRef, PGPObject):
 
         ##TODO: filter out revoked signatures as well
         for sig in iter(sig for sig in self._signatures
-                        if all([sig.type == keytype, sig.signer == keyid, not sig.is_expired])):
+                        if sig.type == keytype and sig.signer == keyid and not sig.is_expired):
             yield sig
 
     @property
@@ -1364,6 +1811,58 @@ class PGPKey(Armorable, ParentRef, PGPObject):
 
         return key
 
+    @classmethod
+    def dump_cache(cls, blob):
+        """
+        Parse a key and serialize the resulting packets into a cache that can later be loaded with
+        :py:meth:`PGPKey.from_cache`, skipping de-armoring and packet parsing entirely.
+
+        :param blob: The key data, in any of the formats supported by :py:meth:`PGPKey.from_blob`.
+        :type blob: ``str``, ``unicode``, ``bytes``, ``bytearray``
+        :returns: ``bytes``
+        """
+        source, headers, packets = cls._parse_cacheable(blob)
+        return PacketCache.dumps(packets, source, headers)
+
+    @classmethod
+    def from_cache(cls, cache, blob):
+        """
+        Load a key from a cache generated by :py:meth:`PGPKey.dump_cache`.
+
+        If ``cache`` was not generated from ``blob``, was generated by a different version of PGPy, or is corrupt,
+        ``blob`` is parsed normally instead.
+
+        :param cache: The cache generated from ``blob``.
+        :type cache: ``bytes``, ``bytearray``
+        :param blob: The key data the cache was generated from.
+        :type blob: ``str``, ``unicode``, ``bytes``, ``bytearray``
+        :returns: A ``tuple`` of ``(PGPKey, OrderedDict)``, the same as :py:meth:`PGPKey.from_blob`
+        """
+        cached = PacketCache.loads(cache, blob)
+        if cached is None:
+            return cls.from_blob(blob)
+
+        return cls._from_packets(*cached)
+
+    @classmethod
+    def _parse_cacheable(cls, blob):
+        # de-armor and parse blob, returning everything dump_cache stores: (normalized source, armor headers, packets)
+        source = PacketCache.normalize(blob)
+        unarmored = cls.ascii_unarmor(bytearray(source))
+
+        if unarmored['magic'] is not None and 'KEY' not in unarmored['magic']:
+            raise ValueError('Expected: KEY. Got: {}'.format(str(unarmored['magic'])))
+
+        return source, unarmored['headers'], list(cls._packets(unarmored['body']))
+
+    @classmethod
+    def _from_packets(cls, headers, packets):
+        key = cls()
+        if headers is not None:
+            key.ascii_headers = headers
+
+        return (key, key._compose(iter(packets)))
+
     def __init__(self):
         """
         PGPKey objects represent OpenPGP compliant keys along with all of their associated data.
@@ -1380,27 +1879,39 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         super(PGPKey, self).__init__()
         self._key = None
         self._children = collections.OrderedDict()
-        self._signatures = SorteDeque()
-        self._uids = SorteDeque()
+        self._signatures = SortedList()
+        self._uids = SortedList()
         self._sibling = None
+        self._unlocks = 0
 
     def __bytearray__(self):
-        _bytes = bytearray()
+        return self._serialize()
+
+    def __bytelen__(self):
+        return sum(obj.__bytelen__() for obj in self._export_objects())
+
+    def write_into(self, buf, offset=0):
+        for obj in self._export_objects():
+            offset = obj.write_into(buf, offset)
+        return offset
+
+    def serialize_to(self, fileobj):
+        return sum(obj.serialize_to(fileobj) for obj in self._export_objects())
+
+    def _export_objects(self):
         # us
-        _bytes += self._key.__bytearray__()
+        yield self._key
         # our signatures; ignore embedded signatures
         for sig in iter(s for s in self._signatures if not s.embedded and s.exportable):
-            _bytes += sig.__bytearray__()
+            yield sig
         # one or more User IDs, followed by their signatures
         for uid in self._uids:
-            _bytes += uid._uid.__bytearray__()
+            yield uid._uid
             for s in [s for s in uid._signatures if s.exportable]:
-                _bytes += s.__bytearray__()
+                yield s
         # subkeys
         for sk in self._children.values():
-            _bytes += sk.__bytearray__()
-
-        return _bytes
+            yield sk
 
     def __repr__(self):
         if self._key is not None:
@@ -1546,16 +2057,63 @@ class PGPKey(Armorable, ParentRef, PGPObject):
             yield self
             return
 
+        self._acquire_unlock(passphrase)
+        del passphrase
         try:
-            for sk in itertools.chain([self], self.subkeys.values()):
-                sk._key.unprotect(passphrase)
-            del passphrase
             yield self
 
         finally:
-            # clean up here by deleting the previously decrypted secret key material
+            self._release_unlock()
+
+    def _acquire_unlock(self, passphrase):
+        # unlocks are reference counted, so that overlapping unlock() blocks and sessions don't remove
+        # decrypted key material out from under each other
+        with PGPKey._unlock_lock:
+            self._unlocks += 1
+
+        unlocked = False
+        try:
+            if self.is_protected:
+                for sk in itertools.chain([self], self.subkeys.values()):
+                    sk._key.unprotect(passphrase)
+            unlocked = True
+
+        finally:
+            if not unlocked:
+                self._release_unlock()
+
+    def _release_unlock(self):
+        with PGPKey._unlock_lock:
+            self._unlocks -= 1
+            if self._unlocks > 0:
+                return
+
             for sk in itertools.chain([self], self.subkeys.values()):
-                sk._key.keymaterial.clear()
+                if self.is_protected:
+                    # clean up here by deleting the previously decrypted secret key material
+                    sk._key.keymaterial.clear()
+
+                else:
+                    sk._key.keymaterial.unpin()
+
+    def session(self, passphrase=None, lifetime=None):
+        """
+        Unlock this key, and keep it unlocked until the returned :py:obj:`PGPKeySession` is closed, or ``lifetime``
+        seconds have elapsed. See :py:obj:`PGPKeySession` for details.
+
+        Example::
+
+            with privkey.session("TheCorrectPassphrase", lifetime=300) as session:
+                sig = session.sign("some text")
+
+        :param str passphrase: The passphrase to be used to unlock this key, if it is protected.
+        :param lifetime: If specified, the session is closed automatically after this many seconds.
+        :type lifetime: ``int``, ``float``
+        :raises: :py:exc:`~pgpy.errors.PGPDecryptionError` if the passphrase is incorrect
+        :raises: :py:exc:`~pgpy.errors.PGPError` if this is a public key
+        :returns: :py:obj:`PGPKeySession`
+        """
+        return PGPKeySession(self, passphrase, lifetime)
 
     def add_uid(self, uid, selfsign=True, **prefs):
         """
@@ -1587,6 +2145,15 @@ class PGPKey(Armorable, ParentRef, PGPObject):
             return next((u for u in self._uids if search in filter(lambda a: a is not None, (u.name, u.comment, u.email))), None)
         return self.parent.get_uid(search)
 
+    def _preferences_uid(self):
+        # the user ID whose self-signature holds the preferences for this key: its primary user ID, which sorts first,
+        # or its parent's if this is a subkey
+        uid = next(iter(self.userids), None)
+        if uid is None and self.parent is not None:
+            uid = next(iter(self.parent.userids), None)
+
+        return uid
+
     def del_uid(self, search):
         """
         Find and remove a user id that matches the search string given. This method does not modify the corresponding
@@ -2122,9 +2689,7 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         if user is not None:
             uid = self.get_uid(user)
         else:
-            uid = next(iter(self.userids), None)
-            if uid is None and self.parent is not None:
-                uid = next(iter(self.parent.userids), None)
+            uid = self._preferences_uid()
         cipher_algo = prefs.pop('cipher', uid.selfsig.cipherprefs[0])
 
         if cipher_algo not in uid.selfsig.cipherprefs:
@@ -2143,7 +2708,7 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         # pkesk.encrypt_sk(self.__key__, cipher_algo, sessionkey)
         pkesk.encrypt_sk(self._key, cipher_algo, sessionkey)
 
-        if message.is_encrypted:  # pragma: no cover
+        if message.is_encrypted:
             _m = message
 
         else:
@@ -2156,17 +2721,71 @@ class PGPKey(Armorable, ParentRef, PGPObject):
 
         return _m
 
-    def decrypt(self, message):
+    def decrypt(self, message, threads=None, return_session_key=False):
         """
         Decrypt a PGPMessage using this key.
 
         :param message: An encrypted :py:obj:`PGPMessage`
-        :returns: A new :py:obj:`PGPMessage` with the decrypted contents of ``message``
+        :optional param threads: Decrypt large messages using this many threads, or one per CPU if ``0``.
+                                 Default is ``None``, which decrypts serially.
+        :type threads: ``int``
+        :optional param return_session_key: If ``True``, also return the symmetric algorithm and session key that were
+                                            recovered, so that they can be used with
+                                            :py:meth:`PGPMessage.decrypt_with_session_key` later. Default is ``False``.
+        :type return_session_key: ``bool``
+        :returns: A new :py:obj:`PGPMessage` with the decrypted contents of ``message``. If ``return_session_key`` is
+                  ``True``, this is instead a tuple of ``(message, (symalg, sessionkey))``, where the second item is
+                  ``None`` if ``message`` was not encrypted.
         """
         if not message.is_encrypted:
             warnings.warn("This message is not encrypted", stacklevel=2)
-            return message
+            return (message, None) if return_session_key else message
+
+        alg, key = self._decrypt_sessionkey(message)
+
+        # now that we have the symmetric cipher used and the key, we can decrypt the actual message
+        decmsg = message.decrypt_with_session_key(alg, key, threads)
 
+        if return_session_key:
+            return decmsg, (alg, bytes(key))
+
+        return decmsg
+
+    def decrypt_session_key(self, message):
+        """
+        Recover the symmetric algorithm and session key of a PGPMessage encrypted to this key, without decrypting the
+        message itself.
+
+        :param message: An encrypted :py:obj:`PGPMessage`
+        :raises: :py:exc:`~errors.PGPError` if ``message`` is not encrypted, or not encrypted to this key.
+        :returns: A tuple of ``(symalg, sessionkey)``
+        """
+        if not message.is_encrypted:
+            raise PGPError("This message is not encrypted!")
+
+        alg, key = self._decrypt_sessionkey(message)
+        return alg, bytes(key)
+
+    def reader(self, message, verify=True):
+        """
+        Open the literal data in a PGPMessage for random access, using this key.
+        See :py:obj:`PGPMessageReader` for details.
+
+        :param message: An encrypted :py:obj:`PGPMessage`
+        :param bool verify: If ``False``, the integrity of the message is not checked until
+                            :py:meth:`PGPMessageReader.verify` is called.
+        :raises: :py:exc:`~errors.PGPDecryptionError` if decryption failed for any reason.
+        :raises: :py:exc:`~errors.PGPError` if the contents of ``message`` cannot be read at random.
+        :returns: :py:obj:`PGPMessageReader`
+        """
+        if not message.is_encrypted:
+            raise PGPError("This message is not encrypted!")
+
+        alg, key = self._decrypt_sessionkey(message)
+        return PGPMessageReader(message, alg, key, verify)
+
+    def _decrypt_sessionkey(self, message):
+        # recover the symmetric algorithm and session key from the PKESK addressed to this key or one of its subkeys
         if self.fingerprint.keyid not in message.issuers:
             sks = set(self.subkeys)
             mis = set(message.issuers)
@@ -2174,19 +2793,14 @@ class PGPKey(Armorable, ParentRef, PGPObject):
                 skid = list(sks & mis)[0]
                 warnings.warn("Message was encrypted with this key's subkey: {:s}. "
                               "Decrypting with that...".format(skid),
-                              stacklevel=2)
-                return self.subkeys[skid].decrypt(message)
+                              stacklevel=3)
+                return self.subkeys[skid]._decrypt_sessionkey(message)
 
             raise PGPError("Cannot decrypt the provided message with this key")
 
-        pkesk = next(pk for pk in message._sessionkeys if pk.pkalg == self.key_algorithm and pk.encrypter == self.fingerprint.keyid)
-        alg, key = pkesk.decrypt_sk(self._key)
-
-        # now that we have the symmetric cipher used and the key, we can decrypt the actual message
-        decmsg = PGPMessage()
-        decmsg.parse(message.message.decrypt(key, alg))
-
-        return decmsg
+        pkesk = next(pk for pk in message._sessionkeys
+                     if isinstance(pk, PKESessionKey) and pk.pkalg == self.key_algorithm and pk.encrypter == self.fingerprint.keyid)
+        return pkesk.decrypt_sk(self._key)
 
     def parse(self, data):
         unarmored = self.ascii_unarmor(data)
@@ -2198,18 +2812,23 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         if unarmored['headers'] is not None:
             self.ascii_headers = unarmored['headers']
 
-        # parse packets
+        return self._compose(self._packets(data))
+
+    @staticmethod
+    def _packets(data):
+        ##TODO: see issue #141 and fix this better
+        getpkt = lambda d: Packet(d) if len(d) > 0 else None  # flake8: noqa
+        # some packets are filtered out
+        return filter(lambda p: p.header.tag != PacketTag.Trust, iter(functools.partial(getpkt, data), None))
+
+    def _compose(self, getpkt):
+        # assemble this key, its subkeys, and any additional keys from a stream of already-parsed packets
         # keys will hold other keys parsed here
         keys = collections.OrderedDict()
         # orphaned will hold all non-opaque orphaned packets
         orphaned = []
         # last holds the last non-signature thing processed
 
-        ##TODO: see issue #141 and fix this better
-        getpkt = lambda d: Packet(d) if len(d) > 0 else None  # flake8: noqa
-        # some packets are filtered out
-        getpkt = filter(lambda p: p.header.tag != PacketTag.Trust, iter(functools.partial(getpkt, data), None))
-
         def pktgrouper():
             class PktGrouper(object):
                 def __init__(self):
@@ -2269,6 +2888,155 @@ class PGPKey(Armorable, ParentRef, PGPObject):
         return keys
 
 
+class PGPKeySession(object):
+    def __init__(self, key, passphrase=None, lifetime=None):
+        """
+        PGPKeySession objects keep a private key, along with all of its subkeys, unlocked until the session is closed,
+        either explicitly, by leaving a ``with`` block, or automatically after ``lifetime`` seconds. This avoids paying
+        the cost of decrypting the key material, and of loading it into the cryptography backend, every time the key is
+        used.
+
+        Sessions can be used from multiple threads at once. Closing a session waits for any operations already in
+        progress to finish. Overlapping sessions and :py:meth:`PGPKey.unlock` blocks on the same key are reference
+        counted, so the decrypted key material is only removed once all of them have ended.
+
+        :param key: The private key to unlock.
+        :type key: :py:obj:`PGPKey`
+        :param str passphrase: The passphrase to be used to unlock ``key``, if it is protected.
+        :param lifetime: If specified, the session is closed automatically after this many seconds.
+        :type lifetime: ``int``, ``float``
+        :raises: :py:exc:`~pgpy.errors.PGPDecryptionError` if the passphrase is incorrect
+        :raises: :py:exc:`~pgpy.errors.PGPError` if ``key`` is a public key, or a passphrase is required but was not given
+        """
+        if key.is_public:
+            raise PGPError("Public keys cannot be unlocked")
+
+        if key.is_protected and passphrase is None:
+            raise PGPError("This key is protected with a passphrase")
+
+        super(PGPKeySession, self).__init__()
+        self._key = key
+        self._cond = threading.Condition()
+        self._active = 0
+        self._closed = False
+        self._timer = None
+        self._expires = None
+
+        key._acquire_unlock(passphrase)
+        del passphrase
+
+        # keep the backend private key objects around for as long as this session is open
+        for sk in itertools.chain([key], key.subkeys.values()):
+            try:
+                sk._key.keymaterial.pin()
+
+            except NotImplementedError:  # pragma: no cover
+                pass
+
+        if lifetime is not None:
+            self._expires = time.time() + lifetime
+            self._timer = threading.Timer(lifetime, self.close)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return "<PGPKeySession [{:s}] for {:s} at 0x{:02X}>" \
+               "".format('open' if self.is_open else 'closed', self._key.fingerprint.keyid, id(self))
+
+    @property
+    def key(self):
+        """The :py:obj:`PGPKey` this session was opened for"""
+        return self._key
+
+    @property
+    def expires_at(self):
+        """A :py:obj:`~datetime.datetime` of when this session will be closed automatically, or ``None`` if it won't be"""
+        if self._expires is None:
+            return None
+
+        return datetime.fromtimestamp(self._expires)
+
+    @property
+    def is_open(self):
+        """``True`` if this session has not yet been closed, otherwise ``False``"""
+        return not self._closed
+
+    @contextlib.contextmanager
+    def _use(self):
+        with self._cond:
+            if self._closed:
+                raise PGPError("This session has been closed")
+            self._active += 1
+
+        try:
+            yield self._key
+
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def close(self):
+        """
+        Close this session. Any operations currently using it are allowed to finish first. Closing a session more than
+        once has no effect.
+        """
+        with self._cond:
+            if self._closed:
+                return
+
+            self._closed = True
+            while self._active > 0:
+                self._cond.wait()
+
+        if self._timer is not None:
+            self._timer.cancel()
+
+        self._key._release_unlock()
+
+    def sign(self, subject, **prefs):
+        """
+        Sign ``subject`` with the unlocked key. See :py:meth:`PGPKey.sign`.
+
+        :raises: :py:exc:`~pgpy.errors.PGPError` if this session has been closed
+        """
+        with self._use() as key:
+            return key.sign(subject, **prefs)
+
+    def decrypt(self, message, threads=None, return_session_key=False):
+        """
+        Decrypt ``message`` with the unlocked key. See :py:meth:`PGPKey.decrypt`.
+
+        :raises: :py:exc:`~pgpy.errors.PGPError` if this session has been closed
+        """
+        with self._use() as key:
+            return key.decrypt(message, threads, return_session_key)
+
+    def decrypt_session_key(self, message):
+        """
+        Recover the session key of ``message`` with the unlocked key. See :py:meth:`PGPKey.decrypt_session_key`.
+
+        :raises: :py:exc:`~pgpy.errors.PGPError` if this session has been closed
+        """
+        with self._use() as key:
+            return key.decrypt_session_key(message)
+
+    def reader(self, message, verify=True):
+        """
+        Open the literal data in ``message`` for random access with the unlocked key. See :py:meth:`PGPKey.reader`.
+
+        :raises: :py:exc:`~pgpy.errors.PGPError` if this session has been closed
+        """
+        with self._use() as key:
+            return key.reader(message, verify)
+
+
 class PGPKeyring(collections.Container, collections.Iterable, collections.Sized):
     def __init__(self, *args):
         """
@@ -2378,15 +3146,20 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
             for subkey in pgpkey.subkeys.values():
                 self._add_key(subkey)
 
-    def load(self, *args):
+    def load(self, *args, **kwargs):
         """
         Load all keys provided into this keyring object.
 
         :param \*args: Each arg in ``args`` can be any of the formats supported by :py:meth:`PGPKey.from_path` and
                       :py:meth:`PGPKey.from_blob`, or a ``list`` or ``tuple`` of these.
         :type \*args: ``list``, ``tuple``, ``str``, ``unicode``, ``bytes``, ``bytearray``
+        :keyword cache: If specified, a directory in which to keep parsed-packet caches (see :py:meth:`PGPKey.dump_cache`)
+                        for every key loaded. Keys with an up-to-date cache are loaded from it, rather than being parsed.
+        :type cache: ``str``
         :returns: a ``set`` containing the unique fingerprints of all of the keys that were loaded during this operation.
         """
+        cachedir = kwargs.pop('cache', None)
+
         def _preiter(first, iterable):
             yield first
             for item in iterable:
@@ -2395,7 +3168,10 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
         loaded = set()
         for key in iter(item for ilist in iter(ilist if isinstance(ilist, (tuple, list)) else [ilist] for ilist in args)
                         for item in ilist):
-            if os.path.isfile(key):
+            if cachedir is not None:
+                _key, keys = self._load_cached(key, cachedir)
+
+            elif os.path.isfile(key):
                 _key, keys = PGPKey.from_file(key)
 
             else:
@@ -2407,6 +3183,35 @@ class PGPKeyring(collections.Container, collections.Iterable, collections.Sized)
 
         return list(loaded)
 
+    @staticmethod
+    def _load_cached(key, cachedir):
+        if os.path.isfile(key):
+            with open(key, 'rb') as kf:
+                key = kf.read()
+
+        cpath = os.path.join(cachedir, '{:s}.pgpy'.format(binascii.hexlify(PacketCache.digest(key)).decode('latin-1')))
+        if os.path.isfile(cpath):
+            with open(cpath, 'rb') as cf:
+                cache = cf.read()
+
+            if PacketCache.check(cache, key):
+                return PGPKey.from_cache(cache, key)
+
+        source, headers, packets = PGPKey._parse_cacheable(key)
+
+        # a cache that doesn't match its source would never be used, so there's no point in writing one
+        if PacketCache.matches(packets, source, headers):
+            cache = PacketCache.dumps(packets, source, headers)
+
+            # write to a temporary file first and then move it into place, so that a partial cache is never seen
+            tmppath = '{:s}.{:d}.tmp'.format(cpath, os.getpid())
+            with open(tmppath, 'wb') as cf:
+                cf.write(cache)
+            getattr(os, 'replace', os.rename)(tmppath, cpath)
+
+        # the cache was just generated from these packets, so there is no need to decode it again
+        return PGPKey._from_packets(headers, packets)
+
     @contextlib.contextmanager
     def key(self, identifier):
         """
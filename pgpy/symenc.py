@@ -1,7 +1,13 @@
 """ symenc.py
 """
+import threading
+
+from distutils.version import LooseVersion
+
 import six
 
+import cryptography
+
 from cryptography.exceptions import UnsupportedAlgorithm
 
 from cryptography.hazmat.backends import default_backend
@@ -9,50 +15,230 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher
 from cryptography.hazmat.primitives.ciphers import modes
 
+from ._threads import WorkQueue
+from ._threads import thread_count
+
 from .errors import PGPDecryptionError
 from .errors import PGPEncryptionError
 from .errors import PGPInsecureCipher
 
-__all__ = ['_encrypt',
-           '_decrypt']
+__all__ = ['_CFBContext',
+           '_encrypt',
+           '_decrypt',
+           '_decrypt_parallel',
+           '_decrypt_range']
 
+# cryptography only accepts bytes-like input to update and update_into as of 2.5; before that, it must be bytes
+_bytes_only = LooseVersion(cryptography.__version__) < LooseVersion('2.5')
 
-def _encrypt(pt, key, alg, iv=None):
-    if iv is None:
-        iv = b'\x00' * (alg.block_size // 8)
 
-    if alg.is_insecure:
-        raise PGPInsecureCipher("{:s} is not secure. Do not use it for encryption!".format(alg.name))
+class _CFBContext(object):
+    """
+    Encrypts or decrypts a single CFB-mode stream, which can be fed to it in as many chunks as needed.
 
-    if not callable(alg.cipher):
-        raise PGPEncryptionError("Cipher {:s} not supported".format(alg.name))
+    CFB is a stream mode, so the output for each chunk is always exactly as long as the chunk itself.
+    :py:meth:`update_into` writes that output directly into a caller-provided buffer, which lets callers that are
+    assembling or consuming a large message avoid copying it around in intermediate ``bytes`` objects.
+    """
+    __slots__ = ('_ctx', '_slack')
 
-    try:
-        encryptor = Cipher(alg.cipher(key), modes.CFB(iv), default_backend()).encryptor()
+    #: the size of the chunks that :py:meth:`stream` reads and writes
+    __chunk_size__ = 1024 * 1024
+    #: the size of the segments that :py:func:`_decrypt_parallel` decrypts independently of each other;
+    #: this must be a multiple of every supported cipher's block size
+    __segment_size__ = 4 * 1024 * 1024
 
-    except UnsupportedAlgorithm as ex:  # pragma: no cover
-        six.raise_from(PGPEncryptionError, ex)
+    def __init__(self, key, alg, iv=None, encrypt=True):
+        if iv is None:
+            # Instead of using an IV, OpenPGP prefixes a string of length
+            # equal to the block size of the cipher plus two to the data before it
+            # is encrypted. The first block-size octets (for example, 8 octets for
+            # a 64-bit block length) are random, and the following two octets are
+            # copies of the last two octets of the IV.
+            iv = b'\x00' * (alg.block_size // 8)
 
-    else:
-        return bytearray(encryptor.update(pt) + encryptor.finalize())
+        if encrypt:
+            if alg.is_insecure:
+                raise PGPInsecureCipher("{:s} is not secure. Do not use it for encryption!".format(alg.name))
 
+            if not callable(alg.cipher):
+                raise PGPEncryptionError("Cipher {:s} not supported".format(alg.name))
 
-def _decrypt(ct, key, alg, iv=None):
-    if iv is None:
+        try:
+            cipher = Cipher(alg.cipher(key), modes.CFB(iv), default_backend())
+            self._ctx = cipher.encryptor() if encrypt else cipher.decryptor()
+
+        except UnsupportedAlgorithm as ex:  # pragma: no cover
+            six.raise_from(PGPEncryptionError if encrypt else PGPDecryptionError, ex)
+
+        # cryptography requires update_into buffers to have room for one block more than the input, less one octet,
+        # even though CFB never uses it
+        self._slack = (alg.block_size // 8) - 1
+
+    def update(self, data):
+        """process the next chunk of ``data`` and return the result"""
+        return self._ctx.update(self._coerce(data))
+
+    def update_into(self, data, buf, offset=0):
         """
-        Instead of using an IV, OpenPGP prefixes a string of length
-        equal to the block size of the cipher plus two to the data before it
-        is encrypted. The first block-size octets (for example, 8 octets for
-        a 64-bit block length) are random, and the following two octets are
-        copies of the last two octets of the IV.
+        Process the next chunk of ``data``, writing the result into ``buf`` starting at ``offset``.
+
+        :returns: the offset in ``buf`` immediately following what was written
+        """
+        end = offset + len(data)
+        data = self._coerce(data)
+        if len(buf) - end >= self._slack and hasattr(self._ctx, 'update_into'):
+            self._ctx.update_into(data, memoryview(buf)[offset:])
+
+        else:
+            # older versions of cryptography do not have update_into, and buf may not have enough room left over for it
+            buf[offset:end] = self._ctx.update(data)
+
+        return end
+
+    @staticmethod
+    def _coerce(data):
+        if not _bytes_only or isinstance(data, bytes):
+            return data
+
+        # on Python 2, bytes(memoryview) is its repr rather than its contents
+        return data.tobytes() if isinstance(data, memoryview) else bytes(data)
+
+    def finalize(self):
+        # this never produces any output in CFB mode, but it releases the backend context
+        return self._ctx.finalize()
+
+    def crypt(self, *chunks):
+        """
+        Process each of ``chunks`` in order, and finalize this context.
+
+        :returns: a single ``bytearray`` containing the output for all of ``chunks``
+        """
+        out = bytearray(sum(len(c) for c in chunks) + self._slack)
+        end = 0
+        for chunk in chunks:
+            end = self.update_into(chunk, out, end)
+
+        del out[end:]
+        out += self.finalize()
+        return out
+
+    def stream(self, src, dst, chunk_size=None):
+        """
+        Read everything remaining in the binary file-like object ``src``, and write the result to ``dst``, using a
+        fixed amount of memory no matter how large the input is. This context is finalized afterwards.
+
+        :returns: the number of octets written to ``dst``
         """
+        chunk_size = chunk_size or self.__chunk_size__
+        inbuf = bytearray(chunk_size)
+        outbuf = bytearray(chunk_size + self._slack)
+        total = 0
+
+        inview = memoryview(inbuf)
+        outview = memoryview(outbuf)
+
+        while True:
+            n = src.readinto(inbuf)
+            if not n:
+                break
+
+            self.update_into(inview[:n], outbuf)
+            dst.write(outview[:n])
+            total += n
+
+        dst.write(self.finalize())
+        return total
+
+
+def _encrypt(pt, key, alg, iv=None):
+    return _CFBContext(key, alg, iv).crypt(pt)
+
+
+def _decrypt(ct, key, alg, iv=None):
+    return _CFBContext(key, alg, iv, encrypt=False).crypt(ct)
+
+
+def _decrypt_parallel(ct, key, alg, threads, iv=None, digest=None, digest_len=None):
+    """
+    Decrypt ``ct`` using up to ``threads`` threads. ``threads=0`` uses one thread per CPU.
+
+    Unlike encryption, CFB decryption of each block only depends on the ciphertext, so the ciphertext is split into
+    block-aligned segments that are decrypted concurrently, each one starting from the last ciphertext block of the
+    segment before it. If ``digest`` is given, it is updated with the first ``digest_len`` octets of the plaintext
+    (all of it by default) in order, as each segment is finished, so hashing overlaps with decryption.
+
+    Ciphertexts of fewer than two segments, or ``threads`` of ``None`` or ``1``, are decrypted serially.
+    """
+    if digest_len is None:
+        digest_len = len(ct)
+
+    threads = thread_count(threads)
+
+    segsize = _CFBContext.__segment_size__
+    if not threads or threads < 2 or len(ct) < segsize * 2:
+        pt = _decrypt(ct, key, alg, iv)
+        if digest is not None:
+            digest.update(pt[:digest_len])
+        return pt
+
+    if iv is None:
         iv = b'\x00' * (alg.block_size // 8)
 
+    # each segment is decrypted using the preceding ciphertext block as its IV
+    ctview = memoryview(ct)
+    segments = [ (start, min(start + segsize, len(ct))) for start in range(0, len(ct), segsize) ]
+    ivs = [iv] + [ ctview[start - len(iv):start].tobytes() for start, _ in segments[1:] ]
+    done = [ threading.Event() for _ in segments ]
+    pt = bytearray(len(ct))
+
+    def work(i):
+        start, end = segments[i]
+        try:
+            _CFBContext(key, alg, ivs[i], encrypt=False).update_into(ctview[start:end], pt, start)
+
+        finally:
+            done[i].set()
+
+    queue = WorkQueue(work, len(segments), threads)
+
+    # wait for segments in order, hashing each one while the workers continue on the rest
+    # segments are started in order, so every one before a failed segment still finishes
+    for (start, end), segdone in zip(segments, done):
+        segdone.wait()
+        if queue.errors:
+            break
+
+        if digest is not None and start < digest_len:
+            digest.update(memoryview(pt)[start:min(end, digest_len)])
+
     try:
-        decryptor = Cipher(alg.cipher(key), modes.CFB(iv), default_backend()).decryptor()
+        queue.join()
+
+    finally:
+        if six.PY3:
+            # a bytearray cannot be resized while a memoryview of it is still around
+            ctview.release()
+
+    return pt
+
+
+def _decrypt_range(ct, key, alg, start, end, iv=None):
+    """
+    Decrypt only ``ct[start:end]``.
+
+    Each CFB block is decrypted using only the ciphertext block that precedes it, so nothing before the block that
+    contains ``start`` needs to be decrypted first.
+    """
+    bs = alg.block_size // 8
+    end = min(end, len(ct))
+    if start >= end:
+        return bytearray()
 
-    except UnsupportedAlgorithm as ex:  # pragma: no cover
-        six.raise_from(PGPDecryptionError, ex)
+    first = start - (start % bs)
+    if first > 0:
+        iv = bytes(ct[first - bs:first])
 
-    else:
-        return bytearray(decryptor.update(ct) + decryptor.finalize())
+    pt = _CFBContext(key, alg, iv, encrypt=False).crypt(memoryview(ct)[first:end])
+    del pt[:start - first]
+    return pt
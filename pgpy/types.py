@@ -8,9 +8,10 @@ import binascii
 import bisect
 import codecs
 import collections
-import operator
+import itertools
 import os
 import re
+import struct
 import warnings
 import weakref
 
@@ -36,7 +37,7 @@ __all__ = ['Armorable',
            'FlagEnumMeta',
            'FlagEnum',
            'Fingerprint',
-           'SorteDeque']
+           'SortedList']
 
 if six.PY2:
     FileNotFoundError = IOError
@@ -44,6 +45,7 @@ if six.PY2:
 
 
 class Armorable(six.with_metaclass(abc.ABCMeta)):
+    __slots__ = ()
     __crc24_init__ = 0x0B704CE
     __crc24_poly__ = 0x1864CFB
 
@@ -72,11 +74,12 @@ class Armorable(six.with_metaclass(abc.ABCMeta)):
         raise TypeError("Expected: ASCII input of type str, bytes, or bytearray")  # pragma: no cover
 
     @staticmethod
-    def ascii_unarmor(text):
+    def ascii_unarmor(text, crc=True):
         """
         Takes an ASCII-armored PGP block and returns the decoded byte value.
 
         :param text: An ASCII-armored PGP block, to un-armor.
+        :param crc: If ``False``, the armored CRC24 is not checked against the de-armored data.
         :raises: :py:exc:`ValueError` if ``text`` did not contain an ASCII-armored PGP block.
         :raises: :py:exc:`TypeError` if ``text`` is not a ``str``, ``bytes``, or ``bytearray``
         :returns: A ``dict`` containing information from ``text``, including the de-armored data.
@@ -131,7 +134,7 @@ class Armorable(six.with_metaclass(abc.ABCMeta)):
 
         if m['crc'] is not None:
             m['crc'] = Header.bytes_to_int(base64.b64decode(m['crc'].encode()))
-            if Armorable.crc24(m['body']) != m['crc']:
+            if crc and Armorable.crc24(m['body']) != m['crc']:
                 warnings.warn('Incorrect crc24', stacklevel=3)
 
         return m
@@ -218,6 +221,8 @@ class Armorable(six.with_metaclass(abc.ABCMeta)):
 
 class ParentRef(object):
     # mixin class to handle weak-referencing a parent object
+    __slots__ = ('__parent', '__weakref__')
+
     @property
     def _parent(self):
         if isinstance(self.__parent, weakref.ref):
@@ -242,6 +247,7 @@ class ParentRef(object):
 
 
 class PGPObject(six.with_metaclass(abc.ABCMeta, object)):
+    __slots__ = ()
     __metaclass__ = abc.ABCMeta
 
     @staticmethod
@@ -295,6 +301,13 @@ class PGPObject(six.with_metaclass(abc.ABCMeta, object)):
 
         return text.decode('utf-8')
 
+    @staticmethod
+    def bytes_into(buf, offset, data):
+        """copy data into buf at offset, and return the offset immediately after it"""
+        end = offset + len(data)
+        buf[offset:end] = data
+        return end
+
     @abc.abstractmethod
     def parse(self, packet):
         """this method is too abstract to understand"""
@@ -314,30 +327,113 @@ class PGPObject(six.with_metaclass(abc.ABCMeta, object)):
         # this is what all subclasses will do anyway, so doing this here we can reduce code duplication significantly
         return bytes(self.__bytearray__())
 
+    def __bytelen__(self):
+        """
+        Return the number of octets that :py:meth:`write_into` will write. Subclasses that can compute this without
+        serializing themselves should override it.
+        """
+        return len(self.__bytearray__())
+
+    def write_into(self, buf, offset=0):
+        """
+        Write the binary format of this object into ``buf``, starting at ``offset``.
+
+        Containers override this to write each of their children directly into ``buf``, instead of concatenating
+        copies of their children's output; this fallback copies the output of ``__bytearray__``.
+
+        :param buf: The buffer to write into. If it is too short, it is extended.
+        :type buf: ``bytearray``
+        :param offset: The offset into ``buf`` to start writing at.
+        :type offset: ``int``
+        :returns: The offset immediately following the last octet written.
+        """
+        return self.bytes_into(buf, offset, self.__bytearray__())
+
+    def serialize_to(self, fileobj):
+        """
+        Write the binary format of this object to ``fileobj``.
+
+        :param fileobj: A writable binary file-like object.
+        :returns: The number of octets written.
+        """
+        _bytes = self.__bytearray__()
+        fileobj.write(_bytes)
+        return len(_bytes)
+
+    def _serialize(self):
+        # size the output up front, then have write_into fill it in a single pass
+        _bytes = bytearray(self.__bytelen__())
+        del _bytes[self.write_into(_bytes):]
+        return _bytes
+
 
 class Field(PGPObject):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __len__(self):
         """Return the length of the output of __bytes__"""
 
+    def __bytelen__(self):
+        return len(self)
+
 
 class Header(Field):
+    __slots__ = ('_len', '_lenfmt', '_llen', '_partial')
+
+    # precompiled unpackers for big-endian length fields, by the number of octets they occupy
+    _lenstructs = {1: struct.Struct('>B'), 2: struct.Struct('>H'), 4: struct.Struct('>I')}
+    # the number of octets in an old-format length field, indexed by the length type in the low bits of the tag octet
+    _old_llens = (1, 2, 4, 0)
+
     @staticmethod
     def encode_length(l, nhf=True, llen=1):
-        def _new_length(l):
+        if nhf:
             if 192 > l:
-                return Header.int_to_bytes(l)
+                return Header._lenstructs[1].pack(l)
 
             elif 8384 > l:
-                elen = ((l & 0xFF00) + (192 << 8)) + ((l & 0xFF) - 192)
-                return Header.int_to_bytes(elen, 2)
+                return Header._lenstructs[2].pack(((l & 0xFF00) + (192 << 8)) + ((l & 0xFF) - 192))
+
+            return b'\xFF' + Header._lenstructs[4].pack(l)
+
+        if llen in Header._lenstructs and l < (1 << (llen * 8)):
+            return Header._lenstructs[llen].pack(l)
+
+        return Header.int_to_bytes(l, llen) if llen > 0 else b''
+
+    @staticmethod
+    def decode_length(buf, offset=0, lenfmt=1, llen=1):
+        """
+        Decode the length field that starts at ``buf[offset]``, without consuming it.
+
+        :param buf: the raw bytes to decode from
+        :param offset: the offset of the first octet of the length field
+        :param lenfmt: ``1`` for a new-format length, ``0`` for an old-format length
+        :param llen: the number of octets in an old-format length field. Ignored for new-format lengths.
+        :returns: a tuple of ``(length, number of octets in the length field, partial)``
+        """
+        if lenfmt == 0:
+            if llen > 0:
+                return Header._lenstructs[llen].unpack_from(buf, offset)[0], llen, False
+
+            return 0, 0, False  # pragma: no cover
+
+        fo = buf[offset]
+        if 192 > fo:
+            return fo, 1, False
 
-            return b'\xFF' + Header.int_to_bytes(l, 4)
+        elif 224 > fo:  # >= 192 is implied
+            dlen = Header._lenstructs[2].unpack_from(buf, offset)[0]
+            return ((dlen - (192 << 8)) & 0xFF00) + ((dlen & 0xFF) + 192), 2, False
 
-        def _old_length(l, llen):
-            return Header.int_to_bytes(l, llen) if llen > 0 else b''
+        elif 255 > fo:  # pragma: no cover
+            # not testable until partial body lengths actually work
+            # >= 224 is implied
+            # this is a partial-length header
+            return 1 << (fo & 0x1f), 1, True
 
-        return _new_length(l) if nhf else _old_length(l, llen)
+        return Header._lenstructs[4].unpack_from(buf, offset + 1)[0], 5, False
 
     @sdproperty
     def length(self):
@@ -350,41 +446,10 @@ class Header(Field):
     @length.register(six.binary_type)
     @length.register(bytearray)
     def length_bin(self, val):
-        def _new_len(b):
-            fo = b[0]
-
-            if 192 > fo:
-                self._len = self.bytes_to_int(b[:1])
-                del b[:1]
-
-            elif 224 > fo:  # >= 192 is implied
-                dlen = self.bytes_to_int(b[:2])
-                self._len = ((dlen - (192 << 8)) & 0xFF00) + ((dlen & 0xFF) + 192)
-                del b[:2]
-
-            elif 255 > fo:  # pragma: no cover
-                # not testable until partial body lengths actually work
-                # >= 224 is implied
-                # this is a partial-length header
-                self._partial = True
-                self._len = 1 << (fo & 0x1f)
-
-            elif 255 == fo:
-                self._len = self.bytes_to_int(b[1:5])
-                del b[:5]
-
-            else:  # pragma: no cover
-                raise ValueError("Malformed length: 0x{:02x}".format(fo))
-
-        def _old_len(b):
-            if self.llen > 0:
-                self._len = self.bytes_to_int(b[:self.llen])
-                del b[:self.llen]
-
-            else:  # pragma: no cover
-                self._len = 0
-
-        _new_len(val) if self._lenfmt == 1 else _old_len(val)
+        self._len, size, partial = self.decode_length(val, 0, self._lenfmt, self.llen)
+        if partial:  # pragma: no cover
+            self._partial = True
+        del val[:size]
 
     @sdproperty
     def llen(self):
@@ -410,7 +475,7 @@ class Header(Field):
     @llen.register(int)
     def llen_int(self, val):
         if self._lenfmt == 0:
-            self._llen = {0: 1, 1: 2, 2: 4, 3: 0}[val]
+            self._llen = self._old_llens[val]
 
     def __init__(self):
         super(Header, self).__init__()
@@ -464,86 +529,99 @@ class MetaDispatchable(abc.ABCMeta):
          - __ver__ > 0
          - the given typeid/ver combination is not already registered
     """
+    _tables = {}
+    """
+    _tables holds a dispatch table for each RootClass, compiled from _registry as each class is created, so that
+    dispatching a packet never has to search _roots or build composite registry keys. Each table uses the format:
+
+    { None: OpaqueClass, TypeID: SubClass, (TypeID, Ver): VerSubClass }
+    """
+    _rootcls = {}
+    """
+    _rootcls caches the RootClass of each Dispatchable class that has been used to parse a packet.
+    """
 
     def __new__(mcs, name, bases, attrs):  # NOQA
         ncls = super(MetaDispatchable, mcs).__new__(mcs, name, bases, attrs)
 
         if not hasattr(ncls.__typeid__, '__isabstractmethod__'):
-            if ncls.__typeid__ == -1 and not issubclass(ncls, tuple(MetaDispatchable._roots)):
+            # dispatchable classes are never registered as virtual subclasses, so walking the MRO finds the same roots
+            # that issubclass would, without paying for ABCMeta's subclass checks on every class that is created
+            roots = [ base for base in ncls.__mro__[1:] if base in MetaDispatchable._roots ]
+
+            if ncls.__typeid__ == -1 and not roots:
                 # this is a root class
                 MetaDispatchable._roots.add(ncls)
+                MetaDispatchable._tables[ncls] = {}
+
+            elif roots and ncls.__typeid__ != -1:
+                for rcls in roots:
+                    table = MetaDispatchable._tables[rcls]
 
-            elif issubclass(ncls, tuple(MetaDispatchable._roots)) and ncls.__typeid__ != -1:
-                for rcls in [ root for root in MetaDispatchable._roots if issubclass(ncls, root) ]:
                     if (rcls, ncls.__typeid__) not in MetaDispatchable._registry:
                         MetaDispatchable._registry[(rcls, ncls.__typeid__)] = ncls
+                        table[ncls.__typeid__] = ncls
 
                     if (ncls.__ver__ is not None and ncls.__ver__ > 0 and
                             (rcls, ncls.__typeid__, ncls.__ver__) not in MetaDispatchable._registry):
                         MetaDispatchable._registry[(rcls, ncls.__typeid__, ncls.__ver__)] = ncls
+                        table[(ncls.__typeid__, ncls.__ver__)] = ncls
 
         # finally, return the new class object
         return ncls
 
     def __call__(cls, packet=None):  # NOQA
-        def _makeobj(cls):
+        if packet is None:
             obj = object.__new__(cls)
             obj.__init__()
             return obj
 
-        if packet is not None:
-            if cls in MetaDispatchable._roots:
-                rcls = cls
-
-            elif issubclass(cls, tuple(MetaDispatchable._roots)):  # pragma: no cover
-                rcls = next(root for root in MetaDispatchable._roots if issubclass(cls, root))
-
-            ##TODO: else raise an exception of some kind, but this should never happen
-
-            header = rcls.__headercls__()
-            header.parse(packet)
-
-            ncls = None
-            if (rcls, header.typeid) in MetaDispatchable._registry:
-                ncls = MetaDispatchable._registry[(rcls, header.typeid)]
+        try:
+            rcls = MetaDispatchable._rootcls[cls]
 
-                if ncls.__ver__ == 0:
-                    if header.__class__ != ncls.__headercls__:
-                        nh = ncls.__headercls__()
-                        nh.__dict__.update(header.__dict__)
-                        try:
-                            nh.parse(packet)
+        except KeyError:
+            ##TODO: raise an exception of some kind if cls has no root, but this should never happen
+            rcls = next(root for root in MetaDispatchable._roots if issubclass(cls, root))
+            MetaDispatchable._rootcls[cls] = rcls
 
-                        except Exception as ex:
-                            six.raise_from(PGPError, ex)
+        table = MetaDispatchable._tables[rcls]
 
-                        header = nh
+        header = rcls.__headercls__()
+        header.parse(packet)
 
-                    if (rcls, header.typeid, header.version) in MetaDispatchable._registry:
-                        ncls = MetaDispatchable._registry[(rcls, header.typeid, header.version)]
+        ncls = table.get(header.typeid, None)
+        if ncls is not None and ncls.__ver__ == 0:
+            if header.__class__ is not ncls.__headercls__:
+                # the version octet immediately follows the header that was just parsed, so rather than building and
+                # parsing a second header, promote this one and read the version octet directly
+                try:
+                    header.__class__ = ncls.__headercls__
+                    header.version = packet[0]
+                    del packet[0]
 
-                    else:  # pragma: no cover
-                        ncls = None
+                except Exception as ex:
+                    six.raise_from(PGPError, ex)
 
-            if ncls is None:
-                ncls = MetaDispatchable._registry[(rcls, None)]
+            ncls = table.get((header.typeid, header.version), None)
 
-            obj = _makeobj(ncls)
-            obj.header = header
+        if ncls is None:
+            ncls = table[None]
 
-            try:
-                obj.parse(packet)
+        obj = object.__new__(ncls)
+        obj.__init__()
+        obj.header = header
 
-            except Exception as ex:
-                six.raise_from(PGPError, ex)
+        try:
+            obj.parse(packet)
 
-        else:
-            obj = _makeobj(cls)
+        except Exception as ex:
+            six.raise_from(PGPError, ex)
 
         return obj
 
 
 class Dispatchable(six.with_metaclass(MetaDispatchable, PGPObject)):
+    __slots__ = ()
     __metaclass__ = MetaDispatchable
 
     @abc.abstractproperty
@@ -646,44 +724,72 @@ class Fingerprint(str):
     A subclass of ``str``. Can be compared using == and != to ``str``, ``unicode``, and other :py:obj:`Fingerprint` instances.
 
     Primarily used as a key for internal dictionaries, so it ignores spaces when comparing and
+
+    Fingerprints are interned: constructing a :py:obj:`Fingerprint` that has already been seen returns the existing
+    instance, and its canonical hex and binary forms, key ID, short ID, and hash are all computed only once.
     """
+    # canonical hex -> Fingerprint
+    _interned = {}
+    # the intern table is emptied once it reaches this size, so that it cannot grow without bound
+    __intern_max__ = 65536
+
     @property
     def keyid(self):
-        return str(self).replace(' ', '')[-16:]
+        return self._keyid
 
     @property
     def shortid(self):
-        return str(self).replace(' ', '')[-8:]
+        return self._shortid
 
     def __new__(cls, content):
         if isinstance(content, Fingerprint):
             return content
 
+        if isinstance(content, bytearray):
+            # binary fingerprint
+            if len(content) != 20:
+                raise ValueError("Expected: 20 octets")
+            content = binascii.hexlify(bytes(content)).decode('latin-1').upper()
+
+        else:
+            content = content.upper().replace(' ', '')
+
+        try:
+            return cls._interned[content]
+
+        except KeyError:
+            pass
+
         # validate input before continuing: this should be a string of 40 hex digits
-        content = content.upper().replace(' ', '')
         if not bool(re.match(r'^[A-F0-9]{40}$', content)):
             raise ValueError("Expected: String of 40 hex digits")
 
         # store in the format: "AAAA BBBB CCCC DDDD EEEE  FFFF 0000 1111 2222 3333"
         #                                               ^^ note 2 spaces here
-        spaces = [ ' ' if i != 4 else '  ' for i in range(10) ]
-        chunks = [ ''.join(g) for g in six.moves.zip_longest(*[iter(content)] * 4) ]
-        content = ''.join(j for i in six.moves.zip_longest(chunks, spaces, fillvalue='') for j in i).strip()
+        chunks = [ content[i:(i + 4)] for i in range(0, 40, 4) ]
+        fp = str.__new__(cls, ' '.join(chunks[:5]) + '  ' + ' '.join(chunks[5:]))
+        fp._hex = content
+        fp._keyid = content[-16:]
+        fp._shortid = content[-8:]
+        fp._hash = hash(str(content))
+        fp._bytes = binascii.unhexlify(six.b(content))
+
+        if len(cls._interned) >= cls.__intern_max__:
+            cls._interned.clear()
+        cls._interned[content] = fp
 
-        return str.__new__(cls, content)
+        return fp
 
     def __eq__(self, other):
         if isinstance(other, Fingerprint):
-            return str(self) == str(other)
+            return self is other or self._hex == other._hex
 
         if isinstance(other, (six.text_type, bytes, bytearray)):
             if isinstance(other, (bytes, bytearray)):  # pragma: no cover
                 other = other.decode('latin-1')
 
             other = str(other).replace(' ', '')
-            return any([self.replace(' ', '') == other,
-                        self.keyid == other,
-                        self.shortid == other])
+            return other == self._hex or other == self._keyid or other == self._shortid
 
         return False  # pragma: no cover
 
@@ -691,26 +797,122 @@ class Fingerprint(str):
         return not (self == other)
 
     def __hash__(self):
-        return hash(str(self.replace(' ', '')))
+        return self._hash
 
     def __bytes__(self):
-        return binascii.unhexlify(six.b(self.replace(' ', '')))
+        return self._bytes
+
+
+class SortedList(object):
+    """
+    A sequence that keeps its items in sorted order as they are inserted.
+
+    Items are stored in a list of short blocks, alongside the last (largest) item of each block, so inserting an item
+    only has to bisect the list of block maximums and then a single block, and only that block has to be shifted to make
+    room for it. This keeps insertion at O(log n) comparisons, even for keys with tens of thousands of signatures.
+    """
+    __slots__ = ('_blocks', '_maxes', '_len')
+    __blocksize__ = 256
+
+    def __init__(self, iterable=()):
+        self._blocks = []
+        self._maxes = []
+        self._len = 0
+        self.update(iterable)
+
+    def __len__(self):
+        return self._len
 
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._blocks)
+
+    def __reversed__(self):
+        return itertools.chain.from_iterable(reversed(block) for block in reversed(self._blocks))
+
+    def __contains__(self, item):
+        return any(item in block for block in self._blocks)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+
+        if not 0 <= index < self._len:
+            raise IndexError("SortedList index out of range")
+
+        # the common cases are the ends of the list
+        if index >= self._len - len(self._blocks[-1]):
+            return self._blocks[-1][index - (self._len - len(self._blocks[-1]))]
+
+        for block in self._blocks:
+            if index < len(block):
+                return block[index]
+            index -= len(block)
+
+    def __iadd__(self, other):
+        self.update(other)
+        return self
+
+    def __repr__(self):
+        return "SortedList({!r})".format(list(self))
+
+    def _locate(self, item):
+        # the block and the position within that block that bisect_left would return for the whole list
+        k = bisect.bisect_left(self._maxes, item)
+        if k == len(self._blocks):
+            return k, 0
+        return k, bisect.bisect_left(self._blocks[k], item)
 
-class SorteDeque(collections.deque):
-    """A deque subclass that tries to maintain sorted ordering using bisect"""
     def insort(self, item):
-        i = bisect.bisect_left(self, item)
-        self.rotate(- i)
-        self.appendleft(item)
-        self.rotate(i)
+        if not self._blocks:
+            self._blocks.append([item])
+            self._maxes.append(item)
+
+        else:
+            k, i = self._locate(item)
+            if k == len(self._blocks):
+                # item sorts after everything else, so it goes at the end of the last block
+                k -= 1
+                self._blocks[k].append(item)
+                self._maxes[k] = item
+
+            else:
+                self._blocks[k].insert(i, item)
+
+            # split blocks that have grown too large, so that inserting into them stays cheap
+            block = self._blocks[k]
+            if len(block) > 2 * self.__blocksize__:
+                self._blocks.insert(k + 1, block[self.__blocksize__:])
+                self._maxes.insert(k, block[self.__blocksize__ - 1])
+                del block[self.__blocksize__:]
+
+        self._len += 1
+
+    def update(self, iterable):
+        for item in iterable:
+            self.insort(item)
+
+    def remove(self, item):
+        for k, block in enumerate(self._blocks):
+            if item in block:
+                block.remove(item)
+                if block:
+                    self._maxes[k] = block[-1]
+
+                else:
+                    del self._blocks[k]
+                    del self._maxes[k]
+
+                self._len -= 1
+                return
+
+        raise ValueError("SortedList.remove(x): x not in list")
 
-    def resort(self, item):  # pragma: no cover
+    def resort(self, item):
         if item in self:
             # if item is already in self, see if it is still in sorted order.
             # if not, re-sort it by removing it and then inserting it into its sorted order
-            i = bisect.bisect_left(self, item)
-            if i == len(self) or self[i] is not item:
+            k, i = self._locate(item)
+            if k == len(self._blocks) or self._blocks[k][i] is not item:
                 self.remove(item)
                 self.insort(item)
 
@@ -718,7 +920,8 @@ class SorteDeque(collections.deque):
             # if item is not in self, just insert it in sorted order
             self.insort(item)
 
-    def check(self):  # pragma: no cover
+    def check(self):
         """re-sort any items in self that are not sorted"""
-        for unsorted in iter(self[i] for i in range(len(self) - 2) if not operator.le(self[i], self[i + 1])):
+        items = list(self)
+        for unsorted in [b for a, b in zip(items, items[1:]) if b < a]:
             self.resort(unsorted)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+""" measure the per-signature overhead of converting DSA/ECDSA signatures between OpenPGP MPIs and DER
+
+usage: test_dss_sig_bench.py [iterations]
+
+The "pyasn1" rows reproduce the conversions PGPy used to do with pyasn1, the "native" rows time the current
+DSASignature.__sig__ (used for every verification) and DSASignature.from_signer (used for every new signature).
+"""
+import sys
+import timeit
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from pyasn1.codec.der import decoder
+from pyasn1.codec.der import encoder
+from pyasn1.type.univ import Integer
+from pyasn1.type.univ import Sequence
+
+from pgpy.packet.fields import ECDSASignature
+
+
+def pyasn1_encode(sig):
+    seq = Sequence()
+    for i in sig:
+        seq.setComponentByPosition(len(seq), Integer(i))
+    return encoder.encode(seq)
+
+
+def pyasn1_decode(der):
+    seq, _ = decoder.decode(der)
+    return int(seq[0]), int(seq[1])
+
+
+def main(n):
+    key = ec.generate_private_key(ec.SECP384R1(), default_backend())
+    signer = key.signer(ec.ECDSA(hashes.SHA384()))
+    signer.update(b'the quick brown fox jumps over the lazy dog')
+    der = signer.finalize()
+
+    sig = ECDSASignature()
+    sig.from_signer(der)
+    assert sig.__sig__() == der == pyasn1_encode(sig)
+    assert pyasn1_decode(der) == (sig.r, sig.s)
+
+    rows = [('encode (verify)', 'pyasn1', lambda: pyasn1_encode(sig)),
+            ('encode (verify)', 'native', sig.__sig__),
+            ('decode (sign)', 'pyasn1', lambda: pyasn1_decode(der)),
+            ('decode (sign)', 'native', lambda: ECDSASignature().from_signer(der))]
+
+    print('{:,} iterations, P-384 signature ({:d} octets of DER)\n'.format(n, len(der)))
+    print('{:16} {:8} {:>14}'.format('Operation', 'Codec', 'us/signature'))
+    print('{:=<16} {:=<8} {:=>14}'.format('', '', ''))
+    for op, codec, func in rows:
+        t = min(timeit.repeat(func, number=n, repeat=3))
+        print('{:16} {:8} {:>14,.2f}'.format(op, codec, t / n * 1e6))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
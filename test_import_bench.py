@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+""" measure how long ``import pgpy`` takes in a fresh interpreter, and check it against a budget
+
+usage: test_import_bench.py [runs]
+
+Each run imports pgpy in a new interpreter, so nothing is shared between runs apart from the OS file cache.
+The median of all runs is compared against IMPORT_BUDGET_MS; if it is exceeded, or if any of LAZY_MODULES were loaded,
+this exits with a non-zero status. The budget assumes that pgpy's modules have already been byte-compiled, as they are
+when PGPy is installed.
+Update the budget (and BUDGET_HISTORY) when a release deliberately changes what is loaded at import time.
+"""
+import json
+import subprocess
+import sys
+
+#: the current import time budget for ``import pgpy``, in milliseconds
+IMPORT_BUDGET_MS = 200
+
+#: the budget as of each release that changed it
+BUDGET_HISTORY = [('0.5.0', 200)]
+
+#: modules that should only be loaded once they are needed, and never by ``import pgpy`` alone
+LAZY_MODULES = ['cryptography.hazmat.backends.openssl.backend',
+                'cryptography.hazmat.bindings.openssl.binding',
+                'pyasn1.codec.der.decoder',
+                'pyasn1.codec.der.encoder']
+
+_probe = """
+import json, sys, time
+start = time.perf_counter() if hasattr(time, 'perf_counter') else time.time()
+import pgpy
+end = time.perf_counter() if hasattr(time, 'perf_counter') else time.time()
+print(json.dumps({'ms': (end - start) * 1000, 'modules': sorted(sys.modules)}))
+"""
+
+
+def run_once():
+    out = subprocess.check_output([sys.executable, '-c', _probe])
+    return json.loads(out.decode('utf-8'))
+
+
+def main(runs):
+    results = [ run_once() for _ in range(runs) ]
+    times = sorted(r['ms'] for r in results)
+    median = times[len(times) // 2]
+
+    loaded = set(results[-1]['modules'])
+    pgpy_modules = len([m for m in loaded if m == 'pgpy' or m.startswith('pgpy.')])
+    eager = [ m for m in LAZY_MODULES if m in loaded ]
+
+    print('import pgpy: {:,} runs, median {:.1f}ms (min {:.1f}ms, max {:.1f}ms), budget {:d}ms'
+          ''.format(runs, median, times[0], times[-1], IMPORT_BUDGET_MS))
+    print('{:,} modules loaded, {:,} of them from pgpy'.format(len(loaded), pgpy_modules))
+
+    ok = True
+    if eager:
+        print('loaded eagerly, but should be lazy: {:s}'.format(', '.join(eager)))
+        ok = False
+
+    if median > IMPORT_BUDGET_MS:
+        print('over budget by {:.1f}ms'.format(median - IMPORT_BUDGET_MS))
+        ok = False
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 15))
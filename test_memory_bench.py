@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+""" report the memory footprint of parsed packets, and of the PGPKey, PGPMessage, and PGPSignature objects that wrap them,
+per class and in total
+
+usage: test_memory_bench.py [file.asc ...]
+
+If no files are given, every ASCII-armored block under tests/testdata is loaded.
+The total allocated while loading is measured with tracemalloc, so it is only reported on Python 3.4 and later.
+"""
+from __future__ import division
+
+import collections
+import gc
+import os
+import sys
+
+from enum import Enum
+
+import pgpy
+from pgpy.packet import Packet
+from pgpy.types import Armorable
+
+try:
+    import tracemalloc
+
+except ImportError:  # Python 2
+    tracemalloc = None
+
+# the wrapper class to load each kind of ASCII-armored block with
+wrappers = {'PUBLIC KEY BLOCK': pgpy.PGPKey,
+            'PRIVATE KEY BLOCK': pgpy.PGPKey,
+            'MESSAGE': pgpy.PGPMessage,
+            'SIGNATURE': pgpy.PGPSignature}
+
+
+def footprint(obj):
+    # the object itself, plus its instance dictionary if it has one
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def pgpy_objects(roots):
+    # every distinct object reachable from roots whose class is defined in pgpy
+    # enum members are shared singletons, so they are not counted
+    seen = set()
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+
+        if type(obj).__module__.startswith('pgpy.') and not isinstance(obj, Enum):
+            yield obj
+
+        stack.extend(gc.get_referents(obj))
+
+
+def traced(load):
+    # call load(), and return its result along with the number of bytes allocated while it ran, if that can be measured
+    if tracemalloc is None:
+        return load(), None
+
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    result = load()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, end - start
+
+
+def load_packets(blocks):
+    packets = []
+    for _, body in blocks:
+        body = bytearray(body)
+        while len(body) > 0:
+            try:
+                packets.append(Packet(body))
+
+            except pgpy.errors.PGPError:
+                break
+
+    return packets
+
+
+def load_wrappers(blocks):
+    objs = []
+    for text, _ in blocks:
+        magic = Armorable.ascii_unarmor(text)['magic']
+        if magic in wrappers:
+            try:
+                obj = wrappers[magic].from_blob(text)
+
+            except (pgpy.errors.PGPError, ValueError, NotImplementedError):
+                continue
+
+            objs.append(obj[0] if isinstance(obj, tuple) else obj)
+
+    return objs
+
+
+def report(title, roots, allocated):
+    counts = collections.Counter()
+    sizes = collections.Counter()
+    withdict = set()
+    for obj in pgpy_objects(roots):
+        name = type(obj).__name__
+        counts[name] += 1
+        sizes[name] += footprint(obj)
+        if hasattr(obj, '__dict__'):
+            withdict.add(name)
+
+    print(title)
+    if allocated is not None:
+        print('Allocated while loading: {:,} bytes ({:,.1f} bytes/object)'.format(allocated, allocated / max(1, len(roots))))
+    print('')
+
+    ml = max(len(n) for n in counts) + 2
+    print('{:{ml}} {:>8} {:>12} {:>10}'.format('Class', 'Count', 'Total', 'Per object', ml=ml))
+    print('{:=<{ml}} {:=>8} {:=>12} {:=>10}'.format('', '', '', '', ml=ml))
+    for name, size in sizes.most_common():
+        label = name + (' *' if name in withdict else '')
+        print('{:{ml}} {:>8,} {:>12,} {:>10,.1f}'.format(label, counts[name], size, size / counts[name], ml=ml))
+    print('\n* has a per-instance __dict__\n')
+
+
+def main(ascfiles):
+    blocks = []
+    for ascfile in ascfiles:
+        with open(ascfile, 'r') as af:
+            text = af.read()
+
+        try:
+            blocks.append((text, Armorable.ascii_unarmor(text)['body']))
+
+        except ValueError:
+            continue
+
+    packets, allocated = traced(lambda: load_packets(blocks))
+    report('Parsed {:,} packets from {:,} blocks'.format(len(packets), len(blocks)), packets, allocated)
+
+    objs, allocated = traced(lambda: load_wrappers(blocks))
+    report('Loaded {:,} keys, messages, and signatures from {:,} blocks'.format(len(objs), len(blocks)), objs, allocated)
+
+
+if __name__ == '__main__':
+    files = [ os.path.abspath(os.path.expanduser(f)) for f in sys.argv[1:] ]
+    for f in [ f for f in files if not os.path.isfile(f) ]:
+        sys.stderr.write("Error: {} does not exist\n".format(f))
+        sys.exit(-1)
+
+    main(files or sorted(os.path.join(d, f) for d, _, fs in os.walk('tests/testdata') for f in fs if f.endswith('.asc')))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+""" measure symmetric encryption and decryption throughput for each SymmetricKeyAlgorithm
+
+usage: test_symenc_bench.py [MiB]
+
+The "concat" rows reproduce how pgpy.symenc used to work, building a new Cipher for each call and concatenating the
+output of update() and finalize() before copying it into a bytearray. The "crypt" rows time the current _encrypt and
+_decrypt, the "parallel" rows time _decrypt_parallel using one thread per CPU, and the "stream" rows time
+_CFBContext.stream between two in-memory files.
+Algorithms that PGPy will not encrypt with, or that the installed OpenSSL does not support, are skipped.
+"""
+import io
+import multiprocessing
+import os
+import sys
+import timeit
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher
+from cryptography.hazmat.primitives.ciphers import modes
+
+from pgpy.constants import SymmetricKeyAlgorithm
+from pgpy.errors import PGPEncryptionError
+from pgpy.errors import PGPInsecureCipher
+from pgpy.symenc import _CFBContext
+from pgpy.symenc import _decrypt
+from pgpy.symenc import _decrypt_parallel
+from pgpy.symenc import _encrypt
+
+
+def concat_encrypt(pt, key, alg, iv):
+    encryptor = Cipher(alg.cipher(key), modes.CFB(iv), default_backend()).encryptor()
+    return bytearray(encryptor.update(pt) + encryptor.finalize())
+
+
+def stream(pt, key, alg, iv):
+    _CFBContext(key, alg, iv).stream(io.BytesIO(pt), io.BytesIO())
+
+
+def main(mib):
+    data = bytearray(os.urandom(mib * 1024 * 1024))
+
+    print('{:,} MiB of data, {:d} CPUs, best of 3\n'.format(mib, multiprocessing.cpu_count()))
+    print('{:12} {:8} {:>8}'.format('Algorithm', 'Method', 'MiB/s'))
+    print('{:=<12} {:=<8} {:=>8}'.format('', '', ''))
+    for alg in SymmetricKeyAlgorithm:
+        try:
+            key = alg.gen_key()
+            iv = alg.gen_iv()
+            ct = _encrypt(data, key, alg, iv)
+
+        except (NotImplementedError, PGPEncryptionError, PGPInsecureCipher):
+            continue
+
+        assert concat_encrypt(data, key, alg, iv) == ct
+        assert _decrypt(ct, key, alg, iv) == data
+        assert _decrypt_parallel(ct, key, alg, 0, iv) == data
+
+        rows = [('concat', lambda: concat_encrypt(data, key, alg, iv)),
+                ('crypt', lambda: _encrypt(data, key, alg, iv)),
+                ('decrypt', lambda: _decrypt(ct, key, alg, iv)),
+                ('parallel', lambda: _decrypt_parallel(ct, key, alg, 0, iv)),
+                ('stream', lambda: stream(data, key, alg, iv))]
+
+        for method, func in rows:
+            t = min(timeit.repeat(func, number=1, repeat=3))
+            print('{:12} {:8} {:>8,.1f}'.format(alg.name, method, mib / t))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 32)
@@ -4,9 +4,13 @@ import pytest
 
 import importlib
 import inspect
+import os
+import subprocess
+import sys
 
 
-modules = ['pgpy.constants',
+modules = ['pgpy.cache',
+           'pgpy.constants',
            'pgpy.decorators',
            'pgpy.errors',
            'pgpy.pgp',
@@ -28,6 +32,16 @@ def test_pgpy_all():
     # just check that everything in pgpy.__all__ is actually there
     assert set(pgpy.__all__) <= { n for n, _ in inspect.getmembers(pgpy) }
 
+def test_lazy_imports():
+    # these are slow to load, so importing pgpy should not load them until they are actually needed
+    lazy = ['cryptography.hazmat.backends.openssl.backend',
+            'cryptography.hazmat.bindings.openssl.binding',
+            'pyasn1.codec.der.decoder',
+            'pyasn1.codec.der.encoder']
+    code = 'import sys, pgpy; print(" ".join(m for m in {!r} if m in sys.modules))'.format(lazy)
+    out = subprocess.check_output([sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.decode().strip() == ''
+
 @pytest.mark.parametrize('modname', modules)
 def test_exports(modname):
     module = importlib.import_module(modname)
@@ -0,0 +1,51 @@
+""" test the derived key cache
+"""
+from pgpy.cache import DerivedKeyCache
+
+
+class TestDerivedKeyCache(object):
+    def test_maxsize(self):
+        dkc = DerivedKeyCache(ttl=60, maxsize=2)
+        dkc.put('a', b'\x01' * 16)
+        buf = dkc._entries['a'][1]
+        dkc.put('b', b'\x02' * 16)
+        dkc.put('c', b'\x03' * 16)
+
+        # 'a' was evicted, and wiped
+        assert len(dkc) == 2
+        assert dkc.get('a') is None
+        assert buf == bytearray(16)
+        assert dkc.get('c') == b'\x03' * 16
+
+    def test_get_copy(self):
+        dkc = DerivedKeyCache()
+        dkc.put('a', b'\x01' * 16)
+
+        # the copy can be wiped without affecting the cached key
+        key = dkc.get('a')
+        assert isinstance(key, bytearray)
+        key[:] = bytearray(16)
+        assert dkc.get('a') == b'\x01' * 16
+
+    def test_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(DerivedKeyCache, '_clock', staticmethod(lambda: now[0]))
+
+        dkc = DerivedKeyCache(ttl=10, maxsize=4)
+        dkc.put('a', b'\x01' * 16)
+        buf = dkc._entries['a'][1]
+        now[0] += 5
+        assert dkc.get('a') == b'\x01' * 16
+
+        now[0] += 5
+        assert dkc.get('a') is None
+        assert buf == bytearray(16)
+
+    def test_clear(self):
+        dkc = DerivedKeyCache()
+        dkc.put('a', b'\x01' * 16)
+        buf = dkc._entries['a'][1]
+        dkc.clear()
+
+        assert len(dkc) == 0
+        assert buf == bytearray(16)
@@ -0,0 +1,100 @@
+""" test constants
+"""
+import pytest
+
+import json
+
+from pgpy.constants import EllipticCurveOID
+from pgpy.constants import HashAlgorithm
+
+
+class TestHashAlgorithmTuning(object):
+    def test_configured_count(self, monkeypatch, tmpdir):
+        monkeypatch.setenv('PGPY_TUNE_CACHE', str(tmpdir.join('tuned_counts.json')))
+        monkeypatch.setenv('PGPY_S2K_COUNT', '96')
+        monkeypatch.setenv('PGPY_S2K_COUNT_SHA384', '112')
+        monkeypatch.setattr(HashAlgorithm.SHA256, '_tuned_count', 0)
+        monkeypatch.setattr(HashAlgorithm.SHA384, '_tuned_count', 0)
+
+        assert HashAlgorithm.SHA256.tuned_count == 96
+        assert HashAlgorithm.SHA384.tuned_count == 112
+        # nothing was calibrated, so nothing was persisted
+        assert not tmpdir.join('tuned_counts.json').check()
+
+    def test_persisted_count(self, monkeypatch, tmpdir):
+        tcpath = tmpdir.join('pgpy', 'tuned_counts.json')
+        monkeypatch.setenv('PGPY_TUNE_CACHE', str(tcpath))
+        monkeypatch.delenv('PGPY_S2K_COUNT', raising=False)
+        monkeypatch.delenv('PGPY_S2K_COUNT_SHA256', raising=False)
+        monkeypatch.setattr(HashAlgorithm.SHA256, '_tuned_count', 0)
+
+        count = HashAlgorithm.SHA256.tuned_count
+        assert 0 < count <= 255
+        assert json.loads(tcpath.read())['counts']['SHA256'] == count
+
+        # another process would pick up the persisted value instead of calibrating again
+        def tune_count(*args):
+            raise AssertionError("should have used the persisted count")  # pragma: no cover
+
+        tcpath.write(json.dumps({'version': 1, 'counts': {'SHA256': 200}}))
+        monkeypatch.setattr(HashAlgorithm.SHA256, '_tuned_count', 0)
+        monkeypatch.setattr(HashAlgorithm, 'tune_count', tune_count)
+        assert HashAlgorithm.SHA256.tuned_count == 200
+
+        # but a persisted count is never allowed to be lower than the minimum
+        tcpath.write(json.dumps({'version': 1, 'counts': {'SHA256': 1}}))
+        monkeypatch.setattr(HashAlgorithm.SHA256, '_tuned_count', 0)
+        assert HashAlgorithm.SHA256.tuned_count == 96
+
+    def test_persisted_count_relative_path(self, monkeypatch, tmpdir):
+        monkeypatch.chdir(tmpdir)
+        monkeypatch.setenv('PGPY_TUNE_CACHE', 'tuned_counts.json')
+        monkeypatch.delenv('PGPY_S2K_COUNT', raising=False)
+        monkeypatch.delenv('PGPY_S2K_COUNT_SHA256', raising=False)
+        monkeypatch.setattr(HashAlgorithm.SHA256, '_tuned_count', 0)
+
+        count = HashAlgorithm.SHA256.tuned_count
+        assert json.loads(tmpdir.join('tuned_counts.json').read())['counts']['SHA256'] == count
+
+    def test_persist_failure(self, monkeypatch, tmpdir):
+        # the cache directory cannot be created, because a file is in the way
+        tmpdir.join('pgpy').write('')
+        monkeypatch.setenv('PGPY_TUNE_CACHE', str(tmpdir.join('pgpy', 'tuned_counts.json')))
+        monkeypatch.delenv('PGPY_S2K_COUNT', raising=False)
+        monkeypatch.delenv('PGPY_S2K_COUNT_SHA256', raising=False)
+        monkeypatch.setattr(HashAlgorithm.SHA256, '_tuned_count', 0)
+
+        # persisting is best-effort, so calibration still succeeds
+        assert 0 < HashAlgorithm.SHA256.tuned_count <= 255
+        assert tmpdir.listdir() == [tmpdir.join('pgpy')]
+
+    def test_not_persisted_by_default(self, monkeypatch, tmpdir):
+        monkeypatch.delenv('PGPY_TUNE_CACHE', raising=False)
+        monkeypatch.delenv('PGPY_S2K_COUNT', raising=False)
+        monkeypatch.delenv('PGPY_S2K_COUNT_SHA256', raising=False)
+        monkeypatch.setenv('HOME', str(tmpdir))
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+        monkeypatch.setattr(HashAlgorithm.SHA256, '_tuned_count', 0)
+
+        assert HashAlgorithm.tune_cache_path() is None
+        assert 0 < HashAlgorithm.SHA256.tuned_count <= 255
+        assert tmpdir.listdir() == []
+
+
+class TestEllipticCurveOID(object):
+    def test_oid_bytes(self):
+        from pyasn1.codec.der import encoder
+
+        for curve in EllipticCurveOID:
+            if curve is not EllipticCurveOID.Invalid:
+                # the contents octets of the DER encoding, without the tag and length octets
+                assert curve.oid_bytes == encoder.encode(curve.value)[2:]
+                assert EllipticCurveOID.from_oid_bytes(bytearray(curve.oid_bytes)) is curve
+
+        assert EllipticCurveOID.NIST_P256.oid_bytes == b'\x2a\x86\x48\xce\x3d\x03\x01\x07'
+
+        with pytest.raises(ValueError):
+            EllipticCurveOID.from_oid_bytes(b'\x2b\x81\x04\x00\xff')
+
+        with pytest.raises(ValueError):
+            EllipticCurveOID.from_oid_bytes(b'')
@@ -0,0 +1,39 @@
+""" test decorators
+"""
+import pytest
+
+from pgpy.decorators import sdproperty
+
+
+class TestSDProperty(object):
+    def test_register_after_set(self):
+        class Holder(object):
+            @sdproperty
+            def value(self):
+                return self._value
+
+            @value.register(int)
+            def value_int(self, val):
+                self._value = val
+
+        h = Holder()
+        h.value = 1
+        assert h.value == 1
+
+        # bool dispatches to the int setter, and is then cached as such
+        h.value = True
+        assert h.value is True
+
+        with pytest.raises(TypeError):
+            h.value = 'a'
+
+        # registering a new setter takes effect, even for types that were already resolved
+        @Holder.value.register(str)
+        @Holder.value.register(bool)
+        def value_str(self, val):
+            self._value = str(val)
+
+        h.value = 'a'
+        assert h.value == 'a'
+        h.value = True
+        assert h.value == 'True'
@@ -1,5 +1,6 @@
 """ test field parsing
 """
+from datetime import datetime
 from itertools import product
 
 from pgpy.constants import HashAlgorithm
@@ -7,7 +8,11 @@ from pgpy.constants import String2KeyType
 from pgpy.constants import SymmetricKeyAlgorithm
 
 from pgpy.packet.types import Header
+from pgpy.packet.types import MPI
+from pgpy.packet.fields import DSASignature
+from pgpy.packet.fields import RSAPriv
 from pgpy.packet.fields import String2Key
+from pgpy.packet.fields import SubPackets
 
 from pgpy.packet.subpackets import Signature
 from pgpy.packet.subpackets import UserAttribute
@@ -117,6 +122,56 @@ _uaspclasses = {
 }
 
 
+class TestHeaderCodec(object):
+    def test_length_roundtrip(self):
+        for l in (0, 191, 192, 8383, 8384, 0xFFFF, 0xFFFFFFFF):
+            enc = b'\xaa' + Header.encode_length(l)
+            assert Header.decode_length(bytearray(enc), 1) == (l, len(enc) - 1, False)
+
+        for llen in (1, 2, 4):
+            enc = b'\xaa' + Header.encode_length(0xFF, False, llen)
+            assert Header.decode_length(bytearray(enc), 1, 0, llen) == (0xFF, llen, False)
+
+    def test_decode_offset(self):
+        buf = bytearray(b'\x00\x00\x89\x01\x00' + b'\xc2\xc0\x00' + b'\x8b')
+        assert Header.decode(buf, 2) == (0x89, 0, 256, 3, False)
+        assert Header.decode(buf, 5) == (0xc2, 1, 192, 3, False)
+        # indeterminate length: the rest of the buffer
+        assert Header.decode(buf, 8) == (0x8b, 0, 0, 1, False)
+        assert Header.decode(buf + b'\x00\x00', 8) == (0x8b, 0, 2, 1, False)
+
+        buf = bytearray(b'\x00' + b'\xc0\x00\x82')
+        assert HeaderSP.decode(buf, 1) == (0x82, 1, 192, 3, False)
+
+
+class TestMPI(object):
+    def test_decode(self):
+        buf = bytearray(b'\xff' + b'\x00\x09\x01\xff' + b'\x00\x01\x01' + b'\x00\x00' + b'\xca\xfe')
+
+        mpi, offset = MPI.decode(buf, 1)
+        assert isinstance(mpi, MPI)
+        assert (mpi, offset) == (0x1ff, 5)
+        assert MPI.decode(buf, offset) == (1, 8)
+        assert MPI.decode(buf, 8) == (0, 10)
+        # decoding does not consume anything
+        assert len(buf) == 12
+
+        assert MPI(buf[1:]) == 0x1ff
+        assert MPI(0x1ff).to_mpibytes() == buf[1:5]
+
+
+class TestDSASignature(object):
+    def test_der(self):
+        # r needs a leading zero octet in DER, because its high bit is set
+        der = bytearray(b'\x30\x0a' + b'\x02\x03\x00\x80\x01' + b'\x02\x03\x7f\xff\xff')
+
+        sig = DSASignature()
+        sig.from_signer(bytes(der))
+        assert (sig.r, sig.s) == (0x8001, 0x7fffff)
+        assert isinstance(sig.r, MPI)
+        assert sig.__sig__() == der
+
+
 class TestSignatureSubPackets(object):
     params = {
         'sigsubpacket': [ bytearray(sp) + b'\xca\xfe\xba\xbe' for sp in
@@ -269,6 +324,27 @@ class TestUserAttributeSubPackets(object):
             assert isinstance(sp, OpaqueSP)
 
 
+class TestSubPackets(object):
+    def test_lookup(self):
+        sp = SubPackets()
+        sp.addnew('CreationTime', hashed=True, created=datetime.utcnow())
+        sp.addnew('NotationData', hashed=True, name='a@example.com', value='1')
+        sp.addnew('NotationData', hashed=True, name='b@example.com', value='2')
+        sp.addnew('NotationData', name='c@example.com', value='3')
+        sp.addnew('Issuer', _issuer='ABCDEF0123456789')
+
+        assert 'CreationTime' in sp
+        assert 'NotationData' in sp
+        assert 'Issuer' in sp
+        assert 'KeyFlags' not in sp
+        assert [nd.name for nd in sp['h_NotationData']] == ['a@example.com', 'b@example.com']
+        assert [nd.name for nd in sp['NotationData']] == ['a@example.com', 'b@example.com', 'c@example.com']
+        assert sp['h_Issuer'] == []
+        assert len(sp['Issuer']) == 1
+        assert sp['KeyFlags'] == []
+        assert sp.revision == 5
+
+
 class TestString2Key(object):
     params = {'sis2k': [ (bytearray(i) +
                           b'\xDE\xAD\xBE\xEF\xDE\xAD\xBE\xEF') # iv
@@ -344,6 +420,52 @@ class TestString2Key(object):
         assert s.iv == b'\xDE\xAD\xBE\xEF\xDE\xAD\xBE\xEF'
 
 
+class TestString2KeyDerivation(object):
+    def test_iterated_derive_key(self, monkeypatch):
+        s = String2Key()
+        s.usage = 254
+        s.encalg = SymmetricKeyAlgorithm.AES256
+        s.specifier = String2KeyType.Iterated
+        s.halg = HashAlgorithm.SHA1
+        s.salt = bytearray(b'\xCA\xFE\xBA\xBE\xCA\xFE\xBA\xBE')
+
+        def reference(passphrase):
+            # straightforward implementation that builds the entire input at once
+            hunit = bytes(s.salt) + passphrase.encode('latin-1')
+            hashdata = (hunit * s.count)[:max(s.count, len(hunit))]
+            h = [ s.halg.hasher for _ in range(2) ]
+            for i, hc in enumerate(h):
+                hc.update(b'\x00' * i + hashdata)
+            return b''.join(hc.digest() for hc in h)[:32]
+
+        # use a tiny block so that the block boundary handling is exercised
+        monkeypatch.setattr(String2Key, '__s2k_block_size__', 100)
+        for count in (0x00, 0x01, 0x10, 0x60):
+            s.count = count
+            for passphrase in ('', 'a', 'QwertyUiop', 'x' * 150):
+                assert s.derive_key(passphrase) == reference(passphrase)
+
+
+class TestPrivKeyPinning(object):
+    def test_pin(self):
+        km = RSAPriv()
+        km._generate(1024)
+
+        # unpinning a key that is not pinned does nothing
+        km.unpin()
+
+        km.pin()
+        assert km.privkey() is km.privkey()
+
+        km.unpin()
+        km.unpin()
+        assert km.privkey() is not km.privkey()
+
+        km.pin()
+        km.clear()
+        assert getattr(km, '_pinned', None) is None
+
+
 # TODO: this
 # class TestKeyMaterial(object):
 #     params = {
@@ -0,0 +1,81 @@
+""" test symmetric encryption
+"""
+import pytest
+
+import hashlib
+import io
+import os
+
+from pgpy import symenc
+from pgpy.constants import SymmetricKeyAlgorithm
+from pgpy.symenc import _CFBContext, _decrypt, _decrypt_parallel, _encrypt
+
+
+class TestCFBContext(object):
+    def test_chunked(self):
+        alg = SymmetricKeyAlgorithm.AES128
+        key = alg.gen_key()
+        iv = alg.gen_iv()
+        pt = bytearray(os.urandom(1000))
+
+        ct = _encrypt(pt, key, alg, iv)
+        assert isinstance(ct, bytearray)
+        assert len(ct) == len(pt)
+        assert _decrypt(ct, key, alg, iv) == pt
+
+        # chunk boundaries that do not line up with the block size must not change the output
+        assert _CFBContext(key, alg, iv).crypt(pt[:7], pt[7:300], memoryview(pt)[300:]) == ct
+
+        # update_into falls back to copying when there is no room for the slack cryptography requires after the output
+        ctx = _CFBContext(key, alg, iv, encrypt=False)
+        out = bytearray(len(ct))
+        assert ctx.update_into(ct[:500], out) == 500
+        assert ctx.update_into(ct[500:], out, 500) == len(ct)
+        assert out == pt
+
+    def test_bytes_only(self, monkeypatch):
+        # older versions of cryptography only accept bytes, so bytearray and memoryview chunks have to be copied first
+        monkeypatch.setattr(symenc, '_bytes_only', True)
+        alg = SymmetricKeyAlgorithm.AES128
+        key = alg.gen_key()
+        pt = bytearray(os.urandom(100))
+
+        assert _CFBContext._coerce(memoryview(pt)[10:20]) == bytes(pt[10:20])
+        assert _CFBContext(key, alg).crypt(pt[:50], memoryview(pt)[50:]) == _encrypt(pt, key, alg)
+
+    def test_stream(self):
+        alg = SymmetricKeyAlgorithm.CAST5
+        key = alg.gen_key()
+        pt = os.urandom(5000)
+
+        dst = io.BytesIO()
+        assert _CFBContext(key, alg).stream(io.BytesIO(pt), dst, chunk_size=333) == len(pt)
+        assert dst.getvalue() == _encrypt(pt, key, alg)
+
+
+class TestDecryptParallel(object):
+    def test_decrypt_parallel(self, monkeypatch):
+        # use small segments, so that several of them are decrypted concurrently
+        monkeypatch.setattr(_CFBContext, '__segment_size__', 48)
+        alg = SymmetricKeyAlgorithm.AES256
+        key = alg.gen_key()
+        iv = alg.gen_iv()
+        pt = bytearray(os.urandom(1000))
+        ct = _encrypt(pt, key, alg, iv)
+
+        for threads in (None, 1, 3, 0):
+            digest = hashlib.sha1()
+            assert _decrypt_parallel(ct, key, alg, threads, iv, digest=digest, digest_len=980) == pt
+            assert digest.digest() == hashlib.sha1(pt[:980]).digest()
+
+        # an error in any segment is raised, without leaving the caller waiting for segments that were never started
+        update_into = _CFBContext.update_into
+
+        def fail_at_480(self, data, buf, offset=0):
+            if offset == 480:
+                raise ValueError("segment failed")
+            return update_into(self, data, buf, offset)
+
+        monkeypatch.setattr(_CFBContext, 'update_into', fail_at_480)
+        with pytest.raises(ValueError):
+            _decrypt_parallel(ct, key, alg, 3, iv, digest=hashlib.sha1())
@@ -3,9 +3,11 @@
 """
 import pytest
 
+import bisect
 import glob
+import random
 
-from pgpy.types import Armorable, PGPObject
+from pgpy.types import Armorable, Fingerprint, PGPObject, SortedList
 
 
 # read txt files in tests/testdata/text/*.txt and yield ids and strings
@@ -92,3 +94,76 @@ class TestPGPObject(object):
 
     def test_bytes_to_text_text(self):
         assert PGPObject.bytes_to_text('asdf') == 'asdf'
+
+
+class TestFingerprint(object):
+    def test_interned(self):
+        fp = Fingerprint('F4294BC8094A7E0585C85E8637473B3758C44F36')
+
+        assert Fingerprint('f429 4bc8 094a 7e05 85c8  5e86 3747 3b37 58c4 4f36') is fp
+        assert Fingerprint(bytearray(fp.__bytes__())) is fp
+        assert str(fp) == 'F429 4BC8 094A 7E05 85C8  5E86 3747 3B37 58C4 4F36'
+
+    def test_compare(self):
+        fp = Fingerprint('EBC88A94ACB110F1BE3FE3C12B474BB02084C712')
+
+        assert fp.keyid == '2B474BB02084C712'
+        assert fp.shortid == '2084C712'
+        assert fp == 'EBC8 8A94 ACB1 10F1 BE3F  E3C1 2B47 4BB0 2084 C712'
+        assert fp == fp.keyid
+        assert fp == fp.shortid
+        assert fp != 'F4294BC8094A7E0585C85E8637473B3758C44F36'
+        assert hash(fp) == hash('EBC88A94ACB110F1BE3FE3C12B474BB02084C712')
+        assert {fp: 1}['EBC88A94ACB110F1BE3FE3C12B474BB02084C712'] == 1
+
+
+class TestSortedList(object):
+    class Item(object):
+        # sorts only on key, so that items with equal keys can be told apart
+        def __init__(self, key):
+            self.key = key
+
+        def __lt__(self, other):
+            return self.key < other.key
+
+    def test_insort(self, monkeypatch):
+        # use tiny blocks, so that splitting blocks is exercised
+        monkeypatch.setattr(SortedList, '__blocksize__', 4)
+        rand = random.Random(4880)
+
+        sl = SortedList()
+        ref = []
+        for _ in range(500):
+            item = self.Item(rand.randrange(50))
+            sl.insort(item)
+            ref.insert(bisect.bisect_left(ref, item), item)
+
+        assert len(sl) == 500
+        assert len(sl._blocks) > 1
+        assert all(a is b for a, b in zip(sl, ref))
+        assert all(a is b for a, b in zip(reversed(sl), reversed(ref)))
+        assert all(sl[i] is ref[i] for i in range(-500, 500))
+        with pytest.raises(IndexError):
+            sl[500]
+
+        for item in ref[::3]:
+            sl.remove(item)
+        del ref[::3]
+        assert len(sl) == len(ref)
+        assert all(a is b for a, b in zip(sl, ref))
+        assert ref[0] in sl
+        assert self.Item(0) not in sl
+
+    def test_resort(self):
+        items = [ self.Item(i) for i in range(5) ]
+        sl = SortedList(reversed(items))
+        assert list(sl) == items
+
+        # re-sort an item whose key has changed
+        items[0].key = 10
+        sl.resort(items[0])
+        assert list(sl) == items[1:] + items[:1]
+
+        items[2].key = -1
+        sl.check()
+        assert list(sl) == [items[2], items[1], items[3], items[4], items[0]]
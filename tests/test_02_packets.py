@@ -6,9 +6,13 @@ import glob
 import os
 
 
+from pgpy.constants import SymmetricKeyAlgorithm
+from pgpy.errors import PGPDecryptionError
 from pgpy.packet import Packet
 from pgpy.packet import PubKeyV4, PubSubKeyV4, PrivKeyV4, PrivSubKeyV4
 from pgpy.packet import Opaque
+from pgpy.packet.packets import IntegrityProtectedSKEDataV1
+from pgpy.symenc import _CFBContext
 
 import pgpy.packet.fields
 
@@ -67,6 +71,13 @@ class TestPacket(object):
         assert len(p) == len(b) - 4
         assert len(p.__bytes__()) == len(b) - 4
 
+        # body length is computed correctly without serializing
+        assert p.__bodylen__() == p.header.length
+
+        # packets and headers are stored compactly
+        assert not hasattr(p, '__dict__')
+        assert not hasattr(p.header, '__dict__')
+
         # __bytes__ output is correct
         assert p.__bytes__() == b[:-4]
 
@@ -86,3 +97,35 @@ class TestPacket(object):
         # if this is a key, ensure len(p.keymaterial) == len(bytes(p.keymaterial))
         if isinstance(p, (PubKeyV4, PubSubKeyV4, PrivKeyV4, PrivSubKeyV4)):
             assert len(p.keymaterial) == len(p.keymaterial.__bytes__())
+
+
+class TestPacketDispatch(object):
+    def test_load_unknown_version(self):
+        # a signature packet with a version that is not registered dispatches to Opaque, keeping its version
+        b = bytearray(b'\xc2\x04\x09\xca\xfe\xba')
+        p = Packet(b)
+
+        assert b == b''
+        assert isinstance(p, Opaque)
+        assert p.header.version == 9
+        assert p.__bytes__() == b'\xc2\x04\x09\xca\xfe\xba'
+
+
+class TestIntegrityProtectedSKEData(object):
+    def test_decrypt_parallel(self, monkeypatch):
+        monkeypatch.setattr(_CFBContext, '__segment_size__', 64)
+        alg = SymmetricKeyAlgorithm.CAST5
+        key = alg.gen_key()
+        data = bytearray(os.urandom(1000))
+
+        seipd = IntegrityProtectedSKEDataV1()
+        seipd.encrypt(key, alg, data)
+        # the decrypted plaintext still ends with the MDC packet
+        pt = seipd.decrypt(key, alg, threads=4)
+        assert pt[:-22] == data
+        assert pt == seipd.decrypt(key, alg)
+
+        # tampering with the ciphertext is still caught by the MDC check
+        seipd.ct[500] ^= 0x01
+        with pytest.raises(PGPDecryptionError):
+            seipd.decrypt(key, alg, threads=4)
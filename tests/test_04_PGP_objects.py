@@ -2,9 +2,12 @@
 """
 import pytest
 
+import copy
 import glob
 import os
 
+from datetime import timedelta
+
 import six
 
 from pgpy.packet import Packet
@@ -14,6 +17,7 @@ from pgpy import PGPKeyring
 from pgpy import PGPMessage
 from pgpy import PGPSignature
 from pgpy import PGPUID
+from pgpy.cache import PacketCache
 from pgpy.types import Fingerprint
 
 from conftest import gpg_ver
@@ -72,6 +76,10 @@ class TestPGPMessage(object):
 
             assert len(str(msg)) == len(mt)
 
+        sink = six.BytesIO()
+        assert msg.serialize_to(sink) == len(msg.__bytes__())
+        assert sink.getvalue() == msg.__bytes__()
+
 
 class TestPGPUID(object):
     def test_userid(self, abe):
@@ -105,6 +113,10 @@ class TestPGPKey(object):
         'test_load_from_str':        [ os.path.basename(f).replace('.pub.asc', '').replace('.', '_') for f in params['kf'] ],
         'test_load_from_bytes':      [ os.path.basename(f).replace('.pub.asc', '').replace('.', '_') for f in params['kf'] ],
         'test_load_from_bytearray':  [ os.path.basename(f).replace('.pub.asc', '').replace('.', '_') for f in params['kf'] ],
+        'test_load_from_cache':      [ os.path.basename(f).replace('.pub.asc', '').replace('.', '_') for f in params['kf'] ],
+        'test_load_from_stale_cache': [ os.path.basename(f).replace('.pub.asc', '').replace('.', '_') for f in params['kf'] ],
+        'test_load_from_substituted_cache': [ os.path.basename(f).replace('.pub.asc', '').replace('.', '_') for f in params['kf'] ],
+        'test_serialize':            [ os.path.basename(f).replace('.pub.asc', '').replace('.', '_') for f in params['kf'] ],
     }
     # kf = next(iter(sorted(glob.glob('tests/testdata/keys/*.pub.asc'))))
     keyfiles = iter(sorted(glob.glob('tests/testdata/keys/*.pub.asc')))
@@ -157,12 +169,92 @@ class TestPGPKey(object):
         else:
             assert key.fingerprint.keyid in gpg_keyid_file(kf.replace('tests/testdata/', ''))
 
+    def test_load_from_cache(self, kf):
+        with open(kf, 'rb') as tkf:
+            blob = tkf.read()
+
+        key, keys = PGPKey.from_blob(blob)
+        ckey, ckeys = PGPKey.from_cache(PGPKey.dump_cache(blob), blob)
+
+        assert ckey.fingerprint == key.fingerprint
+        assert ckey.ascii_headers == key.ascii_headers
+        assert ckey.__bytes__() == key.__bytes__()
+        assert list(ckeys) == list(keys)
+
+    def test_load_from_stale_cache(self, kf):
+        with open(kf, 'rb') as tkf:
+            blob = tkf.read()
+
+        cache = bytearray(PGPKey.dump_cache(blob))
+        assert PacketCache.loads(cache, blob) is not None
+        # generated from different data
+        assert PacketCache.loads(cache, blob + b'\n') is None
+        # corrupted
+        cache[-1] ^= 0xFF
+        assert PacketCache.loads(cache, blob) is None
+
+        # falls back to parsing blob
+        key, _ = PGPKey.from_cache(cache, blob)
+        assert key.__bytes__() == PGPKey.from_blob(blob)[0].__bytes__()
+
+    def test_load_from_substituted_cache(self, kf):
+        with open(kf, 'rb') as tkf:
+            blob = tkf.read()
+        with open('tests/testdata/keys/dsa.1.pub.asc', 'rb') as tkf:
+            other = tkf.read()
+
+        # caches rewritten to hold some other key's packets, or only some of the right ones, with recomputed checksums
+        _, headers, packets = PGPKey._parse_cacheable(blob)
+        _, oheaders, opackets = PGPKey._parse_cacheable(other)
+        for cache in [PacketCache.dumps(opackets, blob, oheaders), PacketCache.dumps(packets[:-1], blob, headers)]:
+            assert PacketCache.check(cache, blob)
+            assert PacketCache.loads(cache, blob) is None
+
+            # falls back to parsing blob
+            key, _ = PGPKey.from_cache(cache, blob)
+            assert key.__bytes__() == PGPKey.from_blob(blob)[0].__bytes__()
+
+    def test_serialize(self, kf):
+        key, _ = PGPKey.from_file(kf)
+        kb = key.__bytes__()
+
+        assert key.__bytelen__() == len(kb)
+
+        # __bytearray__ output is the same as each packet serialized individually
+        assert kb == b''.join(obj.__bytes__() for obj in key._export_objects())
+
+        # write_into an offset in a buffer that is too short
+        buf = bytearray(b'\xca\xfe')
+        assert key.write_into(buf, 2) == len(kb) + 2
+        assert bytes(buf) == b'\xca\xfe' + kb
+
+        # serialize_to a file-like object
+        sink = six.BytesIO()
+        assert key.serialize_to(sink) == len(kb)
+        assert sink.getvalue() == kb
+
 
 @pytest.fixture(scope='module')
 def keyring():
     return PGPKeyring()
 
 
+class TestPGPSignature(object):
+    def test_cached_values(self):
+        sig = PGPSignature.from_file('tests/testdata/signatures/debian-sid.sig.asc')
+        assert sig.signer is sig.signer
+        assert sig.expires_at is None
+
+        # adding a subpacket invalidates the values decoded so far
+        sig._signature.subpackets.addnew('SignatureExpirationTime', hashed=True, expires=timedelta(days=1))
+        assert sig.expires_at == sig.created + timedelta(days=1)
+
+        # so does replacing the signature packet
+        sig._signature = copy.copy(sig._signature)
+        sig._signature.subpackets.addnew('ExportableCertification', hashed=True, bflag=False)
+        assert sig.exportable is False
+
+
 class TestPGPKeyring(object):
     def test_load(self, keyring):
         # load from filenames
@@ -209,6 +301,23 @@ class TestPGPKeyring(object):
         assert not rvt[0].is_public
         assert rvt[1].is_public
 
+    def test_load_cached(self, tmpdir, monkeypatch):
+        kfs = glob.glob('tests/testdata/*test.asc')
+        ckeyring = PGPKeyring()
+
+        # first pass writes the caches, and uses the packets it just parsed instead of reading them back
+        monkeypatch.setattr(PacketCache, 'loads', classmethod(lambda *args: pytest.fail("cache was decoded")))
+        assert set(ckeyring.load(kfs, cache=str(tmpdir))) == set(PGPKeyring().load(kfs))
+        assert sorted(f.ext for f in tmpdir.listdir()) == ['.pgpy'] * len(kfs)
+
+        # second pass loads from them
+        monkeypatch.undo()
+        assert set(PGPKeyring().load(kfs, cache=str(tmpdir))) == set(ckeyring.fingerprints())
+
+        # this key's signatures use longer subpacket lengths than PGPy would, so a cache of it could never be used
+        assert PGPKeyring().load(['tests/testdata/keys/ecc.1.pub.asc'], cache=str(tmpdir))
+        assert len(tmpdir.listdir()) == len(kfs)
+
     def test_select_fingerprint(self, keyring):
         for fp, name in [("F429 4BC8 094A 7E05 85C8 5E86 3747 3B37 58C4 4F36", "RSA von TestKey"),
                          (six.u("F429 4BC8 094A 7E05 85C8 5E86 3747 3B37 58C4 4F36"), six.u("RSA von TestKey")),
@@ -28,11 +28,24 @@ def key(fn):
     return key
 
 
+def slot_names(cls):
+    # the names of the instance attributes declared in __slots__ anywhere in cls's MRO, as they appear on the instance
+    for c in cls.__mro__:
+        slots = c.__dict__.get('__slots__', ())
+        for name in ([slots] if isinstance(slots, six.string_types) else slots):
+            if name.startswith('__') and not name.endswith('__'):
+                name = '_{}{}'.format(c.__name__.lstrip('_'), name)
+            if name != '__weakref__':
+                yield name
+
+
 def walk_obj(obj, prefix=""):
     from enum import Enum
 
+    slots = set(slot_names(obj.__class__))
     for name, val in inspect.getmembers(obj):
-        if hasattr(obj.__class__, name):
+        # skip class attributes, but not the descriptors that hold slotted instance attributes
+        if hasattr(obj.__class__, name) and name not in slots:
             continue
 
         yield '{}{}'.format(prefix, name), val
@@ -89,11 +102,11 @@ class TestCopy(object):
 
         for k in sorted(objflat, key=self.ksort):
             # print("checking attribute: {} ".format(k), end="")
-            if isinstance(objflat[k], pgpy.types.SorteDeque):
-                # print("[SorteDeque] ", end="")
+            if isinstance(objflat[k], pgpy.types.SortedList):
+                # print("[SortedList] ", end="")
                 assert len(objflat[k]) == len(obj2flat[k])
 
-            if not isinstance(objflat[k], (pgpy.types.PGPObject, pgpy.types.SorteDeque)):
+            if not isinstance(objflat[k], (pgpy.types.PGPObject, pgpy.types.SortedList)):
                 # print("[{} ]".format(type(objflat[k])), end="")
                 assert objflat[k] == objflat[k], k
 
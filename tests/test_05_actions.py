@@ -5,7 +5,9 @@ import pytest
 
 import copy
 import glob
+import io
 import os
+import threading
 import time
 
 from contextlib import contextmanager
@@ -17,6 +19,8 @@ from pgpy import PGPMessage
 from pgpy import PGPSignature
 from pgpy import PGPUID
 
+from pgpy.cache import DerivedKeyCache
+
 from pgpy.constants import CompressionAlgorithm
 from pgpy.constants import EllipticCurveOID
 from pgpy.constants import Features
@@ -31,10 +35,14 @@ from pgpy.constants import SymmetricKeyAlgorithm
 from pgpy.constants import TrustLevel
 
 from pgpy.errors import PGPDecryptionError
+from pgpy.errors import PGPEncryptionError
 from pgpy.errors import PGPError
 
 from pgpy.packet import Packet
 
+from pgpy.packet.fields import String2Key
+
+from pgpy.packet import packets
 from pgpy.packet.packets import PrivKeyV4
 from pgpy.packet.packets import PrivSubKeyV4
 
@@ -224,6 +232,23 @@ def targette_sec():
     return PGPKey.from_file('tests/testdata/keys/targette.sec.rsa.asc')[0]
 
 
+@pytest.fixture(scope='module')
+def enckey():
+    # generates RSA keys that can encrypt with their primary key, which are reused for the rest of the module
+    keys = {}
+
+    def _enckey(name, ciphers=(SymmetricKeyAlgorithm.AES128,)):
+        if (name, ciphers) not in keys:
+            k = PGPKey.new(PubKeyAlgorithm.RSAEncryptOrSign, 1024)
+            k.add_uid(PGPUID.new(name), usage={KeyFlags.Certify, KeyFlags.EncryptStorage},
+                      hashes=[HashAlgorithm.SHA256], ciphers=list(ciphers))
+            keys[(name, ciphers)] = k
+
+        return keys[(name, ciphers)]
+
+    return _enckey
+
+
 @pytest.fixture(scope='module')
 def userid():
     return PGPUID.new('Abraham Lincoln', comment='Honest Abe', email='abraham.lincoln@whitehouse.gov')
@@ -344,6 +369,83 @@ class TestPGPKey(object):
             assert _unlocked is enc
             assert enc.is_unlocked
 
+    def test_unlock_cached(self, enc, monkeypatch):
+        keycache = DerivedKeyCache.enable(ttl=60, maxsize=8)
+        try:
+            with enc.unlock('QwertyUiop'), self.assert_warnings():
+                assert enc.is_unlocked
+
+            assert len(keycache) > 0
+
+            # subsequent unlocks must not derive anything
+            def _derive_key(s2k, passphrase):
+                raise AssertionError("derived a key that should have been cached")
+            monkeypatch.setattr(String2Key, '_derive_key', _derive_key)
+
+            with enc.unlock('QwertyUiop'), self.assert_warnings():
+                assert enc.is_unlocked
+
+            monkeypatch.undo()
+            with pytest.raises(PGPDecryptionError):
+                with enc.unlock('WrongPassphrase'):
+                    pass  # pragma: no cover
+
+        finally:
+            DerivedKeyCache.disable()
+
+        assert String2Key.keycache is None
+        assert len(keycache) == 0
+
+    def test_session(self, enc, string):
+        with enc.session('QwertyUiop') as session:
+            assert session.is_open
+            assert session.expires_at is None
+            assert enc.is_unlocked
+            # backend key objects are kept for the duration of the session
+            assert getattr(enc._key.keymaterial, '_pinned', None) is not None
+
+            # an overlapping unlock block must not clear the key out from under the session
+            with enc.unlock('QwertyUiop'):
+                assert enc.is_unlocked
+            assert enc.is_unlocked
+
+            # sign from several threads at once
+            sigs = []
+            threads = [ threading.Thread(target=lambda: sigs.append(session.sign(string))) for _ in range(4) ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert len(sigs) == 4
+            assert all(enc.verify(string, sig) for sig in sigs)
+
+        assert not session.is_open
+        assert enc.is_unlocked is False
+        assert getattr(enc._key.keymaterial, '_pinned', None) is None
+
+        with pytest.raises(PGPError):
+            session.sign(string)
+
+        # closing twice is fine
+        session.close()
+
+    def test_session_lifetime(self, enc):
+        session = enc.session('QwertyUiop', lifetime=0.1)
+        assert session.is_open
+        assert session.expires_at is not None
+
+        session._timer.join()
+        assert not session.is_open
+        assert enc.is_unlocked is False
+
+    def test_session_wrong_passphrase(self, enc):
+        with pytest.raises(PGPDecryptionError):
+            enc.session('WrongPassphrase')
+
+        assert enc._unlocks == 0
+        assert enc.is_unlocked is False
+
     def test_change_passphrase(self, enc):
         enc2 = copy.deepcopy(enc)
 
@@ -789,3 +891,202 @@ class TestPGPKey(object):
         # and remove it, for good measure
         subkey._signatures.remove(rsig)
         assert rsig not in subkey
+
+
+class TestPGPMessageReader(object):
+    data = os.urandom(100000)
+
+    def test_reader_passphrase(self):
+        encmsg = PGPMessage.new(self.data, compression=CompressionAlgorithm.Uncompressed).encrypt("QwertyUiop")
+
+        with encmsg.reader("QwertyUiop") as reader:
+            assert reader.verified
+            assert reader.size == len(self.data)
+            assert reader.format == 'b'
+            assert reader.read() == self.data
+
+            reader.seek(54321)
+            assert reader.read(1000) == self.data[54321:55321]
+            assert reader.tell() == 55321
+
+            reader.seek(-5, io.SEEK_END)
+            assert reader.read() == self.data[-5:]
+            assert reader.read() == b''
+
+        with pytest.raises(PGPDecryptionError):
+            encmsg.reader("AsdfGhjkl")
+
+    def test_reader_unverified(self):
+        encmsg = PGPMessage.new(self.data, compression=CompressionAlgorithm.Uncompressed).encrypt("QwertyUiop")
+        encmsg.message.ct[50000] ^= 0x01
+
+        with pytest.raises(PGPDecryptionError):
+            encmsg.reader("QwertyUiop")
+
+        # without verification, undamaged ranges can still be read
+        reader = encmsg.reader("QwertyUiop", verify=False)
+        assert not reader.verified
+        reader.seek(80000)
+        assert reader.read(16) == self.data[80000:80016]
+
+        with pytest.raises(PGPDecryptionError):
+            reader.verify()
+        assert not reader.verified
+
+    def test_reader_compressed(self):
+        encmsg = PGPMessage.new(self.data, compression=CompressionAlgorithm.ZIP).encrypt("QwertyUiop")
+
+        with pytest.raises(PGPError):
+            encmsg.reader("QwertyUiop")
+
+    def test_reader_key(self, enckey):
+        k = enckey('Reader')
+        encmsg = k.pubkey.encrypt(PGPMessage.new(self.data, compression=CompressionAlgorithm.Uncompressed, file=False))
+
+        reader = io.BufferedReader(k.reader(encmsg))
+        reader.seek(99990)
+        assert reader.read() == self.data[99990:]
+
+
+class TestPGPMessageQuickCheck(object):
+    def test_quick_check_rejects_before_decrypting(self, monkeypatch):
+        # each passphrase protects a different session key, but only the first one was used to encrypt the payload
+        msg = PGPMessage.new("This message is to be encrypted")
+        encmsg = msg.encrypt("QwertyUiop")
+        encmsg |= msg.encrypt("AsdfGhjkl")._sessionkeys[0]
+
+        decrypted = []
+        decrypt = packets._decrypt_parallel
+        monkeypatch.setattr(packets, '_decrypt_parallel', lambda *args, **kwargs: decrypted.append(args) or decrypt(*args, **kwargs))
+
+        with pytest.raises(PGPDecryptionError):
+            encmsg.decrypt("AsdfGhjkl")
+        assert decrypted == []
+
+        assert encmsg.decrypt("QwertyUiop").message == msg.message
+        assert len(decrypted) == 1
+
+
+class TestPGPMessageSessionKey(object):
+    def test_decrypt_return_session_key(self):
+        msg = PGPMessage.new("This message is to be encrypted")
+        sk = SymmetricKeyAlgorithm.Camellia128.gen_key()
+        encmsg = msg.encrypt("QwertyUiop", sessionkey=sk, cipher=SymmetricKeyAlgorithm.Camellia128)
+
+        decmsg, (symalg, sessionkey) = encmsg.decrypt("QwertyUiop", return_session_key=True)
+        assert decmsg.message == msg.message
+        assert symalg == SymmetricKeyAlgorithm.Camellia128
+        assert sessionkey == sk
+
+        assert encmsg.decrypt_with_session_key(symalg, sessionkey).message == msg.message
+        assert encmsg.decrypt_with_session_key(int(symalg), bytearray(sessionkey)).message == msg.message
+
+        with pytest.raises(PGPDecryptionError):
+            encmsg.decrypt_with_session_key(symalg, SymmetricKeyAlgorithm.Camellia128.gen_key())
+
+    def test_key_decrypt_return_session_key(self, enckey):
+        k = enckey('Session Key')
+        msg = PGPMessage.new("This message is to be encrypted", compression=CompressionAlgorithm.Uncompressed)
+        sk = SymmetricKeyAlgorithm.AES128.gen_key()
+        encmsg = k.pubkey.encrypt(msg, sessionkey=sk)
+
+        decmsg, (symalg, sessionkey) = k.decrypt(encmsg, return_session_key=True)
+        assert decmsg.message == msg.message
+        assert (symalg, sessionkey) == (SymmetricKeyAlgorithm.AES128, sk)
+        assert encmsg.decrypt_with_session_key(symalg, sessionkey).message == msg.message
+
+
+class TestPGPMessageAddRecipients(object):
+    def test_add_recipients(self, enckey):
+        k1, k2, k3 = enckey('One'), enckey('Two'), enckey('Three')
+        msg = PGPMessage.new("This message is to be encrypted", compression=CompressionAlgorithm.Uncompressed)
+        encmsg = k1.pubkey.encrypt(msg)
+
+        # add a recipient using a key that the message is already encrypted to
+        encmsg2 = encmsg.add_recipients([k2.pubkey], key=k1)
+        assert encmsg2.message is encmsg.message
+        assert len(encmsg2._sessionkeys) == 2
+        assert len(encmsg._sessionkeys) == 1
+
+        # and another, using a known session key
+        sessionkey = k2.decrypt_session_key(encmsg2)
+        assert sessionkey == k1.decrypt_session_key(encmsg)
+        encmsg3 = encmsg2.add_recipients([k3.pubkey], sessionkey=sessionkey)
+        assert encmsg3.message is encmsg.message
+        assert encmsg3.issuers == {k1.fingerprint.keyid, k2.fingerprint.keyid, k3.fingerprint.keyid}
+
+        for k in (k1, k2, k3):
+            assert k.decrypt(encmsg3).message == msg.message
+        assert k3.decrypt(PGPMessage.from_blob(str(encmsg3))).message == msg.message
+
+        with pytest.raises(PGPDecryptionError):
+            encmsg.add_recipients([k3.pubkey], sessionkey=(sessionkey[0], SymmetricKeyAlgorithm.AES128.gen_key()))
+
+        with pytest.raises(PGPError):
+            encmsg.add_recipients([k3.pubkey])
+
+
+class TestPGPMessageEncryptTo(object):
+    @pytest.mark.parametrize('threads', [None, 3, 0])
+    def test_encrypt_to(self, enckey, threads):
+        k1 = enckey('One', (SymmetricKeyAlgorithm.Camellia256, SymmetricKeyAlgorithm.AES128))
+        k2 = enckey('Two', (SymmetricKeyAlgorithm.AES256, SymmetricKeyAlgorithm.AES128))
+        msg = PGPMessage.new("This message is to be encrypted", compression=CompressionAlgorithm.Uncompressed)
+
+        encmsg = msg.encrypt_to([k1.pubkey, "QwertyUiop", k2.pubkey], threads=threads)
+        assert encmsg.is_encrypted
+        assert [ type(sk).__name__ for sk in encmsg._sessionkeys ] == ['PKESessionKeyV3', 'SKESessionKeyV4',
+                                                                        'PKESessionKeyV3']
+
+        # the only cipher both keys prefer
+        symalg, _ = k1.decrypt_session_key(encmsg)
+        assert symalg == SymmetricKeyAlgorithm.AES128
+
+        assert k1.decrypt(encmsg).message == msg.message
+        assert k2.decrypt(encmsg).message == msg.message
+        assert encmsg.decrypt("QwertyUiop").message == msg.message
+
+    def test_encrypt_to_passphrases(self):
+        msg = PGPMessage.new("This message is to be encrypted")
+        encmsg = msg.encrypt_to(["QwertyUiop", "AsdfGhjkl"], threads=2)
+
+        assert encmsg.decrypt("AsdfGhjkl", return_session_key=True)[1][0] == SymmetricKeyAlgorithm.AES256
+        assert encmsg.decrypt("QwertyUiop").message == msg.message
+
+        with pytest.raises(PGPError):
+            encmsg.encrypt_to(["ZxcvBnm"])
+
+    def test_encrypt_to_skips_unusable_ciphers(self, enckey):
+        k = enckey('Plaintext', (SymmetricKeyAlgorithm.Plaintext, SymmetricKeyAlgorithm.Twofish256,
+                                 SymmetricKeyAlgorithm.AES128))
+        msg = PGPMessage.new("This message is to be encrypted", compression=CompressionAlgorithm.Uncompressed)
+
+        encmsg = msg.encrypt_to([k.pubkey])
+        assert k.decrypt_session_key(encmsg)[0] == SymmetricKeyAlgorithm.AES128
+
+    def test_encrypt_to_no_preferences(self):
+        msg = PGPMessage.new("This message is to be encrypted")
+
+        # a key with no user ID at all
+        k = PGPKey.new(PubKeyAlgorithm.RSAEncryptOrSign, 1024)
+        with pytest.raises(PGPEncryptionError):
+            msg.encrypt_to([k.pubkey])
+
+        # and one with a user ID that was never self-signed
+        k = PGPKey.new(PubKeyAlgorithm.RSAEncryptOrSign, 1024)
+        k |= PGPUID.new('Unsigned')
+        assert k.userids[0].selfsig is None
+        for cipher in (None, SymmetricKeyAlgorithm.AES128):
+            with pytest.raises(PGPEncryptionError):
+                msg.encrypt_to([k.pubkey], cipher=cipher)
+
+    def test_encrypt_to_bad_recipients(self, enckey):
+        msg = PGPMessage.new("This message is to be encrypted")
+
+        with pytest.raises(ValueError):
+            msg.encrypt_to([])
+
+        # a session is not a public key, and must not be mistaken for a passphrase
+        with enckey('One').session() as session:
+            with pytest.raises(TypeError):
+                msg.encrypt_to([enckey('Two').pubkey, session])
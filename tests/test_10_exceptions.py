@@ -448,3 +448,6 @@ class TestFingerprint(object):
 
         with pytest.raises(ValueError):
             Fingerprint("ABCD EFGH IJKL MNOP QRST  UVWX YZ01 2345 6789 AABB")
+
+        with pytest.raises(ValueError):
+            Fingerprint(bytearray(19))